@@ -0,0 +1,124 @@
+from common.path_config import PROJECT_ROOT
+
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from FSM.FSM import FSM
+from FSM.FSMState import FSMState
+from common.trajectory import JointTrajectory
+from common.ctrlcomp import StateAndCmd, PolicyOutput, BatchStateAndCmd, BatchPolicyOutput
+from common.batch_inference import (BatchCoordinator, BatchOrtSession, BatchTorchPolicy,
+                                    BatchedOnnxModel, BatchedTorchModel)
+
+
+def _clone_policy(policy: FSMState, state_cmd: StateAndCmd, policy_output: PolicyOutput, shared_output, memo):
+    """Per-robot copy of a policy: models and configs are shared, arrays, outputs and hidden states are not"""
+    clone = copy.copy(policy)
+    memo[id(policy)] = clone
+    for attr, value in vars(policy).items():
+        if isinstance(value, np.ndarray):
+            setattr(clone, attr, value.copy())
+        elif isinstance(value, (list, dict, set)):
+            setattr(clone, attr, copy.copy(value))
+        elif isinstance(value, StateAndCmd):
+            setattr(clone, attr, state_cmd)
+        elif isinstance(value, JointTrajectory):
+            setattr(clone, attr, copy.deepcopy(value))
+        elif isinstance(value, (BatchOrtSession, BatchTorchPolicy)):
+            # shared model, recurrent state per robot
+            setattr(clone, attr, value.clone())
+        elif isinstance(value, PolicyOutput):
+            # composite policies keep private outputs for their sub-policies
+            setattr(clone, attr, policy_output if value is shared_output else PolicyOutput(value.num_joints))
+        elif isinstance(value, ThreadPoolExecutor):
+            # a pool per robot: a shared one fills up with jobs waiting in the coordinator
+            # while the jobs of the other robots, which they wait for, stay queued
+            setattr(clone, attr, clone.make_executor())
+    return clone
+
+
+class BatchFSM:
+    """One FSM per robot over shared policy models, the model calls of all robots are batched.
+
+    Robot i reads batch_state.rows[i] and writes batch_output.rows[i]. The policies are
+    loaded once; every robot gets shallow copies with its own buffers and transitions.
+    run() ticks all robots concurrently, so each model runs once per tick for all
+    robots currently in a state that uses it.
+    """
+    def __init__(self, batch_state: BatchStateAndCmd, batch_output: BatchPolicyOutput):
+        self.batch_state = batch_state
+        self.batch_output = batch_output
+        self.num_robots = batch_state.num_robots
+        self.coordinator = BatchCoordinator()
+
+        prototype = FSM(batch_state.rows[0], batch_output.rows[0])
+        self._batch_models(prototype)
+        self.fsms = [prototype]
+        for i in range(1, self.num_robots):
+            self.fsms.append(self._clone_fsm(prototype, batch_state.rows[i], batch_output.rows[i]))
+        self.executor = ThreadPoolExecutor(max_workers=self.num_robots, thread_name_prefix="batch_fsm")
+        self.tick_time = 0.
+        print(f"Batched FSM ready for {self.num_robots} robots")
+
+    def _batch_models(self, fsm: FSM):
+        """Swap every policy model for a proxy that goes through the coordinator"""
+        for policy in fsm.all_policies():
+            if hasattr(policy, "ort_session"):
+                policy.ort_session = BatchOrtSession(self.coordinator, BatchedOnnxModel(policy.onnx_path))
+            elif hasattr(policy, "policy") and hasattr(policy, "policy_path"):
+                policy.policy = BatchTorchPolicy(self.coordinator, BatchedTorchModel(policy.policy))
+
+    def _clone_fsm(self, prototype: FSM, state_cmd: StateAndCmd, policy_output: PolicyOutput):
+        memo = {}
+        for policy in prototype.all_policies():
+            _clone_policy(policy, state_cmd, policy_output, prototype.policy_output, memo)
+        fsm = copy.copy(prototype)
+        for attr, value in vars(prototype).items():
+            if isinstance(value, FSMState):
+                setattr(fsm, attr, memo[id(value)])
+            elif isinstance(value, np.ndarray):
+                setattr(fsm, attr, value.copy())
+        fsm.state_cmd = state_cmd
+        fsm.policy_output = policy_output
+        fsm.reported_aliases = set()
+        # composite policies point at the clones of their sub-policies
+        for policy in memo.values():
+            for attr, value in vars(policy).items():
+                if isinstance(value, FSMState):
+                    setattr(policy, attr, memo[id(value)])
+        return fsm
+
+    def _run_robot(self, fsm: FSM, now):
+        try:
+            fsm.run(now)
+        finally:
+            self.coordinator.task_done()
+
+    def run(self, now=None):
+        """One tick for every robot, `now` is the shared clock in seconds"""
+        if now is None:
+            now = time.perf_counter()
+        start_time = time.perf_counter()
+        self.coordinator.begin(self.num_robots)
+        futures = [self.executor.submit(self._run_robot, fsm, now) for fsm in self.fsms]
+        for future in futures:
+            future.result()
+        self.tick_time = time.perf_counter() - start_time
+
+    def cur_states(self):
+        """FSMStateName of every robot"""
+        return [fsm.cur_policy.name for fsm in self.fsms]
+
+    def state_counts(self):
+        counts = {}
+        for fsm in self.fsms:
+            counts[fsm.cur_policy.name_str] = counts.get(fsm.cur_policy.name_str, 0) + 1
+        return counts
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+        for fsm in self.fsms:
+            for policy in fsm.all_policies():
+                if isinstance(getattr(policy, "executor", None), ThreadPoolExecutor):
+                    policy.executor.shutdown(wait=True)
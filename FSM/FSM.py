@@ -10,9 +10,13 @@ from policy.skill_cast.SkillCast import SkillCast
 from policy.kick.Kick import Kick
 from policy.kungfu2.KungFu2 import KungFu2
 from policy.accad_male_b13.AccadMaleB13 import AccadMaleB13
+from policy.dual_body.DualBody import DualBody
 from FSM.FSMState import *
 import time
+import numpy as np
 from common.ctrlcomp import *
+from common import numba_kernels
+from common.status_display import status
 from enum import Enum, unique
 
 @unique
@@ -28,6 +32,19 @@ class FSM:
         self.next_policy : FSMState
         
         self.FSMmode = FSMMode.NORMAL
+        self.model_watcher = None
+        
+        # multi-rate scheduling, each policy runs inference every cur_policy.control_dt
+        self.tick_dt = 0.
+        self.last_tick_time = None
+        self.policy_start_time = None
+        self.next_inference_time = float("-inf")
+        self.last_inference_time = 0.
+        self.last_tick_inferred = False
+        self.interp_from = np.zeros(policy_output.num_joints, dtype=np.float32)
+        self.interp_to = np.zeros(policy_output.num_joints, dtype=np.float32)
+        self.interp_ready = False
+        self.reported_aliases = set()
         
         self.passive_mode = PassiveMode(state_cmd, policy_output)
         self.fixed_pose_1 = FixedPose(state_cmd, policy_output)
@@ -39,18 +56,31 @@ class FSM:
         self.kick_policy = Kick(state_cmd, policy_output)
         self.kungfu2_policy = KungFu2(state_cmd, policy_output)
         self.accad_male_b13 = AccadMaleB13(state_cmd, policy_output)
+        self.dual_body_policy = DualBody(state_cmd, policy_output, self.skill_cast_policy, self.dance_policy)
         
         print("initalized all policies!!!")
         
+        # compile or load the cached kernels now, not on the first control tick
+        warmup_time = numba_kernels.warmup()
+        print(f"numeric kernels: {numba_kernels.BACKEND} backend, warm-up {warmup_time * 1000:.1f}ms")
+        
         self.cur_policy = self.passive_mode
         print("current policy is ", self.cur_policy.name_str)
+        status.set_state(self.cur_policy.name_str)
         
         
         
-    def run(self):
-        start_time = time.time()
+    def run(self, now=None):
+        """One FSM tick, `now` is the control clock in seconds (simulation time in mujoco)"""
+        if now is None:
+            now = time.perf_counter()
+        if self.last_tick_time is not None:
+            self.tick_dt = now - self.last_tick_time
+        self.last_tick_time = now
+        if self.model_watcher is not None:
+            self.model_watcher.apply_pending(self.cur_policy)
         if(self.FSMmode == FSMMode.NORMAL): 
-            self.cur_policy.run()
+            self.step_policy(now)
             nextPolicyName = self.cur_policy.checkChange()
             
             if(nextPolicyName != self.cur_policy.name):
@@ -58,26 +88,81 @@ class FSM:
                 self.FSMmode = FSMMode.CHANGE
                 self.cur_policy.exit()
                 self.get_next_policy(nextPolicyName)
-                print("Switched to ", self.cur_policy.name_str)
+                status.set_state(self.cur_policy.name_str)
+                status.post(f"Switched to {self.cur_policy.name_str}")
         
         elif(self.FSMmode == FSMMode.CHANGE):
             self.cur_policy.enter()
             self.FSMmode = FSMMode.NORMAL
-            self.cur_policy.run()
-            
-        # self.absoluteWait(self.cur_policy.control_horzion,self.start_time)
-        end_time = time.time()
-        # print("time cusume: ", end_time - start_time)
+            self.policy_start_time = now
+            self.next_inference_time = now
+            self.interp_ready = False
+            self.step_policy(now)
+        # finished targets for consumers on other threads
+        self.policy_output.publish()
+
+    def step_policy(self, now):
+        """Run inference if the current policy is due, otherwise hold or interpolate its last output"""
+        policy = self.cur_policy
+        if self.policy_start_time is None:
+            self.policy_start_time = now
+        # half a tick of slack so loop jitter does not push inference to the following tick
+        self.last_tick_inferred = now + 0.5 * self.tick_dt >= self.next_inference_time
+        if self.last_tick_inferred:
+            policy.elapsed_time = now - self.policy_start_time
+            if policy.output_mode == "interpolate":
+                np.copyto(self.interp_from, self.policy_output.actions)
+            policy.run()
+            if self.state_cmd.debug_aliasing:
+                self.check_aliasing(policy)
+            self.last_inference_time = now
+            self.next_inference_time += policy.control_dt
+            if self.next_inference_time <= now:
+                self.next_inference_time = now + policy.control_dt
+            if policy.output_mode == "interpolate":
+                np.copyto(self.interp_to, self.policy_output.actions)
+                self.interp_ready = True
+        
+        if policy.output_mode == "interpolate" and self.interp_ready:
+            # reach the new target on the last tick before the next inference
+            alpha = min((now - self.last_inference_time + self.tick_dt) / policy.control_dt, 1.0)
+            actions = self.policy_output.actions
+            np.subtract(self.interp_to, self.interp_from, out=actions)
+            actions *= alpha
+            actions += self.interp_from
+
+    def check_loop_period(self, loop_dt, tolerance=0.1):
+        """Warn about policies whose control_dt is shorter than the loop period of the caller,
+        inference runs at most once per FSM tick so they only run at the loop rate.
+        Periods within `tolerance` are accepted, e.g. the 0.021s of 7 mujoco steps for 0.02s"""
+        too_fast = [policy for policy in self.all_policies() if policy.control_dt * (1.0 + tolerance) < loop_dt]
+        for control_dt in sorted({policy.control_dt for policy in too_fast}):
+            names = ", ".join(policy.name_str for policy in too_fast if policy.control_dt == control_dt)
+            print(f"⚠️  control_dt {control_dt}s is shorter than the control loop period {loop_dt}s, "
+                  f"{names} run at {1.0 / loop_dt:.1f} Hz instead of {1.0 / control_dt:.1f} Hz")
+        return too_fast
+
+    def check_aliasing(self, policy:FSMState):
+        """Warn once for every policy attribute that still references a StateAndCmd buffer"""
+        for alias in self.state_cmd.find_aliases(policy):
+            key = (policy.name_str, alias)
+            if key not in self.reported_aliases:
+                self.reported_aliases.add(key)
+                print(f"⚠️  {policy.name_str} keeps a reference to the state buffers: {alias}")
+
+    def all_policies(self):
+        return [self.passive_mode,
+                self.fixed_pose_1,
+                self.loco_policy,
+                self.kungfu_policy,
+                self.dance_policy,
+                self.skill_cooldown_policy,
+                self.skill_cast_policy,
+                self.kick_policy,
+                self.kungfu2_policy,
+                self.accad_male_b13,
+                self.dual_body_policy]
 
-    def absoluteWait(self, control_dt, start_time):
-        end_time = time.time()
-        delta_time = end_time - start_time
-        if(delta_time < control_dt):
-            time.sleep(control_dt - delta_time)
-        else:
-            print("inference time beyond control horzion!!!")
-            
-            
     def get_next_policy(self, policy_name:FSMStateName):
         if(policy_name == FSMStateName.PASSIVE):
             self.cur_policy = self.passive_mode
@@ -99,6 +184,8 @@ class FSM:
             self.cur_policy = self.kick_policy
         elif((policy_name == FSMStateName.SKILL_KungFu2)):
             self.cur_policy = self.kungfu2_policy
+        elif((policy_name == FSMStateName.SKILL_DualBody)):
+            self.cur_policy = self.dual_body_policy
         else:
             pass
             
@@ -6,7 +6,19 @@ class FSMState:
     def __init__(self):
         self.name = FSMStateName.INVALID
         self.name_str = "invalid"
-        self.control_dt = 0.02
+        self.control_dt = 0.02        # inference period, the FSM only calls run() on these ticks
+        self.output_mode = "hold"     # between inference ticks: "hold" or "interpolate" the actions
+        self.elapsed_time = 0.        # seconds since enter(), set by the FSM before every run()
+
+    def load_rate_config(self, config):
+        """Optional per-policy rate settings from the policy yaml"""
+        self.control_dt = config.get("control_dt", self.control_dt)
+        self.output_mode = config.get("output_mode", self.output_mode)
+
+    def sub_policies(self):
+        """Policies a composite state runs while it is active"""
+        return ()
+
     def enter(self):
         raise NotImplementedError("enter() function must be implement!")
     
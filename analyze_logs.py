@@ -8,6 +8,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 import os
 import glob
+from common.rotation_kernels import roll_pitch_from_gravity_batch, tilt_from_gravity_batch
 
 def analyze_latest_log():
     """分析最新的日志文件"""
@@ -64,6 +65,18 @@ def analyze_latest_log():
         print(f"   Y velocity: {df['vel_cmd_y'].mean():.3f} ± {df['vel_cmd_y'].std():.3f}")
         print(f"   Yaw velocity: {df['vel_cmd_yaw'].mean():.3f} ± {df['vel_cmd_yaw'].std():.3f}")
     
+    # 姿态分析（由投影重力计算）
+    if 'gravity_ori_x' in df.columns:
+        print("\n🧭 Attitude Analysis:")
+        gravity = df[['gravity_ori_x', 'gravity_ori_y', 'gravity_ori_z']].to_numpy(dtype=np.float64)
+        roll_pitch = np.degrees(roll_pitch_from_gravity_batch(gravity))
+        tilt = np.degrees(tilt_from_gravity_batch(gravity))
+        print(f"   Roll: {roll_pitch[:, 0].mean():.2f} ± {roll_pitch[:, 0].std():.2f} deg "
+              f"(max {np.abs(roll_pitch[:, 0]).max():.2f})")
+        print(f"   Pitch: {roll_pitch[:, 1].mean():.2f} ± {roll_pitch[:, 1].std():.2f} deg "
+              f"(max {np.abs(roll_pitch[:, 1]).max():.2f})")
+        print(f"   Tilt: mean {tilt.mean():.2f} deg, max {tilt.max():.2f} deg")
+    
     # 创建可视化图表
     create_plots(df, latest_log)
 
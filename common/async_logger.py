@@ -0,0 +1,76 @@
+import queue
+import threading
+from common.deploy_logger import DeployLogger
+
+
+class AsyncLogWriter:
+    """Runs DeployLogger on its own thread, the control thread only enqueues records"""
+    def __init__(self, max_pending=2000):
+        self.max_pending = max_pending
+        # unbounded so control commands never block, records are bounded by max_pending
+        self.queue = queue.Queue()
+        self.logger = DeployLogger()
+        self.dropped = 0
+        self.thread = threading.Thread(target=self._worker, name="log_writer", daemon=True)
+        self.thread.start()
+
+    def start_session(self):
+        self.queue.put_nowait(("start", None))
+
+    def submit(self, record):
+        """Enqueue one tick of data, dropped (and counted) if the writer is too far behind"""
+        if self.queue.qsize() >= self.max_pending:
+            self.dropped += 1
+            return False
+        self.queue.put_nowait(("record", record))
+        return True
+
+    def save(self):
+        """Write the current session to CSV on the logging thread"""
+        self.queue.put_nowait(("save", None))
+
+    def stop(self, timeout=10.0):
+        """Flush everything that is queued and stop the thread"""
+        self.queue.put_nowait(("stop", None))
+        self.thread.join(timeout=timeout)
+
+    def _worker(self):
+        while True:
+            command, record = self.queue.get()
+            if command == "record":
+                self._write_record(record)
+            elif command == "start":
+                self.logger = DeployLogger()
+            elif command == "save":
+                self._save()
+            elif command == "stop":
+                break
+
+    def _write_record(self, record):
+        joints = record.pop("joints", None)
+        for key, value in record.items():
+            self.logger.record(key, value)
+        if joints is not None:
+            target_q, actual_q, actual_dq, kps, kds = joints
+            for i in range(len(target_q)):
+                self.logger.record_joint_data(
+                    joint_index=i,
+                    target_q=target_q[i],
+                    actual_q=actual_q[i],
+                    actual_dq=actual_dq[i],
+                    kp=kps[i],
+                    kd=kds[i]
+                )
+
+    def _save(self):
+        if len(self.logger.data) > 0:
+            try:
+                self.logger.save_to_csv()
+                print("📊 Log data saved successfully!")
+            except Exception as e:
+                print(f"❌ Error saving log: {e}")
+        else:
+            print("⚠️  No data to save")
+        if self.dropped > 0:
+            print(f"⚠️  {self.dropped} log records dropped, the log writer fell behind")
+            self.dropped = 0
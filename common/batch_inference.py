@@ -0,0 +1,161 @@
+from common.path_config import PROJECT_ROOT
+
+import threading
+import numpy as np
+from common.model_loader import ort_session_options
+
+
+class BatchedOnnxModel:
+    """onnxruntime session that takes (batch, num_obs) inputs.
+
+    The exported policies have a fixed batch size of 1, the first input/output
+    dimension is renamed to a symbolic one. Models that still reject a batch fall
+    back to one run per row.
+    """
+    def __init__(self, onnx_path):
+        import onnx
+        import onnxruntime
+        model = onnx.load(onnx_path)
+        for value in list(model.graph.input) + list(model.graph.output):
+            value.type.tensor_type.shape.dim[0].dim_param = "batch"
+        self.session = onnxruntime.InferenceSession(model.SerializeToString(), sess_options=ort_session_options())
+        self.input_name = self.session.get_inputs()[0].name
+        self.single_session = None
+        num_obs = self.session.get_inputs()[0].shape[1]
+        try:
+            self.session.run(None, {self.input_name: np.zeros((2, num_obs), dtype=np.float32)})
+        except Exception as e:
+            print(f"⚠️  {onnx_path} does not accept a batch ({e}), running rows one by one")
+            self.single_session = onnxruntime.InferenceSession(onnx_path, sess_options=ort_session_options())
+
+    def run_batch(self, obs, callers):
+        if self.single_session is not None:
+            return np.concatenate([self.single_session.run(None, {self.input_name: row[None]})[0] for row in obs])
+        return self.session.run(None, {self.input_name: obs})[0]
+
+
+class BatchedTorchModel:
+    """TorchScript policy run on a batch, recurrent policies get their hidden state per caller.
+
+    The exported LSTM policies keep hidden_state/cell_state as (layers, 1, hidden) module
+    buffers. Every proxy owns its own copy; run_batch() stacks them along the batch
+    dimension before the call and splits them again afterwards.
+    """
+    RECURRENT_BUFFERS = ("hidden_state", "cell_state")
+
+    def __init__(self, module):
+        self.module = module
+        buffers = dict(module.named_buffers())
+        self.recurrent_names = [name for name in self.RECURRENT_BUFFERS if name in buffers]
+
+    def initial_state(self):
+        return {name: getattr(self.module, name).clone() for name in self.recurrent_names}
+
+    def run_batch(self, obs, callers):
+        import torch
+        with torch.inference_mode():
+            for name in self.recurrent_names:
+                setattr(self.module, name, torch.cat([caller.recurrent_state[name] for caller in callers], dim=1))
+            action = self.module(torch.from_numpy(obs)).numpy()
+            for name in self.recurrent_names:
+                state = getattr(self.module, name)
+                for i, caller in enumerate(callers):
+                    caller.recurrent_state[name] = state[:, i:i + 1].clone()
+        return action
+
+
+class BatchCoordinator:
+    """Dynamic batching of model calls made by concurrently running robot tasks.
+
+    Every task runs one robot's FSM tick on its own thread. A model call waits until
+    every unfinished task is waiting as well, then each model runs once over all
+    observations queued for it and the callers get their rows back.
+    """
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+        self.pending = {}   # model -> list of [obs, caller, action, error]
+        self.batch_calls = 0
+        self.batched_rows = 0
+
+    def begin(self, num_tasks):
+        with self.cond:
+            self.active = num_tasks
+            self.waiting = 0
+
+    def task_done(self):
+        with self.cond:
+            self.active -= 1
+            self._flush_if_ready()
+
+    def infer(self, model, obs, caller):
+        """Queue one (1, num_obs) observation for `model`, returns its (1, num_actions) action"""
+        obs = np.asarray(obs, dtype=np.float32).reshape(1, -1)
+        with self.cond:
+            if self.active == 0:
+                # outside BatchFSM.run(), e.g. policy warm-up
+                return np.asarray(model.run_batch(obs, [caller]))
+            request = [obs, caller, None, None]
+            self.pending.setdefault(model, []).append(request)
+            self.waiting += 1
+            self._flush_if_ready()
+            while request[2] is None and request[3] is None:
+                self.cond.wait()
+        if request[3] is not None:
+            raise request[3]
+        return request[2]
+
+    def _flush_if_ready(self):
+        # a DualBody task waits with two requests, so >=
+        if not self.pending or self.waiting < self.active:
+            return
+        pending, self.pending = self.pending, {}
+        for model, requests in pending.items():
+            try:
+                obs = np.concatenate([request[0] for request in requests])
+                actions = np.asarray(model.run_batch(obs, [request[1] for request in requests]))
+                for i, request in enumerate(requests):
+                    request[2] = actions[i:i + 1]
+            except Exception as e:
+                for request in requests:
+                    request[3] = e
+            self.waiting -= len(requests)
+            self.batch_calls += 1
+            self.batched_rows += len(requests)
+        self.cond.notify_all()
+
+    def mean_batch_size(self):
+        return self.batched_rows / self.batch_calls if self.batch_calls > 0 else 0.
+
+
+class BatchOrtSession:
+    """Drop-in replacement for onnxruntime.InferenceSession.run, batched by the coordinator"""
+    def __init__(self, coordinator: BatchCoordinator, model: BatchedOnnxModel):
+        self.coordinator = coordinator
+        self.model = model
+
+    def clone(self):
+        return BatchOrtSession(self.coordinator, self.model)
+
+    def run(self, output_names, input_feed):
+        obs = next(iter(input_feed.values()))
+        return [self.coordinator.infer(self.model, obs, self)]
+
+
+class BatchTorchPolicy:
+    """Drop-in replacement for a torch.jit policy module, batched by the coordinator"""
+    def __init__(self, coordinator: BatchCoordinator, model: BatchedTorchModel, recurrent_state=None):
+        self.coordinator = coordinator
+        self.model = model
+        self.recurrent_state = recurrent_state if recurrent_state is not None else model.initial_state()
+
+    def clone(self):
+        """Proxy for another robot, starting from a copy of this one's hidden state"""
+        return BatchTorchPolicy(self.coordinator, self.model,
+                                {name: state.clone() for name, state in self.recurrent_state.items()})
+
+    def __call__(self, obs_tensor):
+        import torch
+        action = self.coordinator.infer(self.model, obs_tensor.detach().cpu().numpy(), self)
+        return torch.from_numpy(action)
@@ -0,0 +1,135 @@
+from common.path_config import PROJECT_ROOT
+
+import os
+import socket
+import struct
+import time
+from common.utils import FSMCommand
+from common.status_display import status
+
+# one datagram: magic "RM", version, FSMCommand value (0 = none), uint32 sequence, vx, vy, wz
+COMMAND_STRUCT = struct.Struct("<2sBbIfff")
+COMMAND_MAGIC = b"RM"
+COMMAND_VERSION = 1
+_SEQ_MOD = 1 << 32
+
+
+def parse_address(address):
+    """'udp://host:port' or 'unix:///path/to.sock' -> (family, socket address)"""
+    if address.startswith("udp://"):
+        host, _, port = address[len("udp://"):].rpartition(":")
+        return socket.AF_INET, (host or "0.0.0.0", int(port))
+    if address.startswith("unix://"):
+        return socket.AF_UNIX, address[len("unix://"):]
+    raise ValueError(f"Unknown command address '{address}', use udp://host:port or unix:///path")
+
+
+def encode_command(seq, vel=(0., 0., 0.), command=None):
+    return COMMAND_STRUCT.pack(COMMAND_MAGIC, COMMAND_VERSION, 0 if command is None else command.value,
+                               seq % _SEQ_MOD, *vel)
+
+
+class CommandIngress:
+    """Velocity and FSM commands from datagrams, for headless runs and test rigs.
+
+    poll() runs once per control tick: it drains the non-blocking socket, drops
+    malformed datagrams and sequence numbers that are not newer than the last accepted
+    one (wrap-around safe), and writes into the same StateAndCmd fields as the
+    keyboard/remote. While the stream is fresh its velocity is rewritten every tick, so
+    it takes precedence over local input; when no datagram arrives for `timeout` seconds
+    the velocity is zeroed once and the next datagram starts a new stream with any sequence.
+    """
+    def __init__(self, address, timeout=0.5, max_messages=64):
+        self.address = address
+        self.timeout = timeout
+        self.max_messages = max_messages
+        family, self.sock_address = parse_address(address)
+        if family == socket.AF_UNIX and os.path.exists(self.sock_address):
+            os.unlink(self.sock_address)
+        self.sock = socket.socket(family, socket.SOCK_DGRAM)
+        self.sock.bind(self.sock_address)
+        self.sock.setblocking(False)
+
+        self.last_seq = None
+        self.last_recv_time = float("-inf")
+        self.vel = (0., 0., 0.)
+        self.pending_command = None
+        self.fresh = False
+
+        self.received = 0
+        self.dropped_seq = 0
+        self.malformed = 0
+        self.timeouts = 0
+        print(f"📡 Command ingress listening on {address}")
+
+    def _accept_seq(self, seq, now):
+        if self.last_seq is None or now - self.last_recv_time > self.timeout:
+            return True
+        return 0 < (seq - self.last_seq) % _SEQ_MOD < _SEQ_MOD // 2
+
+    def poll(self, state_cmd, now=None):
+        """Apply the datagrams received since the last call, returns True while the stream is fresh"""
+        if now is None:
+            now = time.perf_counter()
+        for _ in range(self.max_messages):
+            try:
+                data = self.sock.recv(64)
+            except (BlockingIOError, InterruptedError):
+                break
+            if len(data) != COMMAND_STRUCT.size:
+                self.malformed += 1
+                continue
+            magic, version, command, seq, vx, vy, wz = COMMAND_STRUCT.unpack(data)
+            if magic != COMMAND_MAGIC or version != COMMAND_VERSION:
+                self.malformed += 1
+                continue
+            if not self._accept_seq(seq, now):
+                self.dropped_seq += 1
+                continue
+            if command != 0:
+                try:
+                    self.pending_command = FSMCommand(command)
+                except ValueError:
+                    self.malformed += 1
+                    continue
+            self.last_seq = seq
+            self.last_recv_time = now
+            self.vel = (vx, vy, wz)
+            self.received += 1
+
+        if now - self.last_recv_time <= self.timeout:
+            self.fresh = True
+            state_cmd.vel_cmd[0], state_cmd.vel_cmd[1], state_cmd.vel_cmd[2] = self.vel
+            if self.pending_command is not None:
+                state_cmd.skill_cmd = self.pending_command
+                self.pending_command = None
+        elif self.fresh:
+            self.fresh = False
+            self.timeouts += 1
+            state_cmd.vel_cmd[:] = 0.
+            status.post(f"⚠️  Command stream on {self.address} timed out, velocity command zeroed")
+        return self.fresh
+
+    def format_stats(self):
+        return (f"command ingress: {self.received} accepted, {self.dropped_seq} old/duplicate, "
+                f"{self.malformed} malformed, {self.timeouts} timeouts")
+
+    def close(self):
+        self.sock.close()
+        if self.sock.family == socket.AF_UNIX and os.path.exists(self.sock_address):
+            os.unlink(self.sock_address)
+
+
+class CommandClient:
+    """Sends commands to a CommandIngress, see send_command.py"""
+    def __init__(self, address):
+        family, self.sock_address = parse_address(address)
+        self.sock = socket.socket(family, socket.SOCK_DGRAM)
+        self.seq = 0
+
+    def send(self, vel=(0., 0., 0.), command=None):
+        self.seq += 1
+        self.sock.sendto(encode_command(self.seq, vel, command), self.sock_address)
+
+    def close(self):
+        self.sock.close()
@@ -0,0 +1,122 @@
+import threading
+import time
+import numpy as np
+from common.scheduler import DeadlineScheduler
+
+
+class CommandStreamer:
+    """Upsamples policy targets between policy ticks and publishes them at a higher rate.
+
+    The control loop push()es every new policy output; sample() renders the target for a
+    given time one policy period behind the newest sample, so it only ever interpolates.
+    start() runs sample() + `send_fn(q, kps, kds)` on its own deadline-scheduled thread;
+    without start() sample() can be driven directly, e.g. from the mujoco simulation clock.
+    """
+    def __init__(self, num_joints, policy_dt, stream_dt, send_fn=None, interp="linear", spin_time=0.0005):
+        if interp not in ("linear", "cubic"):
+            raise ValueError(f"Unknown interpolation '{interp}', use 'linear' or 'cubic'")
+        self.num_joints = num_joints
+        self.policy_dt = policy_dt
+        self.stream_dt = stream_dt
+        self.send_fn = send_fn
+        self.interp = interp
+        self.spin_time = spin_time
+
+        # last three policy samples, newest last
+        self.sample_times = [0., 0., 0.]
+        self.samples = [np.zeros(num_joints, dtype=np.float32) for _ in range(3)]
+        self.num_samples = 0
+        self.kps = np.zeros(num_joints, dtype=np.float32)
+        self.kds = np.zeros(num_joints, dtype=np.float32)
+        self.lock = threading.Lock()
+
+        self.scheduler = None
+        self.thread = None
+        self.running = False
+        self.send_count = 0
+        self.send_time_sum = 0.
+        self.send_time_max = 0.
+
+    def push(self, actions, kps, kds, now=None):
+        """Add the newest policy output, `now` defaults to time.perf_counter()"""
+        if now is None:
+            now = time.perf_counter()
+        with self.lock:
+            oldest = self.samples.pop(0)
+            np.copyto(oldest, actions)
+            self.samples.append(oldest)
+            self.sample_times.pop(0)
+            self.sample_times.append(now)
+            self.num_samples = min(self.num_samples + 1, 3)
+            np.copyto(self.kps, kps)
+            np.copyto(self.kds, kds)
+
+    def reset(self):
+        """Forget the sample history, the next push() is held until a second one arrives"""
+        with self.lock:
+            self.num_samples = 0
+
+    def sample(self, now=None):
+        """Interpolated target for time `now`, returns (q, kps, kds) or None before the first push"""
+        if now is None:
+            now = time.perf_counter()
+        with self.lock:
+            if self.num_samples == 0:
+                return None
+            p0, p1, p2 = self.samples
+            kps = self.kps.copy()
+            kds = self.kds.copy()
+            if self.num_samples == 1:
+                return p2.copy(), kps, kds
+            # ramp from the previous sample to the newest over one policy period
+            alpha = min(max((now - self.sample_times[2]) / self.policy_dt, 0.), 1.)
+            if self.interp == "linear" or self.num_samples < 3:
+                q = p1 + (p2 - p1) * alpha
+            else:
+                # cubic Hermite, Catmull-Rom tangent at p1 and one-sided tangent at p2
+                alpha2 = alpha * alpha
+                alpha3 = alpha2 * alpha
+                m1 = 0.5 * (p2 - p0)
+                m2 = p2 - p1
+                q = ((2 * alpha3 - 3 * alpha2 + 1) * p1 + (alpha3 - 2 * alpha2 + alpha) * m1
+                     + (-2 * alpha3 + 3 * alpha2) * p2 + (alpha3 - alpha2) * m2)
+        return q.astype(np.float32), kps, kds
+
+    def start(self):
+        self.scheduler = DeadlineScheduler(self.stream_dt, self.spin_time)
+        self.running = True
+        self.thread = threading.Thread(target=self._stream_loop, name="command_streamer", daemon=True)
+        self.thread.start()
+        print(f"Command streamer started at {1.0 / self.stream_dt:.0f} Hz ({self.interp})")
+
+    def stop(self, timeout=1.0):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=timeout)
+            self.thread = None
+
+    def _stream_loop(self):
+        self.scheduler.start()
+        while self.running:
+            start_time = time.perf_counter()
+            target = self.sample(start_time)
+            if target is not None:
+                self.send_fn(*target)
+                send_time = time.perf_counter() - start_time
+                self.send_count += 1
+                self.send_time_sum += send_time
+                self.send_time_max = max(self.send_time_max, send_time)
+            self.scheduler.wait()
+
+    def get_stats(self):
+        stats = self.scheduler.get_stats() if self.scheduler is not None else {}
+        stats["sends"] = self.send_count
+        stats["send_time_mean"] = self.send_time_sum / self.send_count if self.send_count > 0 else 0.
+        stats["send_time_max"] = self.send_time_max
+        return stats
+
+    def format_stats(self):
+        stats = self.get_stats()
+        text = self.scheduler.format_stats() if self.scheduler is not None else "not started"
+        return (f"stream {text}, send mean {stats['send_time_mean'] * 1e6:.1f}us "
+                f"max {stats['send_time_max'] * 1e6:.1f}us")
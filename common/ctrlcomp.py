@@ -2,28 +2,222 @@ from common.path_config import PROJECT_ROOT
 
 import numpy as np
 from common.utils import FSMCommand
+from common.seqlock import SeqlockDoubleBuffer
+
+
+def _state_buffers(batch_shape, num_joints):
+    gravity_ori = np.zeros(batch_shape + (3,), dtype=np.float32)
+    gravity_ori[..., 2] = 1.
+    return {
+        "q": np.zeros(batch_shape + (num_joints,), dtype=np.float32),
+        "dq": np.zeros(batch_shape + (num_joints,), dtype=np.float32),
+        "ddq": np.zeros(batch_shape + (num_joints,), dtype=np.float32),
+        "tau_est": np.zeros(batch_shape + (num_joints,), dtype=np.float32),
+        "gravity_ori": gravity_ori,
+        "ang_vel": np.zeros(batch_shape + (3,), dtype=np.float32),
+    }
+
+
+def _read_only(buffer):
+    view = buffer.view()
+    view.flags.writeable = False
+    return view
 
 
 class StateAndCmd:
-    def __init__(self, num_joints):
-        # robot state
+    """Robot state in fixed float32 buffers.
+
+    Sources write with update() (or by assigning to q/dq/gravity_ori/ang_vel, which copies
+    into the buffers), policies read the attributes, which are read-only views of the
+    buffers and therefore always show the latest state. With debug_aliasing the FSM checks
+    after every policy run that the policy did not keep a reference to these views.
+    """
+    STATE_FIELDS = ("q", "dq", "ddq", "tau_est", "gravity_ori", "ang_vel")
+
+    def __init__(self, num_joints, debug_aliasing=False, buffers=None):
+        # robot state, `buffers` lets BatchStateAndCmd hand in rows of its batch arrays
         self.num_joints = num_joints
-        self.q = np.zeros(num_joints, dtype=np.float32)
-        self.dq = np.zeros(num_joints, dtype=np.float32)
-        self.ddq = np.zeros(num_joints, dtype=np.float32)
-        self.tau_est = np.zeros(num_joints, dtype=np.float32)
-        self.gravity_ori = np.array([0., 0., 1.])
-        self.ang_vel = np.zeros(3)
+        self.debug_aliasing = debug_aliasing
+        self._buffers = buffers if buffers is not None else _state_buffers((), num_joints)
+        self._views = {name: _read_only(buffer) for name, buffer in self._buffers.items()}
         # joy cmd
         self.vel_cmd = np.zeros(3)
         self.skill_cmd = FSMCommand.INVALID
         # skill change cmd
         # self.skill_set = FSMCommand.SKILL_1
 
-class PolicyOutput:
+    def update(self, q=None, dq=None, gravity_ori=None, ang_vel=None):
+        """Copy a new state into the buffers, arguments left as None keep their value"""
+        if q is not None:
+            self._write("q", q)
+        if dq is not None:
+            self._write("dq", dq)
+        if gravity_ori is not None:
+            self._write("gravity_ori", gravity_ori)
+        if ang_vel is not None:
+            self._write("ang_vel", ang_vel)
+
+    def _write(self, name, value):
+        buffer = self._buffers[name]
+        if self.debug_aliasing and np.shares_memory(buffer, value):
+            raise ValueError(f"StateAndCmd.{name} updated from a view of its own buffer")
+        np.copyto(buffer, np.reshape(value, buffer.shape), casting="unsafe")
+
+    def find_aliases(self, obj):
+        """Attributes of `obj` that share memory with the state buffers"""
+        aliases = []
+        for attr, value in vars(obj).items():
+            if not isinstance(value, np.ndarray):
+                continue
+            for name, buffer in self._buffers.items():
+                if np.shares_memory(value, buffer):
+                    aliases.append(f"{attr} -> state_cmd.{name}")
+        return aliases
+
+
+def _state_property(name):
+    def getter(self):
+        return self._views[name]
+
+    def setter(self, value):
+        self._write(name, value)
+    return property(getter, setter)
+
+
+class BatchStateAndCmd:
+    """State of `num_robots` robots as (num_robots, ...) arrays.
+
+    rows[i] is the StateAndCmd of robot i, its buffers and vel_cmd are views of row i,
+    so one update() of the batch arrays reaches every robot's policies.
+    """
+    def __init__(self, num_robots, num_joints):
+        self.num_robots = num_robots
+        self.num_joints = num_joints
+        self.debug_aliasing = False
+        self._buffers = _state_buffers((num_robots,), num_joints)
+        self._views = {name: _read_only(buffer) for name, buffer in self._buffers.items()}
+        self.vel_cmd = np.zeros((num_robots, 3))
+        self.rows = []
+        for i in range(num_robots):
+            row = StateAndCmd(num_joints, buffers={name: buffer[i] for name, buffer in self._buffers.items()})
+            row.vel_cmd = self.vel_cmd[i]
+            self.rows.append(row)
+
+    update = StateAndCmd.update
+    _write = StateAndCmd._write
+
+    def set_skill_cmd(self, cmd, robots=None):
+        """Send `cmd` to the robots in `robots` (default all)"""
+        for i in (range(self.num_robots) if robots is None else robots):
+            self.rows[i].skill_cmd = cmd
+
+
+for _name in StateAndCmd.STATE_FIELDS:
+    setattr(StateAndCmd, _name, _state_property(_name))
+    setattr(BatchStateAndCmd, _name, _state_property(_name))
+
+_ALL = slice(None)
+
+
+class PolicyOutputSnapshot:
+    """Copy of one published PolicyOutput, owned by the reading thread"""
     def __init__(self, num_joints):
-        # actions
         self.actions = np.zeros(num_joints, dtype=np.float32)
         self.kps = np.zeros(num_joints, dtype=np.float32)
         self.kds = np.zeros(num_joints, dtype=np.float32)
-        
\ No newline at end of file
+        self.seq = 0            # number of publish() calls before this one
+        self.gains_version = 0
+
+    def copy_from(self, other):
+        np.copyto(self.actions, other.actions)
+        np.copyto(self.kps, other.kps)
+        np.copyto(self.kds, other.kds)
+        self.seq = other.seq
+        self.gains_version = other.gains_version
+
+
+def _output_property(name):
+    def getter(self):
+        return self._buffers[name]
+
+    def setter(self, value):
+        np.copyto(self._buffers[name], value, casting="unsafe")
+    return property(getter, setter)
+
+
+class PolicyOutput:
+    """Policy targets in fixed float32 buffers.
+
+    FSM states fill them in place with set_actions()/set_gains() or by indexing
+    actions/kps/kds; assigning to an attribute copies into the buffer, the arrays are
+    never rebound. set_gains() only writes when the gains changed and then bumps
+    gains_version. The FSM publish()es every finished tick into a seqlocked double
+    buffer that other threads copy with read_into().
+    """
+    def __init__(self, num_joints, buffers=None):
+        self.num_joints = num_joints
+        self._buffers = buffers if buffers is not None else {
+            "actions": np.zeros(num_joints, dtype=np.float32),
+            "kps": np.zeros(num_joints, dtype=np.float32),
+            "kds": np.zeros(num_joints, dtype=np.float32),
+        }
+        self.gains_version = 0
+        # published copies for other threads
+        self.seqlock = SeqlockDoubleBuffer(lambda: PolicyOutputSnapshot(num_joints))
+
+    actions = _output_property("actions")
+    kps = _output_property("kps")
+    kds = _output_property("kds")
+
+    def set_actions(self, actions, idx=_ALL):
+        """Write the joint targets, `idx` selects the motors `actions` belongs to"""
+        self._buffers["actions"][idx] = actions
+
+    def set_gains(self, kps, kds, idx=_ALL):
+        """Write kps/kds (arrays or scalars) for the motors in `idx`, returns True if they changed"""
+        changed = False
+        for name, value in (("kps", kps), ("kds", kds)):
+            buffer = self._buffers[name]
+            if not np.all(buffer[idx] == value):
+                buffer[idx] = value
+                changed = True
+        if changed:
+            self.gains_version += 1
+        return changed
+
+    def copy_from(self, other, idx=_ALL):
+        """Take the motors in `idx` from another PolicyOutput"""
+        self.set_actions(other.actions[idx], idx)
+        self.set_gains(other.kps[idx], other.kds[idx], idx)
+
+    def publish(self):
+        """Copy the current targets into the unpublished slot and publish it"""
+        slot = self.seqlock.begin_write()
+        np.copyto(slot.actions, self._buffers["actions"])
+        np.copyto(slot.kps, self._buffers["kps"])
+        np.copyto(slot.kds, self._buffers["kds"])
+        slot.seq = self.seqlock.write_count
+        slot.gains_version = self.gains_version
+        self.seqlock.end_write()
+
+    def read_into(self, snapshot: PolicyOutputSnapshot, max_retries=10):
+        """Copy the newest published targets into `snapshot`, see SeqlockDoubleBuffer.read_into"""
+        return self.seqlock.read_into(snapshot, max_retries)
+
+
+class BatchPolicyOutput:
+    """Targets of `num_robots` robots as (num_robots, num_joints) arrays, rows[i] is robot i's PolicyOutput"""
+    def __init__(self, num_robots, num_joints):
+        self.num_robots = num_robots
+        self.num_joints = num_joints
+        self._buffers = {
+            "actions": np.zeros((num_robots, num_joints), dtype=np.float32),
+            "kps": np.zeros((num_robots, num_joints), dtype=np.float32),
+            "kds": np.zeros((num_robots, num_joints), dtype=np.float32),
+        }
+        self.rows = [PolicyOutput(num_joints, buffers={name: buffer[i] for name, buffer in self._buffers.items()})
+                     for i in range(num_robots)]
+
+    actions = _output_property("actions")
+    kps = _output_property("kps")
+    kds = _output_property("kds")
@@ -0,0 +1,57 @@
+import struct
+import zlib
+from operator import attrgetter
+
+# table reversing the bit order inside one byte
+_BIT_REVERSE = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+
+
+def crc32_words(data, num_words):
+    """CRC-32/MPEG-2 over the first `num_words` little-endian 32-bit words of `data`.
+
+    Same result as the unitree SDK crc32_core (poly 0x04C11DB7, init 0xFFFFFFFF,
+    MSB first, no final xor). zlib.crc32 runs the reflected variant of the same
+    polynomial in C, so the input bits are reversed per word and the result reversed back.
+    """
+    # reversing all 32 bits of each word == reversing its byte order, then the bits of each byte
+    size = num_words * 4
+    swapped = bytearray(size)
+    for i in range(4):
+        swapped[i::4] = data[3 - i:size:4]
+    crc = zlib.crc32(swapped.translate(_BIT_REVERSE)) ^ 0xFFFFFFFF
+    return int.from_bytes(crc.to_bytes(4, "little").translate(_BIT_REVERSE), "big")
+
+
+class FastCRC:
+    """Reusable CRC for unitree_hg LowCmd, packs into a preallocated buffer with a precompiled struct.
+
+    Other message types are passed to `fallback` (e.g. the SDK CRC object).
+    """
+    HG_LOWCMD_TYPENAME = "unitree_hg.msg.dds_.LowCmd_"
+    HG_NUM_MOTORS = 35
+
+    def __init__(self, fallback=None):
+        self.fallback = fallback
+        # same layout as the SDK packer: 4 bytes aligned, little-endian, 1004 bytes
+        self.hg_lowcmd_struct = struct.Struct("<2B2x" + "B3x5fI" * self.HG_NUM_MOTORS + "5I")
+        self.hg_lowcmd_buffer = bytearray(self.hg_lowcmd_struct.size)
+        # the crc field itself is the last word and is excluded
+        self.hg_lowcmd_words = (self.hg_lowcmd_struct.size >> 2) - 1
+        self.motor_fields = attrgetter("mode", "q", "dq", "tau", "kp", "kd", "reserve")
+
+    def Crc(self, cmd):
+        if getattr(cmd, "__idl_typename__", None) == self.HG_LOWCMD_TYPENAME:
+            return self.crc_hg_lowcmd(cmd)
+        if self.fallback is None:
+            raise TypeError(f"FastCRC has no packer for {type(cmd).__name__}")
+        return self.fallback.Crc(cmd)
+
+    def crc_hg_lowcmd(self, cmd):
+        values = [cmd.mode_pr, cmd.mode_machine]
+        motor_fields = self.motor_fields
+        for motor_cmd in cmd.motor_cmd:
+            values.extend(motor_fields(motor_cmd))
+        values.extend(cmd.reserve)
+        values.append(0)
+        self.hg_lowcmd_struct.pack_into(self.hg_lowcmd_buffer, 0, *values)
+        return crc32_words(self.hg_lowcmd_buffer, self.hg_lowcmd_words)
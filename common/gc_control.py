@@ -0,0 +1,65 @@
+import gc
+import time
+
+
+class GCMode:
+    DEFAULT = "default"   # python's automatic collector
+    MANAGED = "managed"   # frozen startup heap, collections only in loop slack time
+
+
+class GCManager:
+    def __init__(self, mode=GCMode.MANAGED, min_slack=0.005, gen1_interval=50):
+        self.mode = mode
+        self.min_slack = min_slack          # only collect when at least this much time is left in the tick
+        self.gen1_interval = gen1_interval  # every n-th slack collection also sweeps generation 1
+        self.active = False
+        self.collect_count = 0
+        self.skipped_count = 0
+        self.last_pause = 0.
+        self.last_generation = -1
+        self.max_pause = 0.
+
+    @property
+    def managed(self):
+        return self.mode == GCMode.MANAGED
+
+    def freeze(self):
+        """Move everything allocated during startup (models, configs) out of the collector's reach"""
+        if not self.managed:
+            return
+        gc.collect()
+        gc.freeze()
+        print(f"GC: froze {gc.get_freeze_count()} startup objects")
+
+    def set_active(self, active):
+        """Disable automatic collection while actively controlling the robot"""
+        if not self.managed or active == self.active:
+            return
+        self.active = active
+        if active:
+            gc.disable()
+        else:
+            gc.enable()
+
+    def collect_in_slack(self, remaining):
+        """Run a young-generation collection if `remaining` seconds of the tick are left, returns the pause"""
+        self.last_pause = 0.
+        self.last_generation = -1
+        if not self.managed or not self.active:
+            return 0.
+        if remaining < self.min_slack:
+            self.skipped_count += 1
+            return 0.
+
+        self.collect_count += 1
+        generation = 1 if self.collect_count % self.gen1_interval == 0 else 0
+        start_time = time.perf_counter()
+        gc.collect(generation)
+        self.last_pause = time.perf_counter() - start_time
+        self.last_generation = generation
+        self.max_pause = max(self.max_pause, self.last_pause)
+        return self.last_pause
+
+    def get_summary(self):
+        return (f"GC collections: {self.collect_count}, skipped: {self.skipped_count}, "
+                f"max pause: {self.max_pause * 1000:.3f} ms")
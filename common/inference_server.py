@@ -0,0 +1,330 @@
+from common.path_config import PROJECT_ROOT
+
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import threading
+import numpy as np
+import time
+from common.model_loader import ort_session_options, set_ort_options, get_ort_options
+from common.status_display import status
+
+# header layout per slot (int64): [seq, status, ack]
+HEADER_SEQ = 0
+HEADER_STATUS = 1
+HEADER_ACK = 2
+HEADER_SIZE = 3
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+
+class InferenceServerError(RuntimeError):
+    pass
+
+
+def _buffer_views(buf, num_slots, max_obs, max_actions):
+    """Map header/variant/obs/action arrays onto a shared memory buffer, one row per slot"""
+    header = np.ndarray((num_slots, HEADER_SIZE), dtype=np.int64, buffer=buf, offset=0)
+    # model variant served for every slot, 0 is the one loaded at start
+    variants = np.ndarray((num_slots,), dtype=np.int64, buffer=buf, offset=header.nbytes)
+    obs_offset = header.nbytes + variants.nbytes
+    obs = np.ndarray((num_slots, max_obs), dtype=np.float32, buffer=buf, offset=obs_offset)
+    act_offset = obs_offset + obs.nbytes
+    act = np.ndarray((num_slots, max_actions), dtype=np.float32, buffer=buf, offset=act_offset)
+    return header, variants, obs, act
+
+
+def _load_backend(spec):
+    """Build and warm up one inference backend inside the server process"""
+    obs = np.zeros((1, spec["num_obs"]), dtype=np.float32)
+    if spec["kind"] == "onnx":
+        import onnxruntime
+        session = onnxruntime.InferenceSession(spec["path"], sess_options=ort_session_options())
+        input_name = session.get_inputs()[0].name
+        run = lambda x: session.run(None, {input_name: x})[0]
+    else:
+        import torch
+        policy = torch.jit.load(spec["path"])
+
+        def run(x):
+            with torch.inference_mode():
+                return policy(torch.from_numpy(x)).numpy()
+    for _ in range(50):
+        run(obs)
+    return run
+
+
+def _reload_loop(conn, specs, backends, variant_buf, stop):
+    """Builds new model variants next to the served ones, requested by InferenceServer.stage()"""
+    while not stop.is_set():
+        if not conn.poll(0.1):
+            continue
+        slot, path, variant = conn.recv()
+        try:
+            backend = _load_backend(dict(specs[slot], path=path))
+            action = np.asarray(backend(np.zeros((1, specs[slot]["num_obs"]), dtype=np.float32)))
+            if action.size != specs[slot]["num_actions"]:
+                raise ValueError(f"model outputs {action.size} actions, expected {specs[slot]['num_actions']}")
+        except Exception as e:
+            conn.send((variant, str(e)))
+            continue
+        # variants older than the served one can no longer be activated
+        for old in [v for v in backends[slot] if v < variant_buf[slot]]:
+            del backends[slot][old]
+        backends[slot][variant] = backend
+        conn.send((variant, None))
+
+
+def _serve_slot(spec, backends, header, variant_buf, obs_buf, act_buf, request, response, stop):
+    """Answers the requests of one slot, every slot has its own thread so e.g. the two
+    sub-policies of DualBody are inferred concurrently"""
+    num_obs = spec["num_obs"]
+    num_actions = spec["num_actions"]
+    obs_input = np.zeros((1, num_obs), dtype=np.float32)
+    while not stop.is_set():
+        if not request.acquire(timeout=0.1):
+            continue
+        seq = int(header[HEADER_SEQ])
+        try:
+            obs_input[0] = obs_buf[:num_obs]
+            action = backends[int(variant_buf[0])](obs_input)
+            act_buf[:num_actions] = np.asarray(action, dtype=np.float32).reshape(-1)[:num_actions]
+            header[HEADER_STATUS] = STATUS_OK
+        except Exception as e:
+            print(f"❌ Inference server error ({spec['name']}): {e}")
+            header[HEADER_STATUS] = STATUS_ERROR
+        header[HEADER_ACK] = seq
+        response.release()
+
+
+def _server_main(shm_name, specs, max_obs, max_actions, requests, responses, ready, stop, ort_options, reload_conn):
+    set_ort_options(**ort_options)
+    # spawned children share the parent's resource tracker, the parent unlinks the segment
+    shm = shared_memory.SharedMemory(name=shm_name)
+    header, variant_buf, obs_buf, act_buf = _buffer_views(shm.buf, len(specs), max_obs, max_actions)
+    backends = [{0: _load_backend(spec)} for spec in specs]
+    threads = [threading.Thread(target=_reload_loop, args=(reload_conn, specs, backends, variant_buf, stop),
+                                name="inference_reload", daemon=True)]
+    for slot, spec in enumerate(specs):
+        threads.append(threading.Thread(
+            target=_serve_slot, name=f"inference_{spec['name']}", daemon=True,
+            args=(spec, backends[slot], header[slot], variant_buf[slot:slot + 1], obs_buf[slot], act_buf[slot],
+                  requests[slot], responses[slot], stop)))
+    for thread in threads:
+        thread.start()
+    ready.set()
+
+    # the threads poll `stop`, waiting on the event here would hang set() in the parent
+    # if this process is killed while waiting
+    for thread in threads:
+        thread.join()
+    del header, variant_buf, obs_buf, act_buf
+    shm.close()
+
+
+class InferenceServer:
+    """`timeout` bounds one request, keep it below the control period so a stalled server
+    costs at most one tick before the policies fall back to their in-process models"""
+    def __init__(self, timeout=0.01):
+        self.timeout = timeout
+        self.specs = []
+        self.proxies = []
+        self.process = None
+        self.shm = None
+        self.ctx = mp.get_context("spawn")
+        # one doorbell pair, lock and sequence number per slot, created in start()
+        self.requests = []
+        self.responses = []
+        self.locks = []
+        self.seqs = []
+        self.ready = self.ctx.Event()
+        self.stop = self.ctx.Event()
+        self.last_roundtrip = 0.
+        # model reloads go over a pipe to a build thread in the server process
+        self.reload_conn, self.server_reload_conn = self.ctx.Pipe()
+        self.reload_lock = threading.Lock()
+        self.variant_count = 0
+        # cleared on the first timeout or failure, the proxies then use the in-process models
+        self.available = True
+
+    def register(self, name, kind, path, num_obs, num_actions):
+        """Register a model and return its slot index"""
+        self.specs.append({
+            "name": name,
+            "kind": kind,
+            "path": path,
+            "num_obs": int(num_obs),
+            "num_actions": int(num_actions),
+        })
+        return len(self.specs) - 1
+
+    def attach(self, fsm):
+        """Move the backends of all FSM policies into the server process"""
+        for policy in fsm.all_policies():
+            if hasattr(policy, "ort_session"):
+                slot = self.register(policy.name_str, "onnx", policy.onnx_path, policy.num_obs, policy.num_actions)
+                self.proxies.append((policy, "ort_session", RemoteOrtSession(self, slot, policy.ort_session)))
+            elif hasattr(policy, "policy") and hasattr(policy, "policy_path"):
+                slot = self.register(policy.name_str, "torch", policy.policy_path, policy.num_obs, policy.num_actions)
+                self.proxies.append((policy, "policy", RemoteTorchPolicy(self, slot, policy.policy)))
+
+    def start(self):
+        if not self.specs:
+            print("⚠️  Inference server has no models to serve")
+            return
+        self.max_obs = max(spec["num_obs"] for spec in self.specs)
+        self.max_actions = max(spec["num_actions"] for spec in self.specs)
+        num_slots = len(self.specs)
+        size = 8 * num_slots * (HEADER_SIZE + 1) + 4 * num_slots * (self.max_obs + self.max_actions)
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.header, self.variant_buf, self.obs_buf, self.act_buf = _buffer_views(
+            self.shm.buf, num_slots, self.max_obs, self.max_actions)
+        self.header[:] = 0
+        self.variant_buf[:] = 0
+        self.requests = [self.ctx.Semaphore(0) for _ in range(num_slots)]
+        self.responses = [self.ctx.Semaphore(0) for _ in range(num_slots)]
+        self.locks = [threading.Lock() for _ in range(num_slots)]
+        self.seqs = [0] * num_slots
+
+        self.process = self.ctx.Process(
+            target=_server_main,
+            args=(self.shm.name, self.specs, self.max_obs, self.max_actions,
+                  self.requests, self.responses, self.ready, self.stop, get_ort_options(), self.server_reload_conn),
+            daemon=True,
+        )
+        self.process.start()
+        print("Waiting for inference server to load models ...")
+        if not self.ready.wait(timeout=120.):
+            self.shutdown()
+            raise RuntimeError("Inference server failed to start")
+
+        for policy, attr, proxy in self.proxies:
+            setattr(policy, attr, proxy)
+        print(f"Inference server ready, serving {len(self.specs)} models (pid {self.process.pid})")
+
+    def infer(self, slot, obs):
+        """Run one inference in the server process, returns a flat float32 action.
+
+        Requests for different slots run concurrently. Raises InferenceServerError on a
+        timeout or a failure in the server.
+        """
+        spec = self.specs[slot]
+        header = self.header[slot]
+        response = self.responses[slot]
+        with self.locks[slot]:
+            start_time = time.perf_counter()
+            self.obs_buf[slot, :spec["num_obs"]] = np.asarray(obs, dtype=np.float32).reshape(-1)
+            self.seqs[slot] += 1
+            seq = self.seqs[slot]
+            header[HEADER_SEQ] = seq
+            self.requests[slot].release()
+            deadline = start_time + self.timeout
+            while True:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 or not response.acquire(timeout=remaining):
+                    raise InferenceServerError(f"inference server timeout ({spec['name']})")
+                # responses to requests that timed out earlier are dropped here
+                if header[HEADER_ACK] == seq:
+                    break
+            if header[HEADER_STATUS] != STATUS_OK:
+                raise InferenceServerError(f"inference server failed ({spec['name']})")
+            action = self.act_buf[slot, :spec["num_actions"]].copy()
+            self.last_roundtrip = time.perf_counter() - start_time
+        return action
+
+    def stage(self, slot, path, timeout=60.):
+        """Build `path` for `slot` in the server next to the served model, returns its variant.
+
+        Blocks, call it off the control thread. Raises InferenceServerError if the model
+        fails to build or does not match the slot's action size.
+        """
+        with self.reload_lock:
+            self.variant_count += 1
+            variant = self.variant_count
+            self.reload_conn.send((slot, path, variant))
+            deadline = time.perf_counter() + timeout
+            while True:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 or not self.reload_conn.poll(remaining):
+                    raise InferenceServerError(f"inference server did not build {path} in time")
+                # replies to stage requests that timed out earlier are dropped here
+                reply_variant, error = self.reload_conn.recv()
+                if reply_variant == variant:
+                    break
+        if error is not None:
+            raise InferenceServerError(f"inference server rejected {path}: {error}")
+        return variant
+
+    def activate(self, slot, variant):
+        """Serve a staged variant from the next request on, False if a newer one is already served"""
+        if variant < self.variant_buf[slot]:
+            return False
+        self.variant_buf[slot] = variant
+        return True
+
+    def disable(self, error):
+        """Stop sending requests after a timeout or failure, the server process is left to shutdown()"""
+        if self.available:
+            self.available = False
+            status.post(f"⚠️  {error}, falling back to the in-process models")
+
+    def shutdown(self):
+        self.stop.set()
+        if self.process is not None:
+            self.process.join(timeout=2.0)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process = None
+        if self.shm is not None:
+            del self.header, self.variant_buf, self.obs_buf, self.act_buf
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+class RemoteBackend:
+    """Base of the server proxies. `local` is the in-process model, it runs once the server is
+    unavailable. Model swaps keep the proxy: stage() the new file off the control thread,
+    then activate() it together with its in-process counterpart at a safe point."""
+    def __init__(self, server: InferenceServer, slot, local):
+        self.server = server
+        self.slot = slot
+        self.local = local
+
+    def stage(self, path):
+        """Build `path` in the server, returns a variant for activate(), None while the server is unavailable"""
+        if not self.server.available:
+            return None
+        return self.server.stage(self.slot, path)
+
+    def activate(self, variant, local):
+        """Switch the server and the fallback to the new model, False if `variant` is outdated"""
+        if variant is not None and not self.server.activate(self.slot, variant):
+            return False
+        self.local = local
+        return True
+
+
+class RemoteOrtSession(RemoteBackend):
+    """Drop-in replacement for onnxruntime.InferenceSession.run"""
+    def run(self, output_names, input_feed):
+        if self.server.available:
+            obs = next(iter(input_feed.values()))
+            try:
+                return [self.server.infer(self.slot, obs)[None, :]]
+            except InferenceServerError as e:
+                self.server.disable(e)
+        return self.local.run(output_names, input_feed)
+
+
+class RemoteTorchPolicy(RemoteBackend):
+    """Drop-in replacement for a torch.jit policy module"""
+    def __call__(self, obs_tensor):
+        if self.server.available:
+            import torch
+            try:
+                action = self.server.infer(self.slot, obs_tensor.detach().cpu().numpy())
+                return torch.from_numpy(action).unsqueeze(0)
+            except InferenceServerError as e:
+                self.server.disable(e)
+        return self.local(obs_tensor)
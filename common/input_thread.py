@@ -0,0 +1,219 @@
+from common.path_config import PROJECT_ROOT
+
+import threading
+import time
+import numpy as np
+
+
+def _changed_mask(counts, last_counts):
+    """Bit i set where counts[i] moved since last_counts"""
+    mask = 0
+    for i, (count, last_count) in enumerate(zip(counts, last_counts)):
+        if count != last_count:
+            mask |= 1 << i
+    return mask
+
+
+class InputThread:
+    """Keyboard/joystick polling on its own thread, read by the control loop without locks.
+
+    The pygame device is created on the input thread (SDL pumps events on the thread that
+    opened the window) by `device_factory`, which returns (device, button_enum). The thread
+    wakes on pygame events, at least every 1 / poll_rate seconds, and publishes an immutable
+    tuple; the control loop picks it up with one reference read in update().
+
+    Button edges are published as per-button press/release counters, update() reports the
+    buttons whose counters moved since its previous call. Two taps of the same button
+    between two control ticks are reported as one press and one release, never lost. A
+    button state change is accepted once the new state has been stable for `debounce` seconds.
+    """
+    def __init__(self, device_factory, poll_rate=200., debounce=0.01, stats_window=200):
+        self.device_factory = device_factory
+        self.poll_period = 1.0 / poll_rate
+        self.debounce = debounce
+        self.device = None
+        self.button_enum = None
+        self.axis_count = 0
+        self.running = False
+        self.ready = threading.Event()
+        self.error = None
+        self.thread = None
+        self.polls = 0
+
+        # (held mask, press counts, release counts, axes, time of the last edge), replaced as a
+        # whole so a reader never sees a half-written state
+        self.snapshot = (0, (), (), (), 0.)
+        # consumer side, owned by the control loop
+        self.keys = 0
+        self.pressed = 0
+        self.released = 0
+        self.axis_states = ()
+        self.last_press_counts = ()
+        self.last_release_counts = ()
+        self.last_edge_time = 0.
+
+        # edge detected on the input thread -> seen by update() on the control loop
+        self.stats_window = stats_window
+        self.edge_latency = np.zeros(stats_window, dtype=np.float64)
+        self.stats_index = 0
+        self.stats_count = 0
+
+    def start(self, timeout=10.0):
+        """Create the device on the input thread, returns once it is open"""
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="input", daemon=True)
+        self.thread.start()
+        if not self.ready.wait(timeout):
+            raise RuntimeError("input device did not open in time")
+        if self.error is not None:
+            raise self.error
+        _, self.last_press_counts, self.last_release_counts, self.axis_states, _ = self.snapshot
+        return self
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+
+    def _run(self):
+        try:
+            self.device, self.button_enum = self.device_factory()
+            self.axis_count = self.device.axis_count
+        except Exception as e:
+            self.error = e
+            self.ready.set()
+            return
+        button_count = self.device.button_count
+        held = 0
+        press_counts = [0] * button_count
+        release_counts = [0] * button_count
+        # tuples published in the snapshot, rebuilt only when a counter moved
+        press_snapshot = tuple(press_counts)
+        release_snapshot = tuple(release_counts)
+        edge_time = 0.
+        self.snapshot = (held, press_snapshot, release_snapshot, tuple(self.device.axis_states), edge_time)
+        self.ready.set()
+
+        # time the raw state first differed from the accepted one, None while they agree
+        differs_since = [None] * button_count
+        next_poll = time.perf_counter()
+        while self.running:
+            if hasattr(self.device, "wait_event"):
+                self.device.wait_event(self.poll_period)
+            # bursts of events (mouse motion over the window) still poll at most at poll_rate
+            now = time.perf_counter()
+            if now < next_poll:
+                time.sleep(next_poll - now)
+                now = time.perf_counter()
+            next_poll = now + self.poll_period
+
+            self.device.update()
+            self.polls += 1
+            states = self.device.button_states
+            edges = False
+            for i in range(button_count):
+                bit = 1 << i
+                if bool(states[i]) == bool(held & bit):
+                    differs_since[i] = None
+                    continue
+                if differs_since[i] is None:
+                    differs_since[i] = now
+                if now - differs_since[i] < self.debounce:
+                    continue
+                # latency is counted from the first poll that saw the change, debounce included
+                edge_time = differs_since[i]
+                differs_since[i] = None
+                held ^= bit
+                if held & bit:
+                    press_counts[i] += 1
+                else:
+                    release_counts[i] += 1
+                edges = True
+            if edges:
+                press_snapshot = tuple(press_counts)
+                release_snapshot = tuple(release_counts)
+            self.snapshot = (held, press_snapshot, release_snapshot, tuple(self.device.axis_states), edge_time)
+
+    def update(self):
+        """Take the latest snapshot, edges are the counters that moved since the previous call"""
+        held, press_counts, release_counts, axes, edge_time = self.snapshot
+        self.keys = held
+        # the counter tuples are only replaced when an edge was accepted
+        self.pressed = 0
+        self.released = 0
+        if press_counts is not self.last_press_counts:
+            self.pressed = _changed_mask(press_counts, self.last_press_counts)
+            self.last_press_counts = press_counts
+        if release_counts is not self.last_release_counts:
+            self.released = _changed_mask(release_counts, self.last_release_counts)
+            self.last_release_counts = release_counts
+        self.axis_states = axes
+        if edge_time != self.last_edge_time:
+            self.last_edge_time = edge_time
+            self.edge_latency[self.stats_index] = time.perf_counter() - edge_time
+            self.stats_index = (self.stats_index + 1) % self.stats_window
+            self.stats_count = min(self.stats_count + 1, self.stats_window)
+
+    def is_button_pressed(self, button_id):
+        """detect button held"""
+        return button_id >= 0 and bool(self.keys >> button_id & 1)
+
+    def is_button_down(self, button_id):
+        """detect press edge since the last update"""
+        return button_id >= 0 and bool(self.pressed >> button_id & 1)
+
+    def is_button_released(self, button_id):
+        """detect release edge since the last update"""
+        return button_id >= 0 and bool(self.released >> button_id & 1)
+
+    def get_axis_value(self, axis_id):
+        """get joystick axis value"""
+        if 0 <= axis_id < len(self.axis_states):
+            return self.axis_states[axis_id]
+        return 0.0
+
+    def get_stats(self):
+        n = self.stats_count
+        latency = self.edge_latency[:n]
+        return {
+            "edges": n,
+            "latency_mean": float(np.mean(latency)) if n > 0 else 0.,
+            "latency_max": float(np.max(latency)) if n > 0 else 0.,
+            "polls": self.polls,
+        }
+
+    def format_stats(self):
+        stats = self.get_stats()
+        return (f"input edge->control latency mean {stats['latency_mean'] * 1e3:.2f}ms "
+                f"max {stats['latency_max'] * 1e3:.2f}ms over {stats['edges']} edges, {stats['polls']} polls")
+
+
+def open_gamepad():
+    """JoyStick if one is connected, otherwise the keyboard window. Call on the input thread"""
+    from common.joystick import JoyStick, JoystickButton
+    try:
+        device = JoyStick()
+        print("Joystick controller initialized successfully!")
+        return device, JoystickButton
+    except RuntimeError:
+        print("No joystick detected, switching to keyboard control...")
+        return open_keyboard()
+
+
+def open_keyboard():
+    from common.joystick import Keyboard, KeyboardButton
+    print("=" * 60)
+    print("🎮 KEYBOARD CONTROL MODE ACTIVATED")
+    print("=" * 60)
+    print("📌 IMPORTANT: A separate control window will open!")
+    print("   Focus on the 'Robot Keyboard Controller' window for input")
+    print("   (NOT the MuJoCo window - it has conflicting shortcuts)")
+    print("")
+    print("🎯 Controls:")
+    print("   WASD - Move robot")
+    print("   Shift+Arrows - Rotate")
+    print("   J(A), K(B), U(X), I(Y) - Action buttons")
+    print("   Q(L1), E(R1) - Shoulder buttons")
+    print("   Space(START), Esc(EXIT)")
+    print("=" * 60)
+    return Keyboard(), KeyboardButton
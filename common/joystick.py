@@ -65,6 +65,10 @@ class JoyStick:
         for i in range(self.hat_count):
             self.hat_states[i] = self.joystick.get_hat(i)
 
+    def wait_event(self, timeout):
+        """block until a pygame event arrives or `timeout` seconds pass, update() reads the new state"""
+        pygame.event.wait(max(int(timeout * 1000), 1))
+
     def is_button_pressed(self, button_id):
         """detect button pressed"""
         if 0 <= button_id < self.button_count:
@@ -258,6 +262,10 @@ class Keyboard:
             else:
                 self.axis_states[axis_id] = 0.0
     
+    def wait_event(self, timeout):
+        """Block until a pygame event arrives or `timeout` seconds pass, update() reads the new state"""
+        pygame.event.wait(max(int(timeout * 1000), 1))
+
     def is_button_pressed(self, button_id):
         """Detect if button is currently pressed"""
         if 0 <= button_id < self.button_count:
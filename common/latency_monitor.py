@@ -0,0 +1,57 @@
+import numpy as np
+
+
+class StateLatencyMonitor:
+    """Per control tick: age of the LowState used by the policy and LowState-to-publish latency.
+
+    Also counts control ticks that saw no new LowState since the previous tick.
+    """
+    def __init__(self, stats_window=500):
+        self.stats_window = stats_window
+        self.state_age = np.zeros(stats_window, dtype=np.float64)
+        self.publish_latency = np.zeros(stats_window, dtype=np.float64)
+        self.stats_index = 0
+        self.stats_count = 0
+        self.last_seq = -1
+        self.stale_ticks = 0
+
+    def update(self, snapshot, policy_start_time, publish_time):
+        """Record one tick, times are time.perf_counter() seconds. Returns (state_age, latency, new_msgs)"""
+        recv_time = snapshot.recv_time_ns * 1e-9
+        state_age = policy_start_time - recv_time
+        latency = publish_time - recv_time
+        new_msgs = snapshot.seq - self.last_seq if self.last_seq >= 0 else 1
+        if new_msgs == 0:
+            self.stale_ticks += 1
+        self.last_seq = snapshot.seq
+
+        self.state_age[self.stats_index] = state_age
+        self.publish_latency[self.stats_index] = latency
+        self.stats_index = (self.stats_index + 1) % self.stats_window
+        self.stats_count = min(self.stats_count + 1, self.stats_window)
+        return state_age, latency, new_msgs
+
+    def get_stats(self):
+        n = self.stats_count
+        if n == 0:
+            return {"state_age_mean": 0., "state_age_max": 0., "latency_mean": 0., "latency_max": 0.,
+                    "stale_ticks": self.stale_ticks}
+        state_age = self.state_age[:n]
+        latency = self.publish_latency[:n]
+        return {
+            "state_age_mean": float(np.mean(state_age)),
+            "state_age_max": float(np.max(state_age)),
+            "latency_mean": float(np.mean(latency)),
+            "latency_max": float(np.max(latency)),
+            "stale_ticks": self.stale_ticks,
+        }
+
+    def format_stats(self, state_buffer=None):
+        stats = self.get_stats()
+        text = (f"state age mean {stats['state_age_mean'] * 1e3:.2f}ms max {stats['state_age_max'] * 1e3:.2f}ms, "
+                f"state->publish mean {stats['latency_mean'] * 1e3:.2f}ms max {stats['latency_max'] * 1e3:.2f}ms, "
+                f"stale ticks {stats['stale_ticks']}")
+        if state_buffer is not None:
+            text += (f", lowstate ticks missed {state_buffer.tick_missed} duplicated {state_buffer.tick_duplicates}, "
+                     f"read misses {state_buffer.read_misses}")
+        return text
@@ -0,0 +1,49 @@
+import numpy as np
+
+
+class LowStateDecoder:
+    """Bulk copy of the unitree_hg LowState motor fields into NumPy arrays"""
+    def __init__(self, num_joints):
+        self.num_joints = num_joints
+
+    def decode(self, msg, q_out, dq_out, tau_est_out=None):
+        motors = msg.motor_state[:self.num_joints]
+        q_out[:] = [m.q for m in motors]
+        dq_out[:] = [m.dq for m in motors]
+        if tau_est_out is not None:
+            tau_est_out[:] = [m.tau_est for m in motors]
+
+
+class LowCmdEncoder:
+    """Writes NumPy targets/gains into a cached unitree_hg LowCmd message.
+
+    dq, tau and mode never change, they are set once here. Gains are only rewritten when
+    they differ from the last call; call invalidate() after editing the message elsewhere
+    (e.g. create_damping_cmd).
+    """
+    def __init__(self, cmd, num_joints):
+        self.cmd = cmd
+        self.num_joints = num_joints
+        self.motor_cmds = list(cmd.motor_cmd[:num_joints])
+        for motor_cmd in self.motor_cmds:
+            motor_cmd.mode = 1
+            motor_cmd.dq = 0.
+            motor_cmd.tau = 0.
+        self.last_kps = np.full(num_joints, np.nan, dtype=np.float32)
+        self.last_kds = np.full(num_joints, np.nan, dtype=np.float32)
+
+    def invalidate(self):
+        self.last_kps.fill(np.nan)
+        self.last_kds.fill(np.nan)
+
+    def encode(self, q, kps, kds):
+        for motor_cmd, q_i in zip(self.motor_cmds, q.tolist()):
+            motor_cmd.q = q_i
+        if not np.array_equal(kps, self.last_kps):
+            for motor_cmd, kp in zip(self.motor_cmds, kps.tolist()):
+                motor_cmd.kp = kp
+            self.last_kps[:] = kps
+        if not np.array_equal(kds, self.last_kds):
+            for motor_cmd, kd in zip(self.motor_cmds, kds.tolist()):
+                motor_cmd.kd = kd
+            self.last_kds[:] = kds
@@ -0,0 +1,113 @@
+from common.path_config import PROJECT_ROOT
+
+import threading
+import time
+import numpy as np
+from common.status_display import status
+
+# thread settings for every onnxruntime session created in this process, 0 = onnxruntime default
+_ort_options = {"intra_threads": 0, "inter_threads": 0, "intra_affinities": None}
+
+
+def set_ort_options(intra_threads=0, inter_threads=0, intra_affinities=None):
+    """Thread settings used by ort_session_options(), set before the policies are created.
+
+    `intra_affinities` pins the intra-op worker threads, e.g. "3;4" (onnxruntime format,
+    one entry per worker thread, the calling thread is not included).
+    """
+    _ort_options["intra_threads"] = intra_threads
+    _ort_options["inter_threads"] = inter_threads
+    _ort_options["intra_affinities"] = intra_affinities
+
+
+def get_ort_options():
+    return dict(_ort_options)
+
+
+def ort_session_options():
+    import onnxruntime
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = _ort_options["intra_threads"]
+    options.inter_op_num_threads = _ort_options["inter_threads"]
+    options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+    if _ort_options["intra_affinities"]:
+        options.add_session_config_entry("session.intra_op_thread_affinities", _ort_options["intra_affinities"])
+    return options
+
+
+def build_onnx_session(onnx_path, num_obs, warmup_steps=50):
+    """Create an onnxruntime session and run it a few times so the first real call is not slow"""
+    import onnxruntime
+    session = onnxruntime.InferenceSession(onnx_path, sess_options=ort_session_options())
+    input_name = session.get_inputs()[0].name
+    obs = np.zeros((1, num_obs), dtype=np.float32)
+    for _ in range(warmup_steps):
+        session.run(None, {input_name: obs})
+    return session, input_name
+
+
+def build_torch_policy(policy_path, num_obs, warmup_steps=50):
+    """Load a TorchScript policy and warm it up"""
+    import torch
+    policy = torch.jit.load(policy_path)
+    obs = torch.zeros((1, num_obs), dtype=torch.float32)
+    for _ in range(warmup_steps):
+        with torch.inference_mode():
+            policy(obs)
+    return policy
+
+
+def check_model_shapes(run_fn, num_obs, num_actions):
+    """Run a zero observation through `run_fn` and make sure the action size matches the policy"""
+    action = np.asarray(run_fn(np.zeros((1, num_obs), dtype=np.float32)))
+    if action.size != num_actions:
+        raise ValueError(f"model outputs {action.size} actions, policy expects {num_actions}")
+
+
+class ModelPreloader:
+    """Builds a model on a background thread, the result is picked up later with take()"""
+    def __init__(self, name="model_preloader"):
+        self.name = name
+        self.lock = threading.Lock()
+        self.thread = None
+        self.request_id = 0
+        self.result = None
+        self.error = None
+
+    def request(self, build_fn, tag):
+        """Start building `build_fn()` in the background, a newer request supersedes older ones"""
+        with self.lock:
+            self.request_id += 1
+            request_id = self.request_id
+            self.result = None
+            self.error = None
+        self.thread = threading.Thread(target=self._worker, args=(request_id, build_fn, tag),
+                                       name=self.name, daemon=True)
+        self.thread.start()
+
+    def _worker(self, request_id, build_fn, tag):
+        start_time = time.perf_counter()
+        try:
+            model = build_fn()
+        except Exception as e:
+            with self.lock:
+                if request_id == self.request_id:
+                    self.error = f"{tag}: {e}"
+            status.post(f"❌ Failed to preload {tag}: {e}")
+            return
+        build_time = time.perf_counter() - start_time
+        with self.lock:
+            # drop results of superseded requests
+            if request_id == self.request_id:
+                self.result = (tag, model, build_time)
+        status.post(f"📦 Preloaded {tag} in {build_time:.2f}s")
+
+    def is_busy(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def take(self):
+        """Return (tag, model, build_time) of a finished preload once, otherwise None"""
+        with self.lock:
+            result = self.result
+            self.result = None
+        return result
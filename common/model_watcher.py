@@ -0,0 +1,135 @@
+from common.path_config import PROJECT_ROOT
+
+import os
+import threading
+import time
+from common.status_display import status
+from common.model_loader import build_onnx_session, build_torch_policy, check_model_shapes
+from common.inference_server import RemoteBackend
+
+
+class WatchedModel:
+    def __init__(self, policy, kind, path_attr):
+        self.policy = policy
+        self.kind = kind            # "onnx" or "torch"
+        self.backend_attr = "ort_session" if kind == "onnx" else "policy"
+        self.path_attr = path_attr  # the policy may point itself at another file at runtime
+        self.path = getattr(policy, path_attr)
+        self.stat = self._read_stat()
+        self.changed_stat = None
+
+    def _read_stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+
+class ModelWatcher:
+    """Rebuilds policy backends whose model files changed on disk and swaps them in while the policy is idle"""
+    def __init__(self, fsm, poll_interval=1.0):
+        self.fsm = fsm
+        self.poll_interval = poll_interval
+        self.models = []
+        for policy in fsm.all_policies():
+            if hasattr(policy, "ort_session"):
+                self.models.append(WatchedModel(policy, "onnx", "onnx_path"))
+            elif hasattr(policy, "policy") and hasattr(policy, "policy_path"):
+                self.models.append(WatchedModel(policy, "torch", "policy_path"))
+
+        self.lock = threading.Lock()
+        self.pending = {}          # policy -> (model, backend, server variant, build_time, staged_time)
+        self.has_pending = False
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._watch_loop, name="model_watcher", daemon=True)
+        self.thread.start()
+        status.post(f"👀 Watching {len(self.models)} model files for changes")
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=2 * self.poll_interval)
+
+    def _watch_loop(self):
+        while self.running:
+            for model in self.models:
+                path = getattr(model.policy, model.path_attr)
+                if path != model.path:
+                    model.path = path
+                    model.stat = model._read_stat()
+                    model.changed_stat = None
+                    continue
+                stat = model._read_stat()
+                if stat is None or stat == model.stat:
+                    model.changed_stat = None
+                    continue
+                # wait until the file stopped changing so a half-copied file is never loaded
+                if stat != model.changed_stat:
+                    model.changed_stat = stat
+                    continue
+                model.stat = stat
+                model.changed_stat = None
+                self._rebuild(model)
+            time.sleep(self.poll_interval)
+
+    def _rebuild(self, model):
+        policy = model.policy
+        name = os.path.basename(model.path)
+        status.post(f"🔄 {policy.name_str}: {name} changed, rebuilding ...")
+        start_time = time.perf_counter()
+        try:
+            if model.kind == "onnx":
+                session, input_name = build_onnx_session(model.path, policy.num_obs)
+                backend = (session, input_name)
+                run_fn = lambda x: session.run(None, {input_name: x})[0]
+            else:
+                import torch
+                module = build_torch_policy(model.path, policy.num_obs)
+                backend = module
+
+                def run_fn(x):
+                    with torch.inference_mode():
+                        return module(torch.from_numpy(x)).numpy()
+            check_model_shapes(run_fn, policy.num_obs, policy.num_actions)
+            # served by the inference server: build it there too, the proxy stays in place
+            current = getattr(policy, model.backend_attr)
+            variant = current.stage(model.path) if isinstance(current, RemoteBackend) else None
+        except Exception as e:
+            status.post(f"❌ {policy.name_str}: rejected {name}: {e}")
+            return
+        build_time = time.perf_counter() - start_time
+        with self.lock:
+            self.pending[policy] = (model, backend, variant, build_time, time.perf_counter())
+            self.has_pending = True
+        status.post(f"📦 {policy.name_str}: {name} built and validated in {build_time:.2f}s, waiting for a safe point")
+
+    def apply_pending(self, active_policy):
+        """Swap in rebuilt backends of every policy except the active one and its sub-policies,
+        called from the control thread"""
+        if not self.has_pending:
+            return
+        busy = (active_policy,) + tuple(active_policy.sub_policies())
+        with self.lock:
+            ready = [policy for policy in self.pending if policy not in busy]
+            items = [(policy, self.pending.pop(policy)) for policy in ready]
+            self.has_pending = len(self.pending) > 0
+        for policy, (model, backend, variant, build_time, staged_time) in items:
+            swap_start = time.perf_counter()
+            local = backend[0] if model.kind == "onnx" else backend
+            current = getattr(policy, model.backend_attr)
+            if isinstance(current, RemoteBackend):
+                if not current.activate(variant, local):
+                    status.post(f"⚠️  {policy.name_str}: {os.path.basename(model.path)} outdated, not swapped")
+                    continue
+            else:
+                setattr(policy, model.backend_attr, local)
+            if model.kind == "onnx":
+                policy.input_name = backend[1]
+            swap_time = time.perf_counter() - swap_start
+            status.post(f"✅ {policy.name_str}: swapped to new {os.path.basename(model.path)} "
+                        f"(build {build_time:.2f}s, waited {swap_start - staged_time:.2f}s, swap {swap_time * 1e6:.1f}us)")
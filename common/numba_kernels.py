@@ -0,0 +1,154 @@
+from common.path_config import PROJECT_ROOT
+
+import os
+import time
+import numpy as np
+from common import rotation_kernels
+
+# Per-tick numeric helpers, compiled with Numba when it is installed and plain NumPy otherwise.
+# Compiled kernels are cached on disk (numba cache=True), warmup() loads or compiles them
+# for the dtypes used by the controllers before the first control tick.
+# ROBO_MIMIC_NUMBA=0 forces the NumPy versions.
+try:
+    if os.environ.get("ROBO_MIMIC_NUMBA", "1") == "0":
+        raise ImportError("disabled by ROBO_MIMIC_NUMBA=0")
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    njit = None
+    NUMBA_AVAILABLE = False
+
+BACKEND = "numba" if NUMBA_AVAILABLE else "numpy"
+
+
+# ---- loop versions, compiled by Numba ----
+
+def _projected_gravity_loop(quat, out):
+    w, x, y, z = quat[0], quat[1], quat[2], quat[3]
+    out[0] = 2 * (-z * x + w * y)
+    out[1] = -2 * (z * y + w * x)
+    out[2] = 1 - 2 * (w * w + z * z)
+    return out
+
+
+def _scale_values_loop(values, ranges, out):
+    for i in range(values.shape[0]):
+        out[i] = (values[i] + 1) * (ranges[i, 1] - ranges[i, 0]) / 2 + ranges[i, 0]
+    return out
+
+
+def _gather_scale_loop(values, idx, scale, out):
+    for i in range(idx.shape[0]):
+        out[i] = values[idx[i]] * scale
+    return out
+
+
+def _gather_offset_scale_loop(values, idx, offset, scale, out):
+    for i in range(idx.shape[0]):
+        out[i] = (values[idx[i]] - offset[i]) * scale
+    return out
+
+
+def _blend_scatter_loop(start, delta, alpha, idx, out):
+    for i in range(idx.shape[0]):
+        out[idx[i]] = start[i] + delta[i] * alpha
+    return out
+
+
+def _push_history_loop(buffer, values):
+    n = values.shape[0]
+    for i in range(buffer.shape[0] - 1, n - 1, -1):
+        buffer[i] = buffer[i - n]
+    for i in range(n):
+        buffer[i] = values[i]
+    return buffer
+
+
+# ---- NumPy versions ----
+
+def _scale_values_numpy(values, ranges, out):
+    np.subtract(ranges[:, 1], ranges[:, 0], out=out)
+    out *= values + 1
+    out /= 2
+    out += ranges[:, 0]
+    return out
+
+
+def _gather_scale_numpy(values, idx, scale, out):
+    return np.multiply(values[idx], scale, out=out)
+
+
+def _gather_offset_scale_numpy(values, idx, offset, scale, out):
+    return np.multiply(values[idx] - offset, scale, out=out)
+
+
+def _blend_scatter_numpy(start, delta, alpha, idx, out):
+    out[idx] = start + delta * alpha
+    return out
+
+
+def _push_history_numpy(buffer, values):
+    n = len(values)
+    buffer[n:] = buffer[:-n]
+    buffer[:n] = values
+    return buffer
+
+
+# name -> (loop version, NumPy version), the benchmark times both
+KERNELS = {
+    "projected_gravity": (_projected_gravity_loop, rotation_kernels.projected_gravity),
+    "scale_values": (_scale_values_loop, _scale_values_numpy),
+    "gather_scale": (_gather_scale_loop, _gather_scale_numpy),
+    "gather_offset_scale": (_gather_offset_scale_loop, _gather_offset_scale_numpy),
+    "blend_scatter": (_blend_scatter_loop, _blend_scatter_numpy),
+    "push_history": (_push_history_loop, _push_history_numpy),
+}
+
+
+def _select(name):
+    loop_fn, numpy_fn = KERNELS[name]
+    if NUMBA_AVAILABLE:
+        return njit(cache=True, nogil=True)(loop_fn)
+    return numpy_fn
+
+
+projected_gravity = _select("projected_gravity")            # (quat w,x,y,z, out[3])
+scale_values = _select("scale_values")                      # (values[n], ranges[n, 2], out[n]), [-1, 1] -> range
+gather_scale = _select("gather_scale")                      # out[i] = values[idx[i]] * scale
+gather_offset_scale = _select("gather_offset_scale")        # out[i] = (values[idx[i]] - offset[i]) * scale
+blend_scatter = _select("blend_scatter")                    # out[idx[i]] = start[i] + delta[i] * alpha
+push_history = _select("push_history")                      # shift buffer back by len(values), values in front
+
+
+def _readonly(array):
+    array = array.copy()
+    array.flags.writeable = False
+    return array
+
+
+def warmup():
+    """Load (or compile) the kernels for the argument types the controllers pass, returns the time taken.
+
+    Numba compiles one specialization per argument type combination; read-only state
+    views and float64 inputs count as separate types.
+    """
+    start_time = time.perf_counter()
+    idx = np.arange(15, dtype=np.int32)
+    out3 = np.zeros(3, dtype=np.float32)
+    out15 = np.zeros(15, dtype=np.float32)
+    out29 = np.zeros(29, dtype=np.float32)
+    ranges = np.zeros((3, 2), dtype=np.float32)
+    history = np.zeros(12, dtype=np.float32)
+    for dtype in (np.float32, np.float64):
+        quat = np.array([1., 0., 0., 0.], dtype=dtype)
+        vec3 = np.zeros(3, dtype=dtype)
+        values = np.zeros(29, dtype=dtype)
+        for inputs in ((quat, vec3, values), tuple(_readonly(a) for a in (quat, vec3, values))):
+            projected_gravity(inputs[0], np.zeros(3, dtype=dtype))
+            projected_gravity(inputs[0], np.zeros(3))
+            scale_values(inputs[1], ranges, out3)
+            gather_scale(inputs[2], idx, 1.0, out15)
+            gather_offset_scale(inputs[2], idx, out15, 1.0, out15)
+            push_history(history, inputs[1])
+    blend_scatter(out15, out15, 0.5, idx, out29)
+    return time.perf_counter() - start_time
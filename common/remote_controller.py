@@ -1,4 +1,7 @@
 import struct
+import threading
+from enum import IntEnum
+import numpy as np
 
 
 class KeyMap:
@@ -20,49 +23,110 @@ class KeyMap:
     left = 15
 
 
+class RemoteButton(IntEnum):
+    """Bit index of every button in the wireless_remote key word"""
+    R1 = 0
+    L1 = 1
+    START = 2
+    SELECT = 3
+    R2 = 4
+    L2 = 5
+    F1 = 6
+    F2 = 7
+    A = 8
+    B = 9
+    X = 10
+    Y = 11
+    UP = 12
+    RIGHT = 13
+    DOWN = 14
+    LEFT = 15
+    # names of the keyboard/joystick bindings in handle_input, the remote has no stick clicks or home
+    L3 = 6      # F1
+    HOME = 7    # F2
+
+
+# wireless_remote: 2 header bytes, uint16 keys, lx, rx, ry, (L2 analog), ly as float32
+_REMOTE_STRUCT = struct.Struct("<2xHfff4xf")
+_BIT_SHIFTS = np.arange(16, dtype=np.uint16)
+
+
 class RemoteController:
+    """Unitree wireless remote decoded from LowState.wireless_remote.
+
+    set() runs in the DDS callback for every LowState message: one precompiled unpack
+    and a few integer bit operations. Press/release edges are OR-ed into latched
+    masks, so the control loop sees every edge since its last update() even when it
+    polls slower than the remote messages arrive. The polling interface matches
+    common.joystick.Keyboard.
+    """
     def __init__(self):
-        self.lx = 0
-        self.ly = 0
-        self.rx = 0
-        self.ry = 0
-        self.button = [0] * 16
-        
-        self.button_states = [False] * 16
-        self.button_pressed = [False] * 16 
-        self.button_released = [False] * 16 
+        self.lx = 0.
+        self.ly = 0.
+        self.rx = 0.
+        self.ry = 0.
+        self.button = np.zeros(16, dtype=np.uint16)
+        self.lock = threading.Lock()
+        self.messages = 0
+
+        # written by set()
+        self._keys = 0
+        self._axes = (0., 0., 0., 0.)
+        self._pressed_latch = 0
+        self._released_latch = 0
+        # snapshot taken by update()
+        self.keys = 0
+        self.pressed = 0
+        self.released = 0
+        self.axis_states = [0.0] * 4
 
     def set(self, data):
-        # wireless_remote
-        keys = struct.unpack("H", data[2:4])[0]
-        for i in range(16):
-            self.button[i] = (keys & (1 << i)) >> i
-        self.lx = struct.unpack("f", data[4:8])[0]
-        self.rx = struct.unpack("f", data[8:12])[0]
-        self.ry = struct.unpack("f", data[12:16])[0]
-        self.ly = struct.unpack("f", data[20:24])[0]
-        
-        self.button_released = [False] * 16
-        
-        for i in range(16):
-            current_state = self.button[i] == 1
-            if self.button_states[i] and not current_state:
-                self.button_released[i] = True
-            self.button_states[i] = current_state
-            
+        """Decode one wireless_remote buffer (40 bytes), called from the LowState handler"""
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data)
+        keys, lx, rx, ry, ly = _REMOTE_STRUCT.unpack_from(data)
+        with self.lock:
+            changed = keys ^ self._keys
+            self._pressed_latch |= changed & keys
+            self._released_latch |= changed & self._keys
+            self._keys = keys
+            self._axes = (lx, rx, ry, ly)
+            self.messages += 1
+
+    def update(self):
+        """Take the current buttons, axes and the edges latched since the last update"""
+        with self.lock:
+            self.keys = self._keys
+            self.pressed, self._pressed_latch = self._pressed_latch, 0
+            self.released, self._released_latch = self._released_latch, 0
+            self.lx, self.rx, self.ry, self.ly = self._axes
+        np.bitwise_and(np.right_shift(self.keys, _BIT_SHIFTS), 1, out=self.button)
+        # joystick axis layout: left x, left y (down positive), right y, right x
+        self.axis_states[0] = self.lx
+        self.axis_states[1] = -self.ly
+        self.axis_states[2] = -self.ry
+        self.axis_states[3] = self.rx
+
     def is_button_pressed(self, button_id):
-        """detect button pressed"""
+        """detect button held"""
         if 0 <= button_id < 16:
-            return self.button_states[button_id]
+            return bool(self.keys >> button_id & 1)
+        return False
+
+    def is_button_down(self, button_id):
+        """detect press edge since the last update"""
+        if 0 <= button_id < 16:
+            return bool(self.pressed >> button_id & 1)
         return False
 
     def is_button_released(self, button_id):
-        """detect button released"""
+        """detect release edge since the last update"""
         if 0 <= button_id < 16:
-            return self.button_released[button_id]
+            return bool(self.released >> button_id & 1)
         return False
 
     def get_axis_value(self, axis_id):
-        """get joystick axis value"""
-        return self.lx, self.rx, self.ry, self.ly
-
+        """get joystick axis value, same axis layout as the keyboard/joystick"""
+        if 0 <= axis_id < 4:
+            return self.axis_states[axis_id]
+        return 0.0
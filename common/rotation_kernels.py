@@ -0,0 +1,149 @@
+from common.path_config import PROJECT_ROOT
+
+import math
+import numpy as np
+
+# Closed-form quaternion / rotation matrix kernels. Quaternions are (w, x, y, z) like the
+# unitree imu_state and mujoco qpos. Single-sample kernels go through Python floats, which is
+# cheaper than NumPy dispatch on 3/4-element arrays; *_batch kernels take (N, 4) arrays.
+# Every kernel writes into `out` when given, otherwise into a new array.
+
+
+def _out(out, shape):
+    return np.empty(shape) if out is None else out
+
+
+def projected_gravity(quat, out=None):
+    """Gravity direction in the body frame, (0, 0, -1) when upright"""
+    w, x, y, z = quat.tolist()
+    out = _out(out, 3)
+    out[0] = 2 * (-z * x + w * y)
+    out[1] = -2 * (z * y + w * x)
+    out[2] = 1 - 2 * (w * w + z * z)
+    return out
+
+
+def quat_to_matrix(quat, out=None):
+    w, x, y, z = quat.tolist()
+    out = _out(out, (3, 3))
+    xx, yy, zz = x * x, y * y, z * z
+    xy, xz, yz = x * y, x * z, y * z
+    wx, wy, wz = w * x, w * y, w * z
+    out[0, 0] = 1 - 2 * (yy + zz)
+    out[0, 1] = 2 * (xy - wz)
+    out[0, 2] = 2 * (xz + wy)
+    out[1, 0] = 2 * (xy + wz)
+    out[1, 1] = 1 - 2 * (xx + zz)
+    out[1, 2] = 2 * (yz - wx)
+    out[2, 0] = 2 * (xz - wy)
+    out[2, 1] = 2 * (yz + wx)
+    out[2, 2] = 1 - 2 * (xx + yy)
+    return out
+
+
+def matrix_to_quat(matrix, out=None):
+    """Shepperd's method, the result has w >= 0"""
+    (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = matrix.tolist()
+    out = _out(out, 4)
+    trace = m00 + m11 + m22
+    if trace > 0:
+        s = 2 * math.sqrt(trace + 1)
+        w, x, y, z = 0.25 * s, (m21 - m12) / s, (m02 - m20) / s, (m10 - m01) / s
+    elif m00 > m11 and m00 > m22:
+        s = 2 * math.sqrt(1 + m00 - m11 - m22)
+        w, x, y, z = (m21 - m12) / s, 0.25 * s, (m01 + m10) / s, (m02 + m20) / s
+    elif m11 > m22:
+        s = 2 * math.sqrt(1 + m11 - m00 - m22)
+        w, x, y, z = (m02 - m20) / s, (m01 + m10) / s, 0.25 * s, (m12 + m21) / s
+    else:
+        s = 2 * math.sqrt(1 + m22 - m00 - m11)
+        w, x, y, z = (m10 - m01) / s, (m02 + m20) / s, (m12 + m21) / s, 0.25 * s
+    if w < 0:
+        w, x, y, z = -w, -x, -y, -z
+    out[0], out[1], out[2], out[3] = w, x, y, z
+    return out
+
+
+def quat_multiply(a, b, out=None):
+    aw, ax, ay, az = a.tolist()
+    bw, bx, by, bz = b.tolist()
+    out = _out(out, 4)
+    out[0] = aw * bw - ax * bx - ay * by - az * bz
+    out[1] = aw * bx + ax * bw + ay * bz - az * by
+    out[2] = aw * by - ax * bz + ay * bw + az * bx
+    out[3] = aw * bz + ax * by - ay * bx + az * bw
+    return out
+
+
+def transform_imu(waist_yaw, waist_yaw_omega, torso_quat, torso_omega, quat_out=None, omega_out=None):
+    """Pelvis orientation and angular velocity from a torso IMU above the waist yaw joint.
+
+    R_pelvis = R_torso * Rz(yaw)^T, i.e. q_pelvis = q_torso * q_z(-yaw), and
+    omega_pelvis = Rz(yaw) * omega_torso - (0, 0, waist_yaw_omega).
+    """
+    tw, tx, ty, tz = torso_quat.tolist()
+    c, s = math.cos(0.5 * waist_yaw), -math.sin(0.5 * waist_yaw)
+    w, x, y, z = tw * c - tz * s, tx * c + ty * s, ty * c - tx * s, tz * c + tw * s
+    if w < 0:
+        w, x, y, z = -w, -x, -y, -z
+    quat_out = _out(quat_out, 4)
+    quat_out[0], quat_out[1], quat_out[2], quat_out[3] = w, x, y, z
+
+    ox, oy, oz = torso_omega.tolist()
+    cy, sy = math.cos(waist_yaw), math.sin(waist_yaw)
+    omega_out = _out(omega_out, 3)
+    omega_out[0] = cy * ox - sy * oy
+    omega_out[1] = sy * ox + cy * oy
+    omega_out[2] = oz - waist_yaw_omega
+    return quat_out, omega_out
+
+
+def projected_gravity_batch(quat, out=None):
+    """projected_gravity() for (N, 4) quaternions, returns (N, 3)"""
+    w, x, y, z = quat[:, 0], quat[:, 1], quat[:, 2], quat[:, 3]
+    out = _out(out, (len(quat), 3))
+    np.multiply(w, y, out=out[:, 0])
+    out[:, 0] -= z * x
+    out[:, 0] *= 2
+    np.multiply(z, y, out=out[:, 1])
+    out[:, 1] += w * x
+    out[:, 1] *= -2
+    np.multiply(w, w, out=out[:, 2])
+    out[:, 2] += z * z
+    out[:, 2] *= -2
+    out[:, 2] += 1
+    return out
+
+
+def quat_to_matrix_batch(quat, out=None):
+    """quat_to_matrix() for (N, 4) quaternions, returns (N, 3, 3)"""
+    w, x, y, z = quat[:, 0], quat[:, 1], quat[:, 2], quat[:, 3]
+    out = _out(out, (len(quat), 3, 3))
+    out[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    out[:, 0, 1] = 2 * (x * y - w * z)
+    out[:, 0, 2] = 2 * (x * z + w * y)
+    out[:, 1, 0] = 2 * (x * y + w * z)
+    out[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    out[:, 1, 2] = 2 * (y * z - w * x)
+    out[:, 2, 0] = 2 * (x * z - w * y)
+    out[:, 2, 1] = 2 * (y * z + w * x)
+    out[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    return out
+
+
+def tilt_from_gravity_batch(gravity, out=None):
+    """Angle between the body z axis and vertical in radians, from (N, 3) projected gravity"""
+    out = _out(out, len(gravity))
+    norm = np.linalg.norm(gravity, axis=-1)
+    np.divide(-gravity[:, 2], np.maximum(norm, 1e-9), out=out)
+    np.clip(out, -1., 1., out=out)
+    return np.arccos(out, out=out)
+
+
+def roll_pitch_from_gravity_batch(gravity, out=None):
+    """Roll and pitch in radians from (N, 3) projected gravity, returns (N, 2)"""
+    out = _out(out, (len(gravity), 2))
+    gx, gy, gz = gravity[:, 0], gravity[:, 1], gravity[:, 2]
+    np.arctan2(-gy, -gz, out=out[:, 0])
+    np.arctan2(gx, np.sqrt(gy * gy + gz * gz), out=out[:, 1])
+    return out
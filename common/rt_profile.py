@@ -0,0 +1,113 @@
+import ctypes
+import ctypes.util
+import os
+import yaml
+
+# imported before numpy/torch/onnxruntime on purpose, keep this module free of them at import time
+_BLAS_THREAD_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "NUMEXPR_NUM_THREADS")
+_MCL_CURRENT = 1
+_MCL_FUTURE = 2
+
+
+class RTProfile:
+    """Real-time tuning from the `rt_profile` section of real.yaml: core pinning, thread caps,
+    SCHED_FIFO and mlockall. Everything is best effort, failures are reported instead of raised."""
+    def __init__(self, settings=None):
+        settings = settings or {}
+        self.enabled = settings.get("enabled", False)
+        self.control_cores = settings.get("control_cores") or []
+        self.inference_cores = settings.get("inference_cores") or []
+        self.background_cores = settings.get("background_cores") or []
+        self.torch_threads = settings.get("torch_threads", 0)
+        self.torch_interop_threads = settings.get("torch_interop_threads", 0)
+        self.ort_intra_threads = settings.get("ort_intra_threads", 0)
+        self.ort_inter_threads = settings.get("ort_inter_threads", 0)
+        self.blas_threads = settings.get("blas_threads", 0)
+        self.sched_fifo = settings.get("sched_fifo", False)
+        self.sched_priority = settings.get("sched_priority", 80)
+        self.mlockall = settings.get("mlockall", False)
+        self.report_lines = []
+
+    @classmethod
+    def from_yaml(cls, path):
+        with open(path, "r") as f:
+            config = yaml.load(f, Loader=yaml.FullLoader)
+        return cls(config.get("rt_profile"))
+
+    def _ok(self, text):
+        self.report_lines.append(f"✅ {text}")
+
+    def _fail(self, text):
+        self.report_lines.append(f"⚠️  {text}")
+
+    def apply_thread_env(self):
+        """Cap the OpenMP/BLAS pools, only effective before numpy/torch are imported"""
+        if not self.enabled or self.blas_threads <= 0:
+            return
+        for var in _BLAS_THREAD_VARS:
+            os.environ[var] = str(self.blas_threads)
+        self._ok(f"BLAS/OpenMP threads: {self.blas_threads}")
+
+    def apply_thread_limits(self):
+        """Torch and onnxruntime pool sizes, call before the policies are created"""
+        if not self.enabled:
+            return
+        import torch
+        from common.model_loader import set_ort_options
+        if self.torch_threads > 0:
+            torch.set_num_threads(self.torch_threads)
+            self._ok(f"torch intra-op threads: {torch.get_num_threads()}")
+        if self.torch_interop_threads > 0:
+            try:
+                torch.set_num_interop_threads(self.torch_interop_threads)
+                self._ok(f"torch inter-op threads: {torch.get_num_interop_threads()}")
+            except RuntimeError as e:
+                self._fail(f"torch inter-op threads not set: {e}")
+
+        # onnxruntime pins its worker threads itself (1-based processor ids, the calling thread is excluded)
+        affinities = None
+        if self.ort_intra_threads > 1 and self.inference_cores:
+            workers = [self.inference_cores[(i + 1) % len(self.inference_cores)] + 1
+                       for i in range(self.ort_intra_threads - 1)]
+            affinities = ";".join(str(core) for core in workers)
+        set_ort_options(self.ort_intra_threads, self.ort_inter_threads, affinities)
+        self._ok(f"onnxruntime threads: intra {self.ort_intra_threads or 'default'}, "
+                 f"inter {self.ort_inter_threads or 'default'}"
+                 + (f", worker affinities {affinities}" if affinities else ""))
+
+    def pin_current_thread(self, cores, label):
+        """Pin the calling thread, threads it creates afterwards inherit the mask"""
+        if not self.enabled or not cores:
+            return
+        try:
+            os.sched_setaffinity(0, cores)
+            self._ok(f"{label} pinned to cores {sorted(os.sched_getaffinity(0))}")
+        except (AttributeError, OSError) as e:
+            self._fail(f"{label} not pinned to {cores}: {e}")
+
+    def apply_realtime(self):
+        """SCHED_FIFO for the calling (control) thread and mlockall for the process"""
+        if not self.enabled:
+            return
+        if self.sched_fifo:
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.sched_priority))
+                self._ok(f"control thread SCHED_FIFO priority {self.sched_priority}")
+            except (AttributeError, OSError) as e:
+                self._fail(f"SCHED_FIFO not set (needs root or CAP_SYS_NICE): {e}")
+        if self.mlockall:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            if libc.mlockall(_MCL_CURRENT | _MCL_FUTURE) == 0:
+                self._ok("memory locked (mlockall)")
+            else:
+                self._fail(f"mlockall failed: {os.strerror(ctypes.get_errno())}")
+
+    def report(self):
+        print("=" * 60)
+        if not self.enabled:
+            print("RT profile disabled")
+        else:
+            print("RT profile:")
+            for line in self.report_lines:
+                print(f"   {line}")
+        print("=" * 60)
@@ -0,0 +1,127 @@
+import asyncio
+import time
+import numpy as np
+
+
+class DeadlineScheduler:
+    """Wakes on absolute monotonic deadlines: sleep until `spin_time` before the deadline, then spin.
+    After an overrun the deadlines restart from now instead of trying to catch up."""
+    def __init__(self, period, spin_time=0.0005, stats_window=500):
+        self.period_ns = int(period * 1e9)
+        self.spin_ns = int(spin_time * 1e9)
+        self.next_deadline_ns = None
+        self.overrun_count = 0
+        self.tick_count = 0
+
+        # ring buffers for statistics
+        self.stats_window = stats_window
+        self.wake_times = np.zeros(stats_window, dtype=np.int64)
+        self.lateness = np.zeros(stats_window, dtype=np.int64)
+        self.stats_index = 0
+        self.stats_count = 0
+
+    def start(self):
+        self.next_deadline_ns = time.perf_counter_ns() + self.period_ns
+
+    def remaining(self):
+        """Seconds left until the current deadline"""
+        if self.next_deadline_ns is None:
+            return self.period_ns * 1e-9
+        return (self.next_deadline_ns - time.perf_counter_ns()) * 1e-9
+
+    def wait(self):
+        """Block until the next deadline, returns False if the deadline was already missed"""
+        if self.next_deadline_ns is None:
+            self.start()
+        self.tick_count += 1
+        deadline = self.next_deadline_ns
+        now = time.perf_counter_ns()
+
+        if now >= deadline:
+            self.overrun_count += 1
+            self.next_deadline_ns = now + self.period_ns
+            self._record(now, now - deadline)
+            return False
+
+        sleep_ns = deadline - now - self.spin_ns
+        if sleep_ns > 0:
+            time.sleep(sleep_ns * 1e-9)
+        now = time.perf_counter_ns()
+        while now < deadline:
+            now = time.perf_counter_ns()
+
+        self.next_deadline_ns = deadline + self.period_ns
+        self._record(now, now - deadline)
+        return True
+
+    async def wait_async(self):
+        """wait() for an asyncio task: the sleep part yields to the event loop, the spin part does not"""
+        if self.next_deadline_ns is None:
+            self.start()
+        self.tick_count += 1
+        deadline = self.next_deadline_ns
+        now = time.perf_counter_ns()
+
+        if now >= deadline:
+            self.overrun_count += 1
+            self.next_deadline_ns = now + self.period_ns
+            self._record(now, now - deadline)
+            # still yield so the other tasks are not starved by a late control task
+            await asyncio.sleep(0)
+            return False
+
+        sleep_ns = deadline - now - self.spin_ns
+        if sleep_ns > 0:
+            await asyncio.sleep(sleep_ns * 1e-9)
+        now = time.perf_counter_ns()
+        while now < deadline:
+            now = time.perf_counter_ns()
+
+        self.next_deadline_ns = deadline + self.period_ns
+        self._record(now, now - deadline)
+        return True
+
+    def _record(self, wake_time, lateness):
+        self.wake_times[self.stats_index] = wake_time
+        self.lateness[self.stats_index] = lateness
+        self.stats_index = (self.stats_index + 1) % self.stats_window
+        self.stats_count = min(self.stats_count + 1, self.stats_window)
+
+    def last_period(self):
+        """Seconds between the last two wake-ups"""
+        if self.stats_count < 2:
+            return 0.
+        last = self.wake_times[self.stats_index - 1]
+        prev = self.wake_times[self.stats_index - 2]
+        return (last - prev) * 1e-9
+
+    def last_lateness(self):
+        if self.stats_count == 0:
+            return 0.
+        return self.lateness[self.stats_index - 1] * 1e-9
+
+    def get_stats(self):
+        """Achieved frequency and jitter over the statistics window"""
+        n = self.stats_count
+        if n < 2:
+            return {"frequency": 0., "period_jitter_std": 0., "period_jitter_max": 0.,
+                    "lateness_mean": 0., "lateness_max": 0., "overruns": self.overrun_count}
+        order = (self.stats_index - n + np.arange(n)) % self.stats_window
+        wake_times = self.wake_times[order]
+        periods = np.diff(wake_times) * 1e-9
+        deviation = periods - self.period_ns * 1e-9
+        lateness = self.lateness[order] * 1e-9
+        return {
+            "frequency": (n - 1) / ((wake_times[-1] - wake_times[0]) * 1e-9),
+            "period_jitter_std": float(np.std(deviation)),
+            "period_jitter_max": float(np.max(np.abs(deviation))),
+            "lateness_mean": float(np.mean(lateness)),
+            "lateness_max": float(np.max(lateness)),
+            "overruns": self.overrun_count,
+        }
+
+    def format_stats(self):
+        stats = self.get_stats()
+        return (f"loop {stats['frequency']:.2f} Hz, jitter std {stats['period_jitter_std'] * 1e6:.1f}us "
+                f"max {stats['period_jitter_max'] * 1e6:.1f}us, wake late max {stats['lateness_max'] * 1e6:.1f}us, "
+                f"overruns {stats['overruns']}")
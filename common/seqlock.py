@@ -0,0 +1,51 @@
+class SeqlockDoubleBuffer:
+    """Double buffer with per-slot sequence locks, one writer thread and one reader thread.
+
+    The writer fills the slot that is not published (begin_write()/end_write()) and then
+    publishes it; the reader copies the published slot and retries if the writer touched
+    it in the meantime. Slots are objects with a copy_from(other) method.
+    """
+    def __init__(self, make_slot):
+        self.slots = [make_slot(), make_slot()]
+        self.slot_seq = [0, 0]   # odd while the slot is being written
+        self.published = 0
+        self.write_count = 0
+        self.read_retries = 0
+        self.read_misses = 0     # reads that raced the writer max_retries times
+        # the reader copies here first, a failed read leaves its snapshot untouched
+        self.scratch = make_slot()
+
+    def begin_write(self):
+        """Returns the unpublished slot, fill it and call end_write()"""
+        index = 1 - self.published
+        self.slot_seq[index] += 1
+        return self.slots[index]
+
+    def end_write(self):
+        index = 1 - self.published
+        self.slot_seq[index] += 1
+        self.write_count += 1
+        self.published = index
+
+    def read_into(self, snapshot, max_retries=10):
+        """Copy the newest consistent slot into `snapshot`.
+
+        Returns False if nothing was published yet or every try raced the writer,
+        `snapshot` then keeps its previous contents.
+        """
+        if self.write_count == 0:
+            return False
+        scratch = self.scratch
+        for _ in range(max_retries):
+            index = self.published
+            seq_before = self.slot_seq[index]
+            if seq_before & 1:
+                self.read_retries += 1
+                continue
+            scratch.copy_from(self.slots[index])
+            if self.slot_seq[index] == seq_before:
+                snapshot.copy_from(scratch)
+                return True
+            self.read_retries += 1
+        self.read_misses += 1
+        return False
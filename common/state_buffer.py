@@ -0,0 +1,82 @@
+import time
+import numpy as np
+from common.lowcmd_codec import LowStateDecoder
+from common.seqlock import SeqlockDoubleBuffer
+
+
+class LowStateSnapshot:
+    """Preallocated NumPy copy of the fields of a LowState message the controller uses"""
+    def __init__(self, num_joints):
+        self.num_joints = num_joints
+        self.q = np.zeros(num_joints, dtype=np.float32)
+        self.dq = np.zeros(num_joints, dtype=np.float32)
+        self.tau_est = np.zeros(num_joints, dtype=np.float32)
+        self.quat = np.array([1., 0., 0., 0.], dtype=np.float32)  # w, x, y, z
+        self.gyro = np.zeros(3, dtype=np.float32)
+        self.tick = 0
+        self.mode_machine = 0
+        self.seq = 0            # number of messages received before this one was written
+        self.recv_time_ns = 0   # time.perf_counter_ns() when the message arrived
+
+    def copy_from(self, other):
+        np.copyto(self.q, other.q)
+        np.copyto(self.dq, other.dq)
+        np.copyto(self.tau_est, other.tau_est)
+        np.copyto(self.quat, other.quat)
+        np.copyto(self.gyro, other.gyro)
+        self.tick = other.tick
+        self.mode_machine = other.mode_machine
+        self.seq = other.seq
+        self.recv_time_ns = other.recv_time_ns
+
+
+class LowStateBuffer:
+    """LowState snapshots passed from the DDS receive thread to the control thread through a seqlocked double buffer"""
+    def __init__(self, num_joints):
+        self.num_joints = num_joints
+        self.seqlock = SeqlockDoubleBuffer(lambda: LowStateSnapshot(num_joints))
+        self.msg_count = 0
+        self.decoder = LowStateDecoder(num_joints)
+        # tick continuity, checked on the receive thread
+        self.last_tick = 0
+        self.tick_step = 0        # smallest positive tick increment seen so far
+        self.tick_missed = 0
+        self.tick_duplicates = 0
+
+    @property
+    def read_retries(self):
+        return self.seqlock.read_retries
+
+    @property
+    def read_misses(self):
+        return self.seqlock.read_misses
+
+    def write(self, msg):
+        """Convert one LowState message, called from the DDS callback"""
+        recv_time_ns = time.perf_counter_ns()
+        self._check_tick(msg.tick)
+        slot = self.seqlock.begin_write()
+        self.decoder.decode(msg, slot.q, slot.dq, slot.tau_est)
+        slot.quat[:] = msg.imu_state.quaternion
+        slot.gyro[:] = msg.imu_state.gyroscope
+        slot.tick = msg.tick
+        slot.mode_machine = msg.mode_machine
+        slot.seq = self.msg_count
+        slot.recv_time_ns = recv_time_ns
+        self.seqlock.end_write()
+        self.msg_count += 1
+
+    def _check_tick(self, tick):
+        if self.msg_count > 0:
+            delta = tick - self.last_tick
+            if delta <= 0:
+                self.tick_duplicates += 1
+            elif self.tick_step == 0 or delta < self.tick_step:
+                self.tick_step = delta
+            elif delta > self.tick_step:
+                self.tick_missed += delta // self.tick_step - 1
+        self.last_tick = tick
+
+    def read_into(self, snapshot: LowStateSnapshot, max_retries=10):
+        """Copy the newest consistent state into `snapshot`, see SeqlockDoubleBuffer.read_into"""
+        return self.seqlock.read_into(snapshot, max_retries)
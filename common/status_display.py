@@ -0,0 +1,133 @@
+from common.path_config import PROJECT_ROOT
+
+import os
+import sys
+import threading
+import time
+from collections import deque
+from common.utils import progress_bar
+
+
+class StatusBoard:
+    """Console status written by the control path, rendered by StatusDisplay on its own thread.
+
+    Writers only assign attributes or append to a bounded deque, they never touch
+    stdout while a display is attached. post() is called from several threads (control,
+    model watcher, preloaders), the queue and its count are updated under a lock. Without a display, post() prints directly
+    and progress is not shown.
+    """
+    def __init__(self, max_messages=256):
+        self.state = ""
+        self.progress = None        # (current, total) of the running motion
+        self.overruns = 0
+        self.messages = deque(maxlen=max_messages)
+        self.posted = 0
+        self.lock = threading.Lock()
+        self.display = None
+
+    def set_state(self, name):
+        self.state = name
+
+    def set_progress(self, current, total):
+        self.progress = (current, total)
+
+    def clear_progress(self):
+        self.progress = None
+
+    def count_overrun(self):
+        self.overruns += 1
+
+    def post(self, message):
+        """One-off message, e.g. a state switch or statistics"""
+        if self.display is None:
+            print(message)
+            return
+        with self.lock:
+            self.messages.append(message)
+            self.posted += 1
+
+
+# shared by the FSM, the policies and the deploy scripts
+status = StatusBoard()
+
+
+class StatusDisplay:
+    """Low-priority thread that renders the StatusBoard at `rate` Hz.
+
+    Posted messages are written as lines, followed by one status line with the FSM
+    state, the motion progress and new overruns, redrawn in place with '\\r'. A slow
+    terminal only delays this thread. Messages posted faster than they are written
+    are dropped oldest first, the number dropped is reported.
+    """
+    def __init__(self, board: StatusBoard = status, rate=5., stream=None, nice=10):
+        self.board = board
+        self.period = 1.0 / rate
+        self.stream = stream if stream is not None else sys.stdout
+        self.nice = nice
+        self.running = False
+        self.thread = None
+        self.written = 0
+        self.last_overruns = 0
+        self.line_width = 0
+
+    def start(self):
+        self.board.display = self
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="status_display", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Write everything still queued and detach, later posts print directly"""
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+        self.render(final=True)
+        self.board.display = None
+
+    def _run(self):
+        try:
+            # linux applies the nice value per thread
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), self.nice)
+        except (AttributeError, OSError):
+            pass
+        while self.running:
+            time.sleep(self.period)
+            self.render()
+
+    def render(self, final=False):
+        board = self.board
+        # messages posted after this stay queued for the next render
+        with board.lock:
+            posted = board.posted
+            messages = list(board.messages)
+            board.messages.clear()
+        new = posted - self.written
+        self.written = posted
+        if new > len(messages):
+            messages.append(f"⚠️  {new - len(messages)} status messages dropped")
+        overruns = board.overruns
+        if overruns != self.last_overruns:
+            messages.append(f"control loop over time ({overruns - self.last_overruns}x, {overruns} total)")
+            self.last_overruns = overruns
+
+        parts = []
+        if messages:
+            # clear the status line before writing full lines over it
+            parts.append("\r" + " " * self.line_width + "\r")
+            parts.extend(message + "\n" for message in messages)
+            self.line_width = 0
+        if final:
+            if self.line_width:
+                parts.append("\r" + " " * self.line_width + "\r")
+                self.line_width = 0
+        else:
+            line = f"[{board.state}]"
+            progress = board.progress
+            if progress is not None:
+                line += " " + progress_bar(*progress).lstrip("\r")
+            parts.append("\r" + line.ljust(self.line_width))
+            self.line_width = len(line)
+        if parts:
+            self.stream.write("".join(parts))
+            self.stream.flush()
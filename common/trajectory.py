@@ -0,0 +1,56 @@
+from common.path_config import PROJECT_ROOT
+
+import numpy as np
+from common.numba_kernels import blend_scatter
+
+
+def linear_profile(alpha):
+    return alpha
+
+
+def minimum_jerk_profile(alpha):
+    """Zero velocity and acceleration at both ends"""
+    return alpha * alpha * alpha * (10. - 15. * alpha + 6. * alpha * alpha)
+
+
+PROFILES = {
+    "linear": linear_profile,
+    "minimum_jerk": minimum_jerk_profile,
+}
+
+
+class JointTrajectory:
+    """Blend a group of motors from the pose captured by start() to a target over `duration` seconds.
+
+    start() gathers the initial pose with one fancy index and write() evaluates the
+    profile once per tick and writes every motor into the output buffer with one
+    blend_scatter kernel call.
+    """
+    def __init__(self, motor_idx, duration, profile="linear"):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown trajectory profile '{profile}', use one of {list(PROFILES)}")
+        self.motor_idx = np.asarray(motor_idx, dtype=np.int32)
+        self.duration = duration
+        self.profile = PROFILES[profile]
+        num_motors = len(self.motor_idx)
+        self.start_pos = np.zeros(num_motors, dtype=np.float32)
+        self.target = np.zeros(num_motors, dtype=np.float32)
+        self.delta = np.zeros(num_motors, dtype=np.float32)
+        self.alpha = 0.
+
+    def start(self, q, target=None):
+        """Capture the start pose from the full joint vector `q`"""
+        self.start_pos[:] = q[self.motor_idx]
+        self.alpha = 0.
+        self.set_target(self.target if target is None else target)
+
+    def set_target(self, target):
+        """Target for the motors in motor_idx, the blend keeps its current phase"""
+        np.copyto(self.target, target, casting="unsafe")
+        np.subtract(self.target, self.start_pos, out=self.delta)
+
+    def write(self, actions, time):
+        """Write the pose `time` seconds after start() into actions[motor_idx], returns the phase in [0, 1]"""
+        self.alpha = min(max(time / self.duration, 0.), 1.)
+        blend_scatter(self.start_pos, self.delta, self.profile(self.alpha), self.motor_idx, actions)
+        return self.alpha
@@ -2,6 +2,7 @@ from common.path_config import PROJECT_ROOT
 
 import numpy as np
 from enum import Enum, unique
+from common import numba_kernels
 
 @unique
 class FSMStateName(Enum):
@@ -16,6 +17,7 @@ class FSMStateName(Enum):
     SKILL_KICK = 8
     SKILL_KungFu2 = 9
     SKILL_AccadMaleB13 = 10
+    SKILL_DualBody = 11
 
 @unique
 class FSMCommand(Enum):
@@ -27,17 +29,15 @@ class FSMCommand(Enum):
     SKILL_2 = 6
     SKILL_3 = 7
     SKILL_4 = 10
+    SKILL_5 = 11
     
     
     
 
-def get_gravity_orientation(quaternion):
-    qw, qx, qy, qz = quaternion
-    gravity_orientation = np.zeros(3)
-    gravity_orientation[0] = 2 * (-qz * qx + qw * qy)
-    gravity_orientation[1] = -2 * (qz * qy + qw * qx)
-    gravity_orientation[2] = 1 - 2 * (qw * qw + qz * qz)
-    return gravity_orientation
+def get_gravity_orientation(quaternion, out=None):
+    """Projected gravity from a (w, x, y, z) quaternion, see rotation_kernels.projected_gravity"""
+    out = np.empty(3) if out is None else out
+    return numba_kernels.projected_gravity(np.asarray(quaternion), out)
 
 def progress_bar(current, total, length=50):
     percent = current / total
@@ -45,11 +45,10 @@ def progress_bar(current, total, length=50):
     bar = "█" * filled + "-" * (length - filled)
     return f"\r|{bar}| {percent:.1%} [{current:.3f}s/{total:.3f}s]"
 
-def scale_values(values, target_ranges):
-    scaled = []
-    for val, (new_min, new_max) in zip(values, target_ranges):
-        scaled_val = (val + 1) * (new_max - new_min) / 2 + new_min
-        scaled.append(scaled_val)
-    return np.array(scaled)
+def scale_values(values, target_ranges, out=None):
+    """Map values in [-1, 1] to [min, max] of the matching row of target_ranges"""
+    target_ranges = np.asarray(target_ranges, dtype=np.float32)
+    out = np.empty(len(target_ranges), dtype=np.float32) if out is None else out
+    return numba_kernels.scale_values(np.asarray(values), target_ranges, out)
 
 
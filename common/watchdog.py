@@ -0,0 +1,131 @@
+import csv
+import os
+import time
+from datetime import datetime
+from enum import IntEnum, unique
+import numpy as np
+from common.utils import FSMCommand, FSMStateName
+from common.status_display import status
+
+
+@unique
+class WatchdogLevel(IntEnum):
+    NORMAL = 0
+    NO_LOGGING = 1       # stop recording control data
+    CHEAPER_POLICY = 2   # leave the skill for the balance policy
+    PASSIVE = 3          # damping
+
+
+# states CHEAPER_POLICY leaves, the mimic skills return to locomotion through SkillCooldown
+MIMIC_SKILLS = (FSMStateName.SKILL_KungFu, FSMStateName.SKILL_KungFu2, FSMStateName.SKILL_Dance,
+                FSMStateName.SKILL_KICK, FSMStateName.SKILL_AccadMaleB13, FSMStateName.SKILL_DualBody)
+
+
+class OverrunWatchdog:
+    """Counts control loop overruns per FSM state and escalates one level at a time.
+
+    A state escalates when it overruns `consecutive_limit` ticks in a row or
+    `window_limit` times within the last `window` ticks. After `window` clean
+    ticks the level drops back to NORMAL.
+
+    level_command() gives the FSM command that carries out CHEAPER_POLICY or PASSIVE.
+    The controller re-issues it every tick until the FSM has followed it.
+    """
+    def __init__(self, consecutive_limit=5, window=100, window_limit=10):
+        self.consecutive_limit = consecutive_limit
+        self.window = window
+        self.window_limit = window_limit
+        self.level = WatchdogLevel.NORMAL
+        self.state_stats = {}
+        self.clean_ticks = 0
+        self.events = []
+        self.start_time = time.perf_counter()
+        self.enforcing = False   # the FSM has not followed the current level yet
+
+    def _stats(self, state_name):
+        stats = self.state_stats.get(state_name)
+        if stats is None:
+            stats = {"consecutive": 0, "history": np.zeros(self.window, dtype=bool),
+                     "index": 0, "overruns": 0, "ticks": 0}
+            self.state_stats[state_name] = stats
+        return stats
+
+    def update(self, state_name, overrun, loop_time, lateness):
+        """Feed one tick, returns the new level when it changed, otherwise None"""
+        stats = self._stats(state_name)
+        stats["ticks"] += 1
+        stats["history"][stats["index"]] = overrun
+        stats["index"] = (stats["index"] + 1) % self.window
+        if overrun:
+            stats["overruns"] += 1
+            stats["consecutive"] += 1
+            self.clean_ticks = 0
+        else:
+            stats["consecutive"] = 0
+            self.clean_ticks += 1
+
+        window_overruns = int(np.count_nonzero(stats["history"]))
+        if stats["consecutive"] >= self.consecutive_limit or window_overruns >= self.window_limit:
+            if self.level == WatchdogLevel.PASSIVE:
+                return None
+            level = self._set_level(WatchdogLevel(self.level + 1), state_name, window_overruns, loop_time, lateness)
+            # require fresh evidence before the next escalation
+            stats["consecutive"] = 0
+            stats["history"].fill(False)
+            return level
+
+        if self.level != WatchdogLevel.NORMAL and self.clean_ticks >= self.window:
+            return self._set_level(WatchdogLevel.NORMAL, state_name, window_overruns, loop_time, lateness)
+        return None
+
+    def level_command(self, state_name):
+        """Command to write into skill_cmd this tick, None once the FSM is where the level wants it.
+
+        States may clear skill_cmd without obeying it (SkillCooldown goes to LOCOMODE when its
+        blend finishes), so a command written once can be lost.
+        """
+        if not self.enforcing:
+            return None
+        if self.level == WatchdogLevel.PASSIVE and state_name != FSMStateName.PASSIVE:
+            return FSMCommand.PASSIVE
+        if self.level == WatchdogLevel.CHEAPER_POLICY and state_name in MIMIC_SKILLS:
+            return FSMCommand.LOCO
+        self.enforcing = False
+        return None
+
+    def escalate(self, level, state_name, loop_time=0., lateness=0.):
+        """Jump straight to `level`, e.g. when the cheaper policy is not available"""
+        return self._set_level(level, state_name, 0, loop_time, lateness)
+
+    def _set_level(self, level, state_name, window_overruns, loop_time, lateness):
+        stats = self._stats(state_name)
+        self.level = level
+        self.enforcing = level in (WatchdogLevel.CHEAPER_POLICY, WatchdogLevel.PASSIVE)
+        self.events.append({
+            "time": time.perf_counter() - self.start_time,
+            "level": level.name,
+            "fsm_state": state_name.name,
+            "consecutive_overruns": stats["consecutive"],
+            "window_overruns": window_overruns,
+            "state_overruns": stats["overruns"],
+            "state_ticks": stats["ticks"],
+            "loop_time": loop_time,
+            "lateness": lateness,
+        })
+        status.post(f"⚠️  Watchdog -> {level.name} (state {state_name.name}, {window_overruns}/{self.window} overruns, "
+                    f"loop {loop_time * 1e3:.2f}ms, late {lateness * 1e3:.2f}ms)")
+        return level
+
+    def save_events(self, filename=None):
+        """Write the escalation events to a CSV next to the control logs"""
+        if not self.events:
+            return
+        if not os.path.exists('log'):
+            os.makedirs('log')
+        if filename is None:
+            filename = datetime.now().strftime('log/watchdog_events_%Y%m%d_%H%M%S.csv')
+        with open(filename, mode='w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=list(self.events[0].keys()))
+            writer.writeheader()
+            writer.writerows(self.events)
+        print(f"📊 Watchdog events saved to: {filename}")
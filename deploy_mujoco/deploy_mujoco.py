@@ -12,8 +12,12 @@ import yaml
 import os
 from common.ctrlcomp import *
 from FSM.FSM import *
-from common.utils import get_gravity_orientation
-from common.joystick import JoyStick, JoystickButton, Keyboard, KeyboardButton
+from common.rotation_kernels import projected_gravity
+from common.input_thread import InputThread, open_gamepad
+from common.command_ingress import CommandIngress
+from common.model_watcher import ModelWatcher
+from common.command_streamer import CommandStreamer
+from common.status_display import status, StatusDisplay
 
 
 
@@ -29,6 +33,14 @@ if __name__ == "__main__":
         xml_path = os.path.join(PROJECT_ROOT, config["xml_path"])
         simulation_dt = config["simulation_dt"]
         control_decimation = config["control_decimation"]
+        use_model_watcher = config["model_watcher"]
+        command_interp = config["command_interp"]
+        debug_aliasing = config["debug_aliasing"]
+        input_poll_rate = config["input_poll_rate"]
+        input_debounce = config["input_debounce"]
+        command_ingress_address = config["command_ingress"]
+        command_timeout = config["command_timeout"]
+        status_rate = config["status_rate"]
         
     m = mujoco.MjModel.from_xml_path(xml_path)
     d = mujoco.MjData(m)
@@ -39,92 +51,101 @@ if __name__ == "__main__":
     kps = np.zeros(num_joints, dtype=np.float32)
     kds = np.zeros(num_joints, dtype=np.float32)
     sim_counter = 0
+    gravity_orientation = np.zeros(3)
     
-    state_cmd = StateAndCmd(num_joints)
+    state_cmd = StateAndCmd(num_joints, debug_aliasing)
     policy_output = PolicyOutput(num_joints)
     FSM_controller = FSM(state_cmd, policy_output)
+    FSM_controller.check_loop_period(mj_per_step_duration)
+    if use_model_watcher:
+        FSM_controller.model_watcher = ModelWatcher(FSM_controller)
+        FSM_controller.model_watcher.start()
     
-    # Try to initialize joystick first, fallback to keyboard if no joystick is connected
-    try:
-        controller = JoyStick()
-        button_enum = JoystickButton
-        print("Joystick controller initialized successfully!")
-    except RuntimeError:
-        print("No joystick detected, switching to keyboard control...")
-        print("=" * 60)
-        print("🎮 KEYBOARD CONTROL MODE ACTIVATED")
-        print("=" * 60)
-        print("📌 IMPORTANT: A separate control window will open!")
-        print("   Focus on the 'Robot Keyboard Controller' window for input")
-        print("   (NOT the MuJoCo window - it has conflicting shortcuts)")
-        print("")
-        print("🎯 Controls:")
-        print("   WASD - Move robot")
-        print("   Shift+Arrows - Rotate")
-        print("   J(A), K(B), U(X), I(Y) - Action buttons")
-        print("   Q(L1), E(R1) - Shoulder buttons")
-        print("   Space(START), Esc(EXIT)")
-        print("=" * 60)
-        controller = Keyboard()
-        button_enum = KeyboardButton
+    # interpolate the policy targets on every simulation step instead of holding them
+    cmd_streamer = None
+    if command_interp != "none":
+        cmd_streamer = CommandStreamer(num_joints, mj_per_step_duration, simulation_dt, interp=command_interp)
+    
+    # joystick if one is connected, keyboard window otherwise; polled on the input thread,
+    # the control tick only picks up the latest snapshot
+    controller = InputThread(open_gamepad, input_poll_rate, input_debounce).start()
+    button_enum = controller.button_enum
+    command_ingress = CommandIngress(command_ingress_address, command_timeout) if command_ingress_address else None
+    # state, motion progress and messages are written to the console by a low-priority thread
+    status_display = StatusDisplay(status, status_rate).start()
         
     Running = True
     with mujoco.viewer.launch_passive(m, d) as viewer:
         sim_start_time = time.time()
         while viewer.is_running() and Running:
             try:
-                if(controller.is_button_pressed(button_enum.SELECT)):
-                    Running = False
-
-                controller.update()
-                if controller.is_button_released(button_enum.L3):
-                    state_cmd.skill_cmd = FSMCommand.PASSIVE
-                if controller.is_button_released(button_enum.START):
-                    state_cmd.skill_cmd = FSMCommand.POS_RESET
-                if controller.is_button_released(button_enum.A) and controller.is_button_pressed(button_enum.R1):
-                    state_cmd.skill_cmd = FSMCommand.LOCO
-                if controller.is_button_released(button_enum.X) and controller.is_button_pressed(button_enum.R1):
-                    state_cmd.skill_cmd = FSMCommand.SKILL_1
-                if controller.is_button_released(button_enum.Y) and controller.is_button_pressed(button_enum.R1):
-                    state_cmd.skill_cmd = FSMCommand.SKILL_2
-                if controller.is_button_released(button_enum.B) and controller.is_button_pressed(button_enum.R1):
-                    state_cmd.skill_cmd = FSMCommand.SKILL_3
-                if controller.is_button_released(button_enum.Y) and controller.is_button_pressed(button_enum.L1):
-                    state_cmd.skill_cmd = FSMCommand.SKILL_4
-                
-                state_cmd.vel_cmd[0] = -controller.get_axis_value(1)
-                state_cmd.vel_cmd[1] = -controller.get_axis_value(0)
-                state_cmd.vel_cmd[2] = -controller.get_axis_value(3)
-                
                 step_start = time.time()
                 
+                if cmd_streamer is not None:
+                    target = cmd_streamer.sample(d.time)
+                    if target is not None:
+                        policy_output_action, kps, kds = target
+                
                 tau = pd_control(policy_output_action, d.qpos[7:], kps, np.zeros_like(kps), d.qvel[6:], kds)
                 d.ctrl[:] = tau
                 mujoco.mj_step(m, d)
                 sim_counter += 1
                 if sim_counter % control_decimation == 0:
+                    controller.update()
+                    if(controller.is_button_pressed(button_enum.SELECT)):
+                        Running = False
+                    if controller.is_button_released(button_enum.L3):
+                        state_cmd.skill_cmd = FSMCommand.PASSIVE
+                    if controller.is_button_released(button_enum.START):
+                        state_cmd.skill_cmd = FSMCommand.POS_RESET
+                    if controller.is_button_released(button_enum.A) and controller.is_button_pressed(button_enum.R1):
+                        state_cmd.skill_cmd = FSMCommand.LOCO
+                    if controller.is_button_released(button_enum.X) and controller.is_button_pressed(button_enum.R1):
+                        state_cmd.skill_cmd = FSMCommand.SKILL_1
+                    if controller.is_button_released(button_enum.Y) and controller.is_button_pressed(button_enum.R1):
+                        state_cmd.skill_cmd = FSMCommand.SKILL_2
+                    if controller.is_button_released(button_enum.B) and controller.is_button_pressed(button_enum.R1):
+                        state_cmd.skill_cmd = FSMCommand.SKILL_3
+                    if controller.is_button_released(button_enum.Y) and controller.is_button_pressed(button_enum.L1):
+                        state_cmd.skill_cmd = FSMCommand.SKILL_4
+                    if controller.is_button_released(button_enum.X) and controller.is_button_pressed(button_enum.L1):
+                        state_cmd.skill_cmd = FSMCommand.SKILL_5
+                    # cycle AccadMaleB13 checkpoints, the new one is used on the next skill entry
+                    if controller.is_button_released(button_enum.HOME) and controller.is_button_pressed(button_enum.R1):
+                        FSM_controller.accad_male_b13.select_next_checkpoint(1)
+                    if controller.is_button_released(button_enum.HOME) and controller.is_button_pressed(button_enum.L1):
+                        FSM_controller.accad_male_b13.select_next_checkpoint(-1)
                     
-                    qj = d.qpos[7:]
-                    dqj = d.qvel[6:]
-                    quat = d.qpos[3:7]
+                    state_cmd.vel_cmd[0] = -controller.get_axis_value(1)
+                    state_cmd.vel_cmd[1] = -controller.get_axis_value(0)
+                    state_cmd.vel_cmd[2] = -controller.get_axis_value(3)
+                    # a fresh network command stream overrides the joystick/keyboard
+                    if command_ingress is not None:
+                        command_ingress.poll(state_cmd)
                     
-                    omega = d.qvel[3:6] 
-                    gravity_orientation = get_gravity_orientation(quat)
+                    projected_gravity(d.qpos[3:7], gravity_orientation)
                     
-                    state_cmd.q = qj.copy()
-                    state_cmd.dq = dqj.copy()
-                    state_cmd.gravity_ori = gravity_orientation.copy()
-                    state_cmd.ang_vel = omega.copy()
+                    # copied straight from the mujoco arrays into the StateAndCmd buffers
+                    state_cmd.update(q=d.qpos[7:], dq=d.qvel[6:], gravity_ori=gravity_orientation, ang_vel=d.qvel[3:6])
                     
-                    FSM_controller.run()
-                    policy_output_action = policy_output.actions.copy()
-                    kps = policy_output.kps.copy()
-                    kds = policy_output.kds.copy()
+                    FSM_controller.run(d.time)
+                    # fixed buffers, only rewritten by the next FSM run
+                    policy_output_action = policy_output.actions
+                    kps = policy_output.kps
+                    kds = policy_output.kds
+                    if cmd_streamer is not None:
+                        cmd_streamer.push(policy_output_action, kps, kds, d.time)
             except ValueError as e:
-                print(str(e))
+                status.post(str(e))
             
             viewer.sync()
             time_until_next_step = m.opt.timestep - (time.time() - step_start)
             if time_until_next_step > 0:
                 time.sleep(time_until_next_step)
+    controller.stop()
+    status_display.stop()
+    print(controller.format_stats())
+    if command_ingress is not None:
+        command_ingress.close()
+        print(command_ingress.format_stats())
         
\ No newline at end of file
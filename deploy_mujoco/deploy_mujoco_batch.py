@@ -0,0 +1,82 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.absolute()))
+
+from common.path_config import PROJECT_ROOT
+
+import time
+import mujoco
+import numpy as np
+import yaml
+import os
+from common.ctrlcomp import BatchStateAndCmd, BatchPolicyOutput
+from common.utils import FSMCommand
+from common.rotation_kernels import projected_gravity_batch
+from FSM.BatchFSM import BatchFSM
+
+
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    mujoco_yaml_path = os.path.join(current_dir, "config", "mujoco.yaml")
+    with open(mujoco_yaml_path, "r") as f:
+        config = yaml.load(f, Loader=yaml.FullLoader)
+        xml_path = os.path.join(PROJECT_ROOT, config["xml_path"])
+        simulation_dt = config["simulation_dt"]
+        control_decimation = config["control_decimation"]
+        num_robots = config["batch_num_robots"]
+        duration = config["batch_duration"]
+        commands = sorted(((t, FSMCommand[name]) for t, name in config["batch_commands"]), key=lambda c: c[0])
+        fall_height = config["batch_fall_height"]
+
+    m = mujoco.MjModel.from_xml_path(xml_path)
+    m.opt.timestep = simulation_dt
+    datas = [mujoco.MjData(m) for _ in range(num_robots)]
+    num_joints = m.nu
+
+    batch_state = BatchStateAndCmd(num_robots, num_joints)
+    batch_output = BatchPolicyOutput(num_robots, num_joints)
+    batch_fsm = BatchFSM(batch_state, batch_output)
+    batch_fsm.fsms[0].check_loop_period(simulation_dt * control_decimation)
+
+    qpos = np.zeros((num_robots, m.nq))
+    qvel = np.zeros((num_robots, m.nv))
+    gravity_orientation = np.zeros((num_robots, 3))
+    next_command = 0
+    num_steps = int(duration / simulation_dt)
+    fsm_time = 0.
+    start_time = time.perf_counter()
+    for step in range(num_steps):
+        sim_time = step * simulation_dt
+        for i, d in enumerate(datas):
+            qpos[i] = d.qpos
+            qvel[i] = d.qvel
+
+        if step % control_decimation == 0:
+            while next_command < len(commands) and commands[next_command][0] <= sim_time:
+                batch_state.set_skill_cmd(commands[next_command][1])
+                next_command += 1
+            batch_state.update(q=qpos[:, 7:], dq=qvel[:, 6:],
+                               gravity_ori=projected_gravity_batch(qpos[:, 3:7], gravity_orientation),
+                               ang_vel=qvel[:, 3:6])
+            batch_fsm.run(sim_time)
+            fsm_time += batch_fsm.tick_time
+
+        # PD control for all robots at once
+        tau = (batch_output.actions - qpos[:, 7:]) * batch_output.kps - qvel[:, 6:] * batch_output.kds
+        for i, d in enumerate(datas):
+            d.ctrl[:] = tau[i]
+            mujoco.mj_step(m, d)
+    wall_time = time.perf_counter() - start_time
+    batch_fsm.shutdown()
+
+    num_ticks = (num_steps + control_decimation - 1) // control_decimation
+    fallen = sum(d.qpos[2] < fall_height for d in datas)
+    print()
+    print("=" * 60)
+    print(f"Batched evaluation: {num_robots} robots, {duration:.1f}s simulated in {wall_time:.1f}s "
+          f"({duration * num_robots / wall_time:.1f}x realtime per robot)")
+    print(f"FSM: {fsm_time / num_ticks * 1e3:.2f}ms per tick, {num_robots * num_ticks / fsm_time:.0f} robot ticks/s, "
+          f"mean model batch {batch_fsm.coordinator.mean_batch_size():.1f}")
+    print(f"Final states: {batch_fsm.state_counts()}")
+    print(f"Fallen robots: {fallen}/{num_robots}")
+    print("=" * 60)
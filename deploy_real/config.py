@@ -15,5 +15,21 @@ class Config:
             self.lowcmd_topic = config["lowcmd_topic"]
             self.lowstate_topic = config["lowstate_topic"]
             self.control_dt = config["control_dt"]
+            self.input_source = config["input_source"]
+            self.input_poll_rate = config["input_poll_rate"]
+            self.input_debounce = config["input_debounce"]
+            self.command_ingress = config["command_ingress"]
+            self.command_timeout = config["command_timeout"]
             self.error_over_time = config["error_over_time"]
+            self.watchdog_window = config["watchdog_window"]
+            self.watchdog_window_limit = config["watchdog_window_limit"]
+            self.inference_server = config["inference_server"]
+            self.gc_mode = config["gc_mode"]
+            self.model_watcher = config["model_watcher"]
+            self.spin_time = config["spin_time"]
+            self.stats_interval = config["stats_interval"]
+            self.status_rate = config["status_rate"]
+            self.command_stream_rate = config["command_stream_rate"]
+            self.command_interp = config["command_interp"]
+            self.debug_aliasing = config["debug_aliasing"]
             
\ No newline at end of file
@@ -2,6 +2,12 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.absolute()))
 
+# thread caps for the BLAS/OpenMP pools have to be in the environment before numpy and torch load,
+# this profile is then used for the rest of the run (deploy_real_async imports it as well)
+from common.rt_profile import RTProfile
+rt_profile = RTProfile.from_yaml(Path(__file__).parent / "config" / "real.yaml")
+rt_profile.apply_thread_env()
+
 from common.path_config import PROJECT_ROOT
 from common.ctrlcomp import *
 from common.utils import FSMStateName
@@ -23,37 +29,48 @@ from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowState_ as LowStateGo
 from unitree_sdk2py.utils.crc import CRC
 
 from common.command_helper import create_damping_cmd, create_zero_cmd, init_cmd_hg, init_cmd_go, MotorMode
-from common.rotation_helper import get_gravity_orientation_real, transform_imu_data
-from common.remote_controller import RemoteController, KeyMap
-from common.joystick import Keyboard, KeyboardButton
+from common.rotation_kernels import projected_gravity
+from common.remote_controller import RemoteController, RemoteButton
+from common.input_thread import InputThread, open_keyboard
+from common.command_ingress import CommandIngress
 
 from config import Config
-from common.deploy_logger import DeployLogger
+from common.inference_server import InferenceServer
+from common.gc_control import GCManager
+from common.model_watcher import ModelWatcher
+from common.scheduler import DeadlineScheduler
+from common.state_buffer import LowStateBuffer, LowStateSnapshot
+from common.async_logger import AsyncLogWriter
+from common.lowcmd_codec import LowCmdEncoder
+from common.fast_crc import FastCRC
+from common.command_streamer import CommandStreamer
+from common.watchdog import OverrunWatchdog, WatchdogLevel, MIMIC_SKILLS
+from common.latency_monitor import StateLatencyMonitor
+from common.status_display import status, StatusDisplay
 
 rad2deg = 180.0 / np.pi
 
 class Controller:
     def __init__(self, config: Config):
         self.config = config
-        self.remote_controller = RemoteController()
-        print("Remote controller initialized successfully!")
-        print("No joystick detected, switching to keyboard control...")
-        print("=" * 60)
-        print("🎮 KEYBOARD CONTROL MODE ACTIVATED")
-        print("=" * 60)
-        print("📌 IMPORTANT: A separate control window will open!")
-        print("   Focus on the 'Robot Keyboard Controller' window for input")
-        print("   (NOT the MuJoCo window - it has conflicting shortcuts)")
-        print("")
-        print("🎯 Controls:")
-        print("   WASD - Move robot")
-        print("   Shift+Arrows - Rotate")
-        print("   J(A), K(B), U(X), I(Y) - Action buttons")
-        print("   Q(L1), E(R1) - Shoulder buttons")
-        print("   Space(START), Esc(EXIT)")
-        print("=" * 60)
-        self.remote_controller = Keyboard()
-        self.button_enum = KeyboardButton
+        # the wireless remote is fed from the LowState handlers, the keyboard is polled on the input thread
+        self.wireless_remote = None
+        self.input_thread = None
+        self.remote_controller = None
+        if config.input_source == "remote":
+            self.wireless_remote = RemoteController()
+            self.remote_controller = self.wireless_remote
+            self.button_enum = RemoteButton
+            print("🎮 Wireless remote control: F1 passive, START reset, R1/L1 + A/B/X/Y skills")
+        elif config.input_source == "keyboard":
+            self.input_thread = InputThread(open_keyboard, config.input_poll_rate, config.input_debounce).start()
+            self.remote_controller = self.input_thread
+            self.button_enum = self.input_thread.button_enum
+        elif config.input_source != "none":
+            raise ValueError(f"Unknown input_source '{config.input_source}', use 'remote', 'keyboard' or 'none'")
+        self.command_ingress = None
+        if config.command_ingress:
+            self.command_ingress = CommandIngress(config.command_ingress, config.command_timeout)
 
         self.num_joints = config.num_joints
         self.control_dt = config.control_dt
@@ -62,8 +79,16 @@ class Controller:
         
         self.low_cmd = unitree_hg_msg_dds__LowCmd_()
         self.low_state = unitree_hg_msg_dds__LowState_()
+        # the DDS receive thread converts every message into this buffer,
+        # the control thread only ever reads consistent snapshots from it
+        self.state_buffer = LowStateBuffer(self.num_joints)
+        self.state_snapshot = LowStateSnapshot(self.num_joints)
+        self.gravity_orientation = np.zeros(3, dtype=np.float32)
+        self.latency_monitor = StateLatencyMonitor()
         self.mode_pr_ = MotorMode.PR
         self.mode_machine_ = 0
+        self.crc = FastCRC(fallback=CRC())
+        self.crc_time = 0.
         self.lowcmd_publisher_ = ChannelPublisher(config.lowcmd_topic, LowCmdHG)
         self.lowcmd_publisher_.Init()
         
@@ -74,42 +99,84 @@ class Controller:
         # self.wait_for_low_state()
         
         init_cmd_hg(self.low_cmd, self.mode_machine_, self.mode_pr_)
+        self.cmd_encoder = LowCmdEncoder(self.low_cmd, self.num_joints)
         
         self.policy_output_action = np.zeros(self.num_joints, dtype=np.float32)
         self.kps = np.zeros(self.num_joints, dtype=np.float32)
         self.kds = np.zeros(self.num_joints, dtype=np.float32)
-        self.qj = np.zeros(self.num_joints, dtype=np.float32)
-        self.dqj = np.zeros(self.num_joints, dtype=np.float32)
-        self.quat = np.zeros(4, dtype=np.float32)
-        self.ang_vel = np.zeros(3, dtype=np.float32)
-        self.gravity_orientation = np.array([0,0,-1], dtype=np.float32)
         
-        self.state_cmd = StateAndCmd(self.num_joints)
+        self.state_cmd = StateAndCmd(self.num_joints, config.debug_aliasing)
         self.policy_output = PolicyOutput(self.num_joints)
+        # inference thread pools are created while loading the policies and inherit this affinity
+        self.rt_profile = rt_profile
+        self.rt_profile.apply_thread_limits()
+        self.rt_profile.pin_current_thread(self.rt_profile.inference_cores, "inference pools")
         self.FSM_controller = FSM(self.state_cmd, self.policy_output)
+        self.FSM_controller.check_loop_period(self.control_dt)
+        
+        self.inference_server = None
+        if config.inference_server:
+            # half a tick: a stalled server delays one tick, then the in-process models take over
+            self.inference_server = InferenceServer(timeout=0.5 * self.control_dt)
+            self.inference_server.attach(self.FSM_controller)
+            self.inference_server.start()
+        # helper threads created from here on (logging, model watcher) run on the background cores
+        self.rt_profile.pin_current_thread(self.rt_profile.background_cores, "background threads")
+        # console output from the control path is rendered at a low rate on its own thread
+        self.status_display = StatusDisplay(status, config.status_rate).start()
         
-        # Initialize logger
-        self.logger = DeployLogger()
+        if config.model_watcher:
+            self.FSM_controller.model_watcher = ModelWatcher(self.FSM_controller)
+            self.FSM_controller.model_watcher.start()
+        
+        # Initialize logger, records are written to the CSV buffers on the logging thread
+        self.log_writer = AsyncLogWriter()
+        self.tick_record = {}
         self.logging_active = False  # Start logging when entering active control modes
         self.previous_fsm_state = None  # Track FSM state changes
         
         self.running = True
         self.counter_over_time = 0
+        
+        # overruns degrade step by step: stop logging, fall back to the balance policy, damping
+        self.watchdog = OverrunWatchdog(config.error_over_time, config.watchdog_window, config.watchdog_window_limit)
+        self.logging_suspended = False
+        
+        self.gc_manager = GCManager(config.gc_mode)
+        self.scheduler = DeadlineScheduler(self.control_dt, config.spin_time)
+        self.stats_interval = config.stats_interval
+        self.last_stats_time = time.perf_counter()
+        
+        # publish interpolated commands faster than the policy rate on a separate thread
+        self.cmd_streamer = None
+        if config.command_stream_rate > 0:
+            self.cmd_streamer = CommandStreamer(self.num_joints, self.control_dt, 1.0 / config.command_stream_rate,
+                                                self.stream_cmd, config.command_interp, config.spin_time)
 
         
     def LowStateHgHandler(self, msg: LowStateHG):
         self.low_state = msg
         self.mode_machine_ = self.low_state.mode_machine
-        # self.remote_controller.set(self.low_state.wireless_remote)
+        self.state_buffer.write(msg)
+        if self.wireless_remote is not None:
+            self.wireless_remote.set(msg.wireless_remote)
 
     def LowStateGoHandler(self, msg: LowStateGo):
         self.low_state = msg
-        # self.remote_controller.set(self.low_state.wireless_remote)
+        if self.wireless_remote is not None:
+            self.wireless_remote.set(msg.wireless_remote)
 
     def send_cmd(self, cmd: Union[LowCmdGo, LowCmdHG]):
-        cmd.crc = CRC().Crc(cmd)
+        crc_start = time.perf_counter()
+        cmd.crc = self.crc.Crc(cmd)
+        self.crc_time = time.perf_counter() - crc_start
         self.lowcmd_publisher_.Write(cmd)
 
+    def stream_cmd(self, q, kps, kds):
+        """Called from the command streamer thread, which owns low_cmd while it runs"""
+        self.cmd_encoder.encode(q, kps, kds)
+        self.send_cmd(self.low_cmd)
+
     def wait_for_low_state(self):
         while self.low_state.tick == 0:
             time.sleep(self.config.control_dt)
@@ -118,10 +185,13 @@ class Controller:
     def zero_torque_state(self):
         print("Enter zero torque state.")
         print("Waiting for the start signal...")
-        while self.remote_controller.button[KeyMap.start] != 1:
+        self.remote_controller.update()
+        while not self.remote_controller.is_button_pressed(self.button_enum.START):
             create_zero_cmd(self.low_cmd)
             self.send_cmd(self.low_cmd)
             time.sleep(self.config.control_dt)
+            self.remote_controller.update()
+        self.cmd_encoder.invalidate()
         
     def handle_logging(self):
         """Handle data logging based on FSM state"""
@@ -130,20 +200,21 @@ class Controller:
         
         # Check if we should start logging (entering active control modes)
         if (not self.logging_active and 
+            not self.logging_suspended and
             current_fsm_state != FSMStateName.PASSIVE and 
             current_fsm_state != FSMStateName.FIXEDPOSE and
             current_fsm_state != FSMStateName.INVALID):
             
-            print(f"🔴 Starting data logging - FSM State: {current_fsm_state_str}")
+            status.post(f"🔴 Starting data logging - FSM State: {current_fsm_state_str}")
             self.logging_active = True
-            self.logger = DeployLogger()  # Reset logger for new session
+            self.log_writer.start_session()  # Reset logger for new session
             
         # Check if we should stop logging and save (entering PASSIVE mode)
         elif (self.logging_active and 
               current_fsm_state == FSMStateName.PASSIVE and 
               self.previous_fsm_state != FSMStateName.PASSIVE):
             
-            print(f"🟢 Stopping data logging - Saving to file (FSM State: {current_fsm_state_str})")
+            status.post(f"🟢 Stopping data logging - Saving to file (FSM State: {current_fsm_state_str})")
             self.save_current_log()
             self.logging_active = False
             
@@ -154,170 +225,274 @@ class Controller:
         self.previous_fsm_state = current_fsm_state
 
     def record_control_data(self):
-        """Record current control cycle data"""
+        """Collect current control cycle data and hand it to the logging thread"""
         if self.first_log:
-            self.time0 = time.time()
+            self.time0 = time.perf_counter()
 
-        timestamp = time.time() - self.time0
+        timestamp = time.perf_counter() - self.time0
+        record = self.tick_record
         # Record timestamp
-        self.logger.record("timestamp", timestamp)
+        record["timestamp"] = timestamp
 
-                
         if self.first_log:
-            self.logger.record("loop_time", 0.0)
+            record["loop_time"] = 0.0
             self.first_log = False
         else:
-            self.logger.record("loop_time", timestamp - self.last_state_time)
+            record["loop_time"] = timestamp - self.last_state_time
         self.last_state_time = timestamp
 
-        self.logger.record("overtime_counter", self.counter_over_time)
-        # Record joint data using joint names
-        policy_output_action = self.policy_output.actions.copy()
-        kps = self.policy_output.kps.copy()
-        kds = self.policy_output.kds.copy()
-        
-        for i in range(self.num_joints):
-            self.logger.record_joint_data(
-                joint_index=i,
-                target_q=policy_output_action[i]*rad2deg,
-                actual_q=self.qj[i]*rad2deg,
-                actual_dq=self.dqj[i]*rad2deg,
-                kp=kps[i],
-                kd=kds[i]
-            )
-            
+        record["overtime_counter"] = self.counter_over_time
+        record["watchdog_level"] = int(self.watchdog.level)
+        record["state_seq"] = self.state_snapshot.seq
+        
         # Record velocity commands
-        self.logger.record("vel_cmd_x", self.state_cmd.vel_cmd[0])
-        self.logger.record("vel_cmd_y", self.state_cmd.vel_cmd[1])  
-        self.logger.record("vel_cmd_yaw", self.state_cmd.vel_cmd[2])
+        record["vel_cmd_x"] = self.state_cmd.vel_cmd[0]
+        record["vel_cmd_y"] = self.state_cmd.vel_cmd[1]
+        record["vel_cmd_yaw"] = self.state_cmd.vel_cmd[2]
         
         # Record FSM state
-        self.logger.record("fsm_state", self.FSM_controller.cur_policy.name_str)
-        self.logger.record("fsm_state_enum", self.FSM_controller.cur_policy.name.value)
+        record["fsm_state"] = self.FSM_controller.cur_policy.name_str
+        record["fsm_state_enum"] = self.FSM_controller.cur_policy.name.value
         
         # Record IMU data
-        self.logger.record("gravity_ori_x", self.state_cmd.gravity_ori[0])
-        self.logger.record("gravity_ori_y", self.state_cmd.gravity_ori[1])
-        self.logger.record("gravity_ori_z", self.state_cmd.gravity_ori[2])
+        gravity_ori = self.state_cmd.gravity_ori.reshape(-1)
+        record["gravity_ori_x"] = gravity_ori[0]
+        record["gravity_ori_y"] = gravity_ori[1]
+        record["gravity_ori_z"] = gravity_ori[2]
         
         # Record angular velocity
+        ang_vel = self.state_cmd.ang_vel.reshape(-1)
         for i in range(3):
-            self.logger.record(f"ang_vel_{i}", self.state_cmd.ang_vel[0][i])
-
-    def save_current_log(self):
-        """Save current log data to CSV file"""
-        if len(self.logger.data) > 0:
-            try:
-                self.logger.save_to_csv()
-                print("📊 Log data saved successfully!")
-            except Exception as e:
-                print(f"❌ Error saving log: {e}")
-        else:
-            print("⚠️  No data to save")
-
-    def run(self):
-        try:
-            # if(self.counter_over_time >= config.error_over_time):
-            #     raise ValueError("counter_over_time >= error_over_time")
-            
-            loop_start_time = time.time()
-            self.remote_controller.update()
-            # if self.remote_controller.is_button_pressed(KeyMap.F1):
-            #     self.state_cmd.skill_cmd = FSMCommand.PASSIVE
-            # if self.remote_controller.is_button_pressed(KeyMap.start):
-            #     self.state_cmd.skill_cmd = FSMCommand.POS_RESET
-            # if self.remote_controller.is_button_pressed(KeyMap.A) and self.remote_controller.is_button_pressed(KeyMap.R1):
-            #     self.state_cmd.skill_cmd = FSMCommand.LOCO
-            # if self.remote_controller.is_button_pressed(KeyMap.X) and self.remote_controller.is_button_pressed(KeyMap.R1):
-            #     self.state_cmd.skill_cmd = FSMCommand.SKILL_1
-            # if self.remote_controller.is_button_pressed(KeyMap.Y) and self.remote_controller.is_button_pressed(KeyMap.R1):
-            #     self.state_cmd.skill_cmd = FSMCommand.SKILL_2
-            if self.remote_controller.is_button_released(self.button_enum.L3):
-                self.state_cmd.skill_cmd = FSMCommand.PASSIVE
-            if self.remote_controller.is_button_released(self.button_enum.START):
-                self.state_cmd.skill_cmd = FSMCommand.POS_RESET
-            if self.remote_controller.is_button_released(self.button_enum.A) and self.remote_controller.is_button_pressed(self.button_enum.R1):
-                self.state_cmd.skill_cmd = FSMCommand.LOCO
-            if self.remote_controller.is_button_released(self.button_enum.X) and self.remote_controller.is_button_pressed(self.button_enum.R1):
-                self.state_cmd.skill_cmd = FSMCommand.SKILL_1
-            if self.remote_controller.is_button_released(self.button_enum.Y) and self.remote_controller.is_button_pressed(self.button_enum.R1):
-                self.state_cmd.skill_cmd = FSMCommand.SKILL_2
-            if self.remote_controller.is_button_released(self.button_enum.B) and self.remote_controller.is_button_pressed(self.button_enum.R1):
-                self.state_cmd.skill_cmd = FSMCommand.SKILL_3
-            if self.remote_controller.is_button_released(self.button_enum.Y) and self.remote_controller.is_button_pressed(self.button_enum.L1):
-                self.state_cmd.skill_cmd = FSMCommand.SKILL_4
-            
-            # if self.remote_controller.is_button_pressed(KeyMap.B) and self.remote_controller.is_button_pressed(KeyMap.R1):
-            #     self.state_cmd.skill_cmd = FSMCommand.SKILL_3
-            # if self.remote_controller.is_button_pressed(KeyMap.Y) and self.remote_controller.is_button_pressed(KeyMap.L1):
-            #     self.state_cmd.skill_cmd = FSMCommand.SKILL_4
-            
-            # self.state_cmd.vel_cmd[0] =  self.remote_controller.ly
-            # self.state_cmd.vel_cmd[1] =  self.remote_controller.lx * -1
-            # self.state_cmd.vel_cmd[2] =  self.remote_controller.rx * -1
-            self.state_cmd.vel_cmd[0] = -self.remote_controller.get_axis_value(1)
-            self.state_cmd.vel_cmd[1] = -self.remote_controller.get_axis_value(0)
-            self.state_cmd.vel_cmd[2] = -self.remote_controller.get_axis_value(3)
+            record[f"ang_vel_{i}"] = ang_vel[i]
+        
+        # Record joint data, expanded to per-joint columns by the logging thread
+        record["joints"] = (self.policy_output.actions * rad2deg,
+                            self.state_cmd.q * rad2deg,
+                            self.state_cmd.dq * rad2deg,
+                            self.policy_output.kps.copy(),
+                            self.policy_output.kds.copy())
+        
+        self.log_writer.submit(record)
 
-            controller_end_time = time.time()
-            self.logger.record("controller_time", controller_end_time - loop_start_time)
+    def apply_watchdog_level(self, level):
+        """Carry out a watchdog escalation (or recovery)"""
+        cur_state = self.FSM_controller.cur_policy.name
+        if level == WatchdogLevel.NORMAL:
+            self.logging_suspended = False
+        elif level == WatchdogLevel.NO_LOGGING:
+            self.logging_suspended = True
+            if self.logging_active:
+                self.save_current_log()
+                self.logging_active = False
+        elif level == WatchdogLevel.CHEAPER_POLICY and cur_state not in MIMIC_SKILLS:
+            # already on a balance policy, nothing cheaper left
+            self.apply_watchdog_level(self.watchdog.escalate(WatchdogLevel.PASSIVE, cur_state))
+        # the LOCO/PASSIVE command itself is issued by control_step until the FSM follows it
 
-            for i in range(self.num_joints):
-                self.qj[i] = self.low_state.motor_state[i].q
-                self.dqj[i] = self.low_state.motor_state[i].dq
+    def save_current_log(self):
+        """Save current log data to CSV file (on the logging thread)"""
+        self.log_writer.save()
 
-            # imu_state quaternion: w, x, y, z
-            quat = self.low_state.imu_state.quaternion
-            ang_vel = np.array([self.low_state.imu_state.gyroscope], dtype=np.float32)
-            
-            gravity_orientation = get_gravity_orientation_real(quat)
-            
-            self.state_cmd.q = self.qj.copy()
-            self.state_cmd.dq = self.dqj.copy()
-            self.state_cmd.gravity_ori = gravity_orientation.copy()
-            self.state_cmd.ang_vel = ang_vel.copy()
+    def handle_input(self):
+        """Local input first, a fresh network command stream overrides it"""
+        if self.remote_controller is not None:
+            self.handle_controller_input()
+        if self.command_ingress is not None:
+            self.command_ingress.poll(self.state_cmd)
 
-            fetch_state_time = time.time()
-            self.logger.record("fetch_state_time", fetch_state_time - controller_end_time)
-            
-            self.FSM_controller.run()
-            policy_time = time.time()
-            self.logger.record("policy_time", policy_time - fetch_state_time)
-            policy_output_action = self.policy_output.actions.copy()
-            kps = self.policy_output.kps.copy()
-            kds = self.policy_output.kds.copy()
+    def handle_controller_input(self):
+        """Poll the remote/keyboard and turn button events into FSM commands"""
+        self.remote_controller.update()
+        # if self.remote_controller.is_button_pressed(KeyMap.F1):
+        #     self.state_cmd.skill_cmd = FSMCommand.PASSIVE
+        # if self.remote_controller.is_button_pressed(KeyMap.start):
+        #     self.state_cmd.skill_cmd = FSMCommand.POS_RESET
+        # if self.remote_controller.is_button_pressed(KeyMap.A) and self.remote_controller.is_button_pressed(KeyMap.R1):
+        #     self.state_cmd.skill_cmd = FSMCommand.LOCO
+        # if self.remote_controller.is_button_pressed(KeyMap.X) and self.remote_controller.is_button_pressed(KeyMap.R1):
+        #     self.state_cmd.skill_cmd = FSMCommand.SKILL_1
+        # if self.remote_controller.is_button_pressed(KeyMap.Y) and self.remote_controller.is_button_pressed(KeyMap.R1):
+        #     self.state_cmd.skill_cmd = FSMCommand.SKILL_2
+        if self.remote_controller.is_button_released(self.button_enum.L3):
+            self.state_cmd.skill_cmd = FSMCommand.PASSIVE
+        if self.remote_controller.is_button_released(self.button_enum.START):
+            self.state_cmd.skill_cmd = FSMCommand.POS_RESET
+        if self.remote_controller.is_button_released(self.button_enum.A) and self.remote_controller.is_button_pressed(self.button_enum.R1):
+            self.state_cmd.skill_cmd = FSMCommand.LOCO
+        if self.remote_controller.is_button_released(self.button_enum.X) and self.remote_controller.is_button_pressed(self.button_enum.R1):
+            self.state_cmd.skill_cmd = FSMCommand.SKILL_1
+        if self.remote_controller.is_button_released(self.button_enum.Y) and self.remote_controller.is_button_pressed(self.button_enum.R1):
+            self.state_cmd.skill_cmd = FSMCommand.SKILL_2
+        if self.remote_controller.is_button_released(self.button_enum.B) and self.remote_controller.is_button_pressed(self.button_enum.R1):
+            self.state_cmd.skill_cmd = FSMCommand.SKILL_3
+        if self.remote_controller.is_button_released(self.button_enum.Y) and self.remote_controller.is_button_pressed(self.button_enum.L1):
+            self.state_cmd.skill_cmd = FSMCommand.SKILL_4
+        if self.remote_controller.is_button_released(self.button_enum.X) and self.remote_controller.is_button_pressed(self.button_enum.L1):
+            self.state_cmd.skill_cmd = FSMCommand.SKILL_5
+        # cycle AccadMaleB13 checkpoints, the new one is used on the next skill entry
+        if self.remote_controller.is_button_released(self.button_enum.HOME) and self.remote_controller.is_button_pressed(self.button_enum.R1):
+            self.FSM_controller.accad_male_b13.select_next_checkpoint(1)
+        if self.remote_controller.is_button_released(self.button_enum.HOME) and self.remote_controller.is_button_pressed(self.button_enum.L1):
+            self.FSM_controller.accad_male_b13.select_next_checkpoint(-1)
+        
+        # if self.remote_controller.is_button_pressed(KeyMap.B) and self.remote_controller.is_button_pressed(KeyMap.R1):
+        #     self.state_cmd.skill_cmd = FSMCommand.SKILL_3
+        # if self.remote_controller.is_button_pressed(KeyMap.Y) and self.remote_controller.is_button_pressed(KeyMap.L1):
+        #     self.state_cmd.skill_cmd = FSMCommand.SKILL_4
+        
+        # self.state_cmd.vel_cmd[0] =  self.remote_controller.ly
+        # self.state_cmd.vel_cmd[1] =  self.remote_controller.lx * -1
+        # self.state_cmd.vel_cmd[2] =  self.remote_controller.rx * -1
+        self.state_cmd.vel_cmd[0] = -self.remote_controller.get_axis_value(1)
+        self.state_cmd.vel_cmd[1] = -self.remote_controller.get_axis_value(0)
+        self.state_cmd.vel_cmd[2] = -self.remote_controller.get_axis_value(3)
 
+    def control_step(self, step_start_time):
+        """Read the latest LowState, run the FSM and publish the command"""
+        # overrides local/network input until the FSM has followed the watchdog level
+        watchdog_command = self.watchdog.level_command(self.FSM_controller.cur_policy.name)
+        if watchdog_command is not None:
+            self.state_cmd.skill_cmd = watchdog_command
+        # latest consistent LowState, written by the DDS receive thread; on a miss the
+        # previous snapshot is used again and counted in state_buffer.read_misses
+        has_state = self.state_buffer.read_into(self.state_snapshot)
+        # imu_state quaternion: w, x, y, z
+        projected_gravity(self.state_snapshot.quat, self.gravity_orientation)
+        
+        # copied into the fixed StateAndCmd buffers, policies read them in place
+        self.state_cmd.update(q=self.state_snapshot.q,
+                              dq=self.state_snapshot.dq,
+                              gravity_ori=self.gravity_orientation,
+                              ang_vel=self.state_snapshot.gyro)
 
-            # Handle data logging
-            self.handle_logging()
-            
+        fetch_state_time = time.perf_counter()
+        self.tick_record["fetch_state_time"] = fetch_state_time - step_start_time
+        
+        self.FSM_controller.run()
+        policy_time = time.perf_counter()
+        self.tick_record["policy_time"] = policy_time - fetch_state_time
+        self.tick_record["policy_inferred"] = int(self.FSM_controller.last_tick_inferred)
+        # the output buffers are only rewritten by the next FSM run, both consumers copy them
+        policy_output_action = self.policy_output.actions
+        kps = self.policy_output.kps
+        kds = self.policy_output.kds
+        
+        if self.cmd_streamer is not None:
+            # the streamer thread interpolates and publishes
+            self.cmd_streamer.push(policy_output_action, kps, kds, policy_time)
+        else:
             # Build low cmd
-            for i in range(self.num_joints):
-                self.low_cmd.motor_cmd[i].q = policy_output_action[i]
-                self.low_cmd.motor_cmd[i].qd = 0
-                self.low_cmd.motor_cmd[i].kp = kps[i]
-                self.low_cmd.motor_cmd[i].kd = kds[i]
-                self.low_cmd.motor_cmd[i].tau = 0
+            self.cmd_encoder.encode(policy_output_action, kps, kds)
                 
             # send the command
             # create_damping_cmd(controller.low_cmd) # only for debug
             self.send_cmd(self.low_cmd)
+        
+        send_command_time = time.perf_counter()
+        self.tick_record["send_command_time"] = send_command_time - policy_time
+        self.tick_record["crc_time"] = self.crc_time
+        if has_state:
+            state_age, latency, new_msgs = self.latency_monitor.update(
+                self.state_snapshot, fetch_state_time, send_command_time)
+            self.tick_record["state_age"] = state_age
+            self.tick_record["state_to_publish"] = latency
+            self.tick_record["state_new_msgs"] = new_msgs
+            self.tick_record["state_tick"] = self.state_snapshot.tick
+            self.tick_record["state_tick_missed"] = self.state_buffer.tick_missed
+            self.tick_record["state_tick_duplicates"] = self.state_buffer.tick_duplicates
+        # self.handle_logging()  # Manage logging based on FSM state
+        
+        # collect garbage in the slack left after the command went out
+        self.gc_manager.set_active(self.FSM_controller.cur_policy.name != FSMStateName.PASSIVE)
+        gc_pause = self.gc_manager.collect_in_slack(self.scheduler.remaining())
+        self.tick_record["gc_pause_time"] = gc_pause
+        self.tick_record["gc_generation"] = self.gc_manager.last_generation
+        
+        # Handle data logging, only enqueues, the CSV work happens on the logging thread
+        self.handle_logging()
+
+    def finish_tick(self, on_time, work_time):
+        """Overrun bookkeeping after the deadline wait"""
+        overrun = not on_time
+        if overrun:
+            status.count_overrun()
+            self.counter_over_time += 1
+        else:
+            self.counter_over_time = 0
+        level = self.watchdog.update(self.FSM_controller.cur_policy.name, overrun,
+                                     work_time, self.scheduler.last_lateness())
+        if level is not None:
+            self.apply_watchdog_level(level)
+
+    def print_stats(self):
+        status.post(self.scheduler.format_stats())
+        status.post(self.latency_monitor.format_stats(self.state_buffer))
+        if self.cmd_streamer is not None:
+            status.post(self.cmd_streamer.format_stats())
+        if self.input_thread is not None:
+            status.post(self.input_thread.format_stats())
+        if self.command_ingress is not None:
+            status.post(self.command_ingress.format_stats())
+
+    def start(self):
+        """Pin the control thread, freeze startup objects and start the clocks, right before the first tick"""
+        self.rt_profile.pin_current_thread(self.rt_profile.control_cores, "control thread")
+        self.rt_profile.apply_realtime()
+        self.rt_profile.report()
+        self.gc_manager.freeze()
+        self.scheduler.start()
+        if self.cmd_streamer is not None:
+            self.cmd_streamer.start()
+
+    def stop_logging(self):
+        """Save any remaining log data and flush the writers, blocks on file I/O"""
+        if self.logging_active:
+            print("💾 Saving log data before exit...")
+            self.save_current_log()
+        self.log_writer.stop()
+        self.watchdog.save_events()
+
+    def stop(self):
+        """Send damping and shut down the helpers"""
+        if self.cmd_streamer is not None:
+            self.cmd_streamer.stop()
+        
+        create_damping_cmd(self.low_cmd)
+        self.send_cmd(self.low_cmd)
+        
+        if self.inference_server is not None:
+            self.inference_server.shutdown()
+        if self.input_thread is not None:
+            self.input_thread.stop()
+        if self.command_ingress is not None:
+            self.command_ingress.close()
+        self.gc_manager.set_active(False)
+        # writes the queued messages, the summaries below print directly
+        self.status_display.stop()
+        print(self.gc_manager.get_summary())
+        self.print_stats()
+
+    def run(self):
+        try:
+            loop_start_time = time.perf_counter()
+            self.tick_record = {"loop_period": self.scheduler.last_period(),
+                                "wake_lateness": self.scheduler.last_lateness()}
+            self.handle_input()
+            controller_end_time = time.perf_counter()
+            self.tick_record["controller_time"] = controller_end_time - loop_start_time
             
-            send_command_time = time.time()
-            self.logger.record("send_command_time", send_command_time - policy_time)
-            # self.handle_logging()  # Manage logging based on FSM state
+            self.control_step(controller_end_time)
             
-            loop_end_time = time.time()
-            delta_time = loop_end_time - loop_start_time
-            if(delta_time < self.control_dt):
-                time.sleep(self.control_dt - delta_time)
-                self.counter_over_time = 0
-            else:
-                print("control loop over time.")
-                self.counter_over_time += 1
+            # wait for the next absolute deadline
+            work_time = time.perf_counter() - loop_start_time
+            self.finish_tick(self.scheduler.wait(), work_time)
+            
+            if loop_start_time - self.last_stats_time > self.stats_interval:
+                self.last_stats_time = loop_start_time
+                self.print_stats()
             pass
         except ValueError as e:
-            print(str(e))
+            status.post(str(e))
             pass
         
         pass
@@ -325,25 +500,26 @@ class Controller:
         
 if __name__ == "__main__":
     config = Config()
+    # the DDS threads are created here and inherit the background cores
+    rt_profile.pin_current_thread(rt_profile.background_cores, "DDS threads")
     # Initialize DDS communication
     ChannelFactoryInitialize(1, "lo")
     
     controller = Controller(config)
-    
-    while True:
+    try:
+        controller.start()
+        while True:
+            try:
+                controller.run()
+                # Press the select key to exit
+                # if controller.remote_controller.is_button_pressed(KeyMap.select):
+                    # break
+            except KeyboardInterrupt:
+                break
+    finally:
+        # damping is sent whatever ended the loop
         try:
-            controller.run()
-            # Press the select key to exit
-            # if controller.remote_controller.is_button_pressed(KeyMap.select):
-                # break
-        except KeyboardInterrupt:
-            break
-    
-    # Save any remaining log data before exit
-    if controller.logging_active:
-        print("💾 Saving log data before exit...")
-        controller.save_current_log()
-    
-    create_damping_cmd(controller.low_cmd)
-    controller.send_cmd(controller.low_cmd)
+            controller.stop_logging()
+        finally:
+            controller.stop()
     print("Exit")
@@ -0,0 +1,84 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.absolute()))
+
+import asyncio
+import signal
+import time
+
+# deploy_real sets the BLAS thread caps on import, before anything loads numpy
+from deploy_real import Controller, rt_profile
+from config import Config
+from common.status_display import status
+
+from unitree_sdk2py.core.channel import ChannelFactoryInitialize
+
+
+async def control_task(controller: Controller, stop_event: asyncio.Event):
+    """Deadline-driven control tick, the only task that touches the FSM and the LowCmd"""
+    controller.start()
+    while not stop_event.is_set():
+        loop_start_time = time.perf_counter()
+        controller.tick_record = {"loop_period": controller.scheduler.last_period(),
+                                  "wake_lateness": controller.scheduler.last_lateness()}
+        try:
+            controller.control_step(loop_start_time)
+        except ValueError as e:
+            status.post(str(e))
+        work_time = time.perf_counter() - loop_start_time
+        controller.finish_tick(await controller.scheduler.wait_async(), work_time)
+
+
+async def input_task(controller: Controller, stop_event: asyncio.Event):
+    """Polls the remote/keyboard in the control task's slack time"""
+    while not stop_event.is_set():
+        try:
+            controller.handle_input()
+        except ValueError as e:
+            status.post(str(e))
+        await asyncio.sleep(controller.control_dt)
+
+
+async def telemetry_task(controller: Controller, stop_event: asyncio.Event):
+    """Periodic loop, latency and streamer statistics"""
+    while not stop_event.is_set():
+        await asyncio.sleep(controller.stats_interval)
+        controller.print_stats()
+
+
+async def main(controller: Controller):
+    loop = asyncio.get_running_loop()
+    stop_event = asyncio.Event()
+    loop.add_signal_handler(signal.SIGINT, stop_event.set)
+
+    try:
+        tasks = [asyncio.create_task(control_task(controller, stop_event), name="control"),
+                 asyncio.create_task(input_task(controller, stop_event), name="input"),
+                 asyncio.create_task(telemetry_task(controller, stop_event), name="telemetry")]
+        # a task that ends on an exception stops the others, the robot must not run without them
+        for task in tasks:
+            task.add_done_callback(lambda _: stop_event.set())
+        await stop_event.wait()
+        for task in tasks:
+            task.cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for task, result in zip(tasks, results):
+            if isinstance(result, Exception):
+                print(f"❌ {task.get_name()} task failed: {result!r}")
+
+        # saving the CSV files blocks, keep it off the event loop
+        await loop.run_in_executor(None, controller.stop_logging)
+    finally:
+        # damping is sent however the tasks ended
+        controller.stop()
+
+if __name__ == "__main__":
+    config = Config()
+    # the DDS threads are created here and inherit the background cores
+    rt_profile.pin_current_thread(rt_profile.background_cores, "DDS threads")
+    # Initialize DDS communication
+    ChannelFactoryInitialize(1, "lo")
+
+    controller = Controller(config)
+    asyncio.run(main(controller))
+    print("Exit")
@@ -3,8 +3,12 @@ from common.path_config import PROJECT_ROOT
 from FSM.FSMState import FSMStateName, FSMState
 from common.ctrlcomp import StateAndCmd, PolicyOutput
 import numpy as np
+from common.numba_kernels import push_history
 import yaml
-from common.utils import FSMCommand, progress_bar
+from common.utils import FSMCommand
+from common.status_display import status
+from common.model_loader import build_onnx_session, ort_session_options, check_model_shapes, ModelPreloader
+from common.inference_server import RemoteBackend
 import onnx
 import onnxruntime
 import torch
@@ -26,7 +30,9 @@ class AccadMaleB13(FSMState):
         config_path = os.path.join(current_dir, "config", "AccadMaleB13.yaml")
         with open(config_path, "r") as f:
             config = yaml.load(f, Loader=yaml.FullLoader)
-            self.onnx_path = os.path.join(current_dir, "model", config["onnx_path"])
+            self.load_rate_config(config)
+            self.model_dir = os.path.join(current_dir, "model")
+            self.onnx_path = os.path.join(self.model_dir, config["onnx_path"])
             self.kps = np.array(config["kps"], dtype=np.float32)
             self.kds = np.array(config["kds"], dtype=np.float32)
             self.default_angles =  np.array(config["default_angles"], dtype=np.float32)
@@ -40,6 +46,7 @@ class AccadMaleB13(FSMState):
             self.action_scale = config["action_scale"]
             self.history_length = config["history_length"]
             self.motion_length = config["motion_length"]
+            self.motion_lengths = config["motion_lengths"]
             
             self.qj_obs = np.zeros(self.num_actions, dtype=np.float32)
             self.dqj_obs = np.zeros(self.num_actions, dtype=np.float32)
@@ -56,16 +63,81 @@ class AccadMaleB13(FSMState):
             
             # load policy
             self.onnx_model = onnx.load(self.onnx_path)
-            self.ort_session = onnxruntime.InferenceSession(self.onnx_path)
+            self.ort_session = onnxruntime.InferenceSession(self.onnx_path, sess_options=ort_session_options())
             self.input_name = self.ort_session.get_inputs()[0].name
             for _ in range(50):
                 obs_tensor = torch.from_numpy(self.obs).unsqueeze(0).cpu().numpy()
                 obs_tensor = obs_tensor.astype(np.float32)
                 self.ort_session.run(None, {self.input_name: obs_tensor})[0]
+            
+            # runtime checkpoint selection, candidates are built off the control thread
+            self.checkpoints = self.find_checkpoints()
+            self.checkpoint = config["onnx_path"]
+            self.selected_checkpoint = self.checkpoint
+            self.preloader = ModelPreloader("accad_checkpoint_preloader")
                     
             print("Male walk policy initializing ...")
     
+    def find_checkpoints(self):
+        """Checkpoints in model_dir that can be selected at runtime, only those with a motion_lengths entry:
+        the motion length sets ref_motion_phase in the observation and the end of the skill"""
+        files = sorted(f for f in os.listdir(self.model_dir) if f.endswith(".onnx"))
+        unlisted = [f for f in files if f not in self.motion_lengths]
+        if unlisted:
+            print(f"⚠️  No motion_lengths entry for {', '.join(unlisted)}, not selectable")
+        return [f for f in files if f in self.motion_lengths]
+
+    def select_checkpoint(self, checkpoint):
+        """Preload `checkpoint` in the background, it becomes active on the next enter()"""
+        if checkpoint not in self.checkpoints:
+            if checkpoint in self.motion_lengths or not os.path.exists(os.path.join(self.model_dir, checkpoint)):
+                status.post(f"⚠️  Unknown checkpoint: {checkpoint}")
+            else:
+                status.post(f"⚠️  {checkpoint} has no motion_lengths entry, not selectable")
+            return
+        self.selected_checkpoint = checkpoint
+        onnx_path = os.path.join(self.model_dir, checkpoint)
+        self.preloader.request(lambda: self._build_checkpoint(onnx_path), checkpoint)
+        status.post(f"🔀 Selected checkpoint {checkpoint}, preloading ...")
+    
+    def _build_checkpoint(self, onnx_path):
+        """Runs on the preloader thread, also builds the checkpoint in the inference server if one serves this policy"""
+        ort_session, input_name = build_onnx_session(onnx_path, self.num_obs)
+        # a checkpoint with other obs/action sizes fails here, not on enter()
+        check_model_shapes(lambda x: ort_session.run(None, {input_name: x})[0], self.num_obs, self.num_actions)
+        server_session = self.ort_session
+        variant = server_session.stage(onnx_path) if isinstance(server_session, RemoteBackend) else None
+        return ort_session, input_name, variant
+
+    def select_next_checkpoint(self, step=1):
+        if not self.checkpoints:
+            status.post("⚠️  No checkpoint has a motion_lengths entry")
+            return
+        index = self.checkpoints.index(self.selected_checkpoint) if self.selected_checkpoint in self.checkpoints else 0
+        self.select_checkpoint(self.checkpoints[(index + step) % len(self.checkpoints)])
+    
+    def swap_pending_checkpoint(self):
+        """Install a finished preload, only called while the skill is not running"""
+        preloaded = self.preloader.take()
+        if preloaded is None:
+            if self.preloader.is_busy():
+                status.post(f"⚠️  Checkpoint {self.selected_checkpoint} still loading, keeping {self.checkpoint}")
+            return
+        checkpoint, (ort_session, input_name, variant), build_time = preloaded
+        if isinstance(self.ort_session, RemoteBackend):
+            if not self.ort_session.activate(variant, ort_session):
+                status.post(f"⚠️  Checkpoint {checkpoint} outdated, keeping {self.checkpoint}")
+                return
+        else:
+            self.ort_session = ort_session
+        self.input_name = input_name
+        self.onnx_path = os.path.join(self.model_dir, checkpoint)
+        self.checkpoint = checkpoint
+        self.motion_length = self.motion_lengths[checkpoint]
+        status.post(f"✅ Switched to checkpoint {checkpoint} (built in {build_time:.2f}s, motion length {self.motion_length}s)")
+    
     def enter(self):
+        self.swap_pending_checkpoint()
         self.action = np.zeros(23, dtype=np.float32)
         self.action_buf = np.zeros(23 * self.history_length, dtype=np.float32)
         self.ref_motion_phase = 0.
@@ -95,9 +167,10 @@ class AccadMaleB13(FSMState):
         dqj = self.state_cmd.dq.reshape(-1)
         ang_vel = self.state_cmd.ang_vel.reshape(-1)
         
-        qj_23dof = qj[self.dof23_index].copy()
-        dqj_23dof = dqj[self.dof23_index].copy()
-        default_angles_23dof = self.default_angles[self.dof23_index].copy()
+        # fancy indexing already copies out of the read-only state views
+        qj_23dof = qj[self.dof23_index]
+        dqj_23dof = dqj[self.dof23_index]
+        default_angles_23dof = self.default_angles[self.dof23_index]
         qj_23dof = (qj_23dof - default_angles_23dof) * self.dof_pos_scale
         dqj_23dof = dqj_23dof * self.dof_vel_scale
         ang_vel = ang_vel * self.ang_vel_scale
@@ -111,12 +184,12 @@ class AccadMaleB13(FSMState):
                                                 self.ref_motion_phase_buf
                                                 ), 
                                                axis=-1, dtype=np.float32)
-        self.ang_vel_buf = np.concatenate((ang_vel, self.ang_vel_buf[:-3]), axis=-1, dtype=np.float32)
-        self.proj_g_buf = np.concatenate((gravity_orientation, self.proj_g_buf[:-3] ), axis=-1, dtype=np.float32)
-        self.dof_pos_buf = np.concatenate((qj_23dof, self.dof_pos_buf[:-23] ), axis=-1, dtype=np.float32)
-        self.dof_vel_buf = np.concatenate((dqj_23dof, self.dof_vel_buf[:-23] ), axis=-1, dtype=np.float32)
-        self.action_buf = np.concatenate((self.action, self.action_buf[:-23] ), axis=-1, dtype=np.float32)
-        self.ref_motion_phase_buf = np.concatenate((np.array([min(self.ref_motion_phase,1.0)]), self.ref_motion_phase_buf[:-1] ), axis=-1, dtype=np.float32)
+        push_history(self.ang_vel_buf, ang_vel)
+        push_history(self.proj_g_buf, gravity_orientation)
+        push_history(self.dof_pos_buf, qj_23dof)
+        push_history(self.dof_vel_buf, dqj_23dof)
+        push_history(self.action_buf, self.action)
+        push_history(self.ref_motion_phase_buf, np.array([min(self.ref_motion_phase, 1.0)]))
         # mimic_history_obs_buf = np.concatenate((self.ang_vel_buf, 
         #                                         self.proj_g_buf, 
         #                                         self.dof_pos_buf, 
@@ -138,7 +211,8 @@ class AccadMaleB13(FSMState):
         
         mimic_obs_tensor = torch.from_numpy(mimic_obs_buf).unsqueeze(0).cpu().numpy()
         self.action = np.squeeze(self.ort_session.run(None, {self.input_name: mimic_obs_tensor})[0])
-        target_dof_pos = np.zeros(29)
+        # filled in place, every motor is written below
+        target_dof_pos = self.policy_output.actions
         target_dof_pos[:15] = self.action[:15] * self.action_scale + self.default_angles[:15]
         # target_dof_pos[:13] = self.action[:13] * self.action_scale + self.default_angles[:13]
         # target_dof_pos[13:15] = self.default_angles[13:15]  # Waist yaw
@@ -148,16 +222,15 @@ class AccadMaleB13(FSMState):
         target_dof_pos[19:22] = self.default_angles[19:22]
         target_dof_pos[26:29] = self.default_angles[26:29]
         
-        self.policy_output.actions = target_dof_pos
-        self.policy_output.kps = self.kps
-        self.policy_output.kds = self.kds
+        self.policy_output.set_gains(self.kps, self.kds)
         
         # update motion phase
         self.counter_step += 1
-        motion_time = self.counter_step * 0.02
+        # phase of the next inference tick
+        motion_time = self.elapsed_time + self.control_dt
         self.ref_motion_phase = motion_time / self.motion_length
         motion_time = min(motion_time, self.motion_length)
-        print(progress_bar(motion_time, self.motion_length), end="", flush=True)
+        status.set_progress(motion_time, self.motion_length)
 
         # print(f"ref_motion_phase: {self.ref_motion_phase:.4f}")
         # if self.ref_motion_phase >=0.8:
@@ -172,7 +245,8 @@ class AccadMaleB13(FSMState):
         self.ref_motion_phase_buf = np.zeros(1 * self.history_length, dtype=np.float32)
         self.motion_time = 0
         self.counter_step = 0
-        print("exited")
+        status.clear_progress()
+        status.post("exited")
 
     
     def checkChange(self):
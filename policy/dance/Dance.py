@@ -3,8 +3,11 @@ from common.path_config import PROJECT_ROOT
 from FSM.FSMState import FSMStateName, FSMState
 from common.ctrlcomp import StateAndCmd, PolicyOutput
 import numpy as np
+from common.numba_kernels import push_history
 import yaml
-from common.utils import FSMCommand, progress_bar
+from common.utils import FSMCommand
+from common.status_display import status
+from common.model_loader import ort_session_options
 import onnx
 import onnxruntime
 import torch
@@ -26,6 +29,7 @@ class Dance(FSMState):
         config_path = os.path.join(current_dir, "config", "Dance.yaml")
         with open(config_path, "r") as f:
             config = yaml.load(f, Loader=yaml.FullLoader)
+            self.load_rate_config(config)
             self.onnx_path = os.path.join(current_dir, "model", config["onnx_path"])
             self.kps = np.array(config["kps"], dtype=np.float32)
             self.kds = np.array(config["kds"], dtype=np.float32)
@@ -56,7 +60,7 @@ class Dance(FSMState):
             
             # load policy
             self.onnx_model = onnx.load(self.onnx_path)
-            self.ort_session = onnxruntime.InferenceSession(self.onnx_path)
+            self.ort_session = onnxruntime.InferenceSession(self.onnx_path, sess_options=ort_session_options())
             self.input_name = self.ort_session.get_inputs()[0].name
             for _ in range(50):
                 obs_tensor = torch.from_numpy(self.obs).unsqueeze(0).cpu().numpy()
@@ -95,19 +99,20 @@ class Dance(FSMState):
         dqj = self.state_cmd.dq.reshape(-1)
         ang_vel = self.state_cmd.ang_vel.reshape(-1)
         
-        qj_23dof = qj[self.dof23_index].copy()
-        dqj_23dof = dqj[self.dof23_index].copy()
-        default_angles_23dof = self.default_angles[self.dof23_index].copy()
+        # fancy indexing already copies out of the read-only state views
+        qj_23dof = qj[self.dof23_index]
+        dqj_23dof = dqj[self.dof23_index]
+        default_angles_23dof = self.default_angles[self.dof23_index]
         qj_23dof = (qj_23dof - default_angles_23dof) * self.dof_pos_scale
         dqj_23dof = dqj_23dof * self.dof_vel_scale
         ang_vel = ang_vel * self.ang_vel_scale
         
-        self.ang_vel_buf = np.concatenate((ang_vel, self.ang_vel_buf[:-3]), axis=-1, dtype=np.float32)
-        self.proj_g_buf = np.concatenate((gravity_orientation, self.proj_g_buf[:-3] ), axis=-1, dtype=np.float32)
-        self.dof_pos_buf = np.concatenate((qj_23dof, self.dof_pos_buf[:-23] ), axis=-1, dtype=np.float32)
-        self.dof_vel_buf = np.concatenate((dqj_23dof, self.dof_vel_buf[:-23] ), axis=-1, dtype=np.float32)
-        self.action_buf = np.concatenate((self.action, self.action_buf[:-23] ), axis=-1, dtype=np.float32)
-        self.ref_motion_phase_buf = np.concatenate((np.array([min(self.ref_motion_phase,1.0)]), self.ref_motion_phase_buf[:-1] ), axis=-1, dtype=np.float32)
+        push_history(self.ang_vel_buf, ang_vel)
+        push_history(self.proj_g_buf, gravity_orientation)
+        push_history(self.dof_pos_buf, qj_23dof)
+        push_history(self.dof_vel_buf, dqj_23dof)
+        push_history(self.action_buf, self.action)
+        push_history(self.ref_motion_phase_buf, np.array([min(self.ref_motion_phase, 1.0)]))
         
         mimic_history_obs_buf = np.concatenate((self.action_buf, 
                                                 self.ang_vel_buf, 
@@ -130,7 +135,8 @@ class Dance(FSMState):
         
         mimic_obs_tensor = torch.from_numpy(mimic_obs_buf).unsqueeze(0).cpu().numpy()
         self.action = np.squeeze(self.ort_session.run(None, {self.input_name: mimic_obs_tensor})[0])
-        target_dof_pos = np.zeros(29)
+        # filled in place, every motor is written below
+        target_dof_pos = self.policy_output.actions
         # target_dof_pos[:15] = self.action[:15] * self.action_scale + self.default_angles[:15]
         target_dof_pos[:13] = self.action[:13] * self.action_scale + self.default_angles[:13]
         target_dof_pos[13:15] = self.default_angles[13:15]  # Waist yaw
@@ -140,17 +146,16 @@ class Dance(FSMState):
         target_dof_pos[19:22] = self.default_angles[19:22]
         target_dof_pos[26:29] = self.default_angles[26:29]
         
-        self.policy_output.actions = target_dof_pos
-        self.policy_output.kps = self.kps
-        self.policy_output.kds = self.kds
+        self.policy_output.set_gains(self.kps, self.kds)
         
         # update motion phase
         self.counter_step += 1
-        motion_time = self.counter_step * 0.02
+        # phase of the next inference tick
+        motion_time = self.elapsed_time + self.control_dt
         self.ref_motion_phase = motion_time / self.motion_length
         # print("phase: ", self.ref_motion_phase )
         motion_time = min(motion_time, self.motion_length)
-        # print(progress_bar(motion_time, self.motion_length), end="", flush=True)
+        # status.set_progress(motion_time, self.motion_length)
     
     def exit(self):
         self.action = np.zeros(23, dtype=np.float32)
@@ -159,7 +164,7 @@ class Dance(FSMState):
         self.ref_motion_phase_buf = np.zeros(1 * self.history_length, dtype=np.float32)
         self.motion_time = 0
         self.counter_step = 0
-        print()
+        status.clear_progress()
 
     
     def checkChange(self):
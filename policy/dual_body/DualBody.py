@@ -0,0 +1,101 @@
+from common.path_config import PROJECT_ROOT
+
+from FSM.FSMState import FSMStateName, FSMState
+from common.ctrlcomp import StateAndCmd, PolicyOutput
+from common.utils import FSMCommand
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import threading
+import yaml
+import time
+import os
+
+class DualBody(FSMState):
+    def __init__(self, state_cmd:StateAndCmd, policy_output:PolicyOutput, lower_policy:FSMState, upper_policy:FSMState):
+        super().__init__()
+        self.state_cmd = state_cmd
+        self.policy_output = policy_output
+        self.name = FSMStateName.SKILL_DualBody
+        self.name_str = "skill_dual_body"
+        self.lower_policy = lower_policy
+        self.upper_policy = upper_policy
+
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        config_path = os.path.join(current_dir, "config", "DualBody.yaml")
+        with open(config_path, "r") as f:
+            config = yaml.load(f, Loader=yaml.FullLoader)
+            self.load_rate_config(config)
+            self.lower_body_motor_idx = np.array(config["lower_body_motor_idx"], dtype=np.int32)
+            self.upper_body_motor_idx = np.array(config["upper_body_motor_idx"], dtype=np.int32)
+
+        # each sub policy writes into its own output while the composite is active
+        self.lower_output = PolicyOutput(state_cmd.num_joints)
+        self.upper_output = PolicyOutput(state_cmd.num_joints)
+        self.lower_shared_output = lower_policy.policy_output
+        self.upper_shared_output = upper_policy.policy_output
+
+        # torch and onnxruntime release the GIL during inference, so the two models overlap;
+        # with the inference server both slots are served by their own server thread
+        self.executor = self.make_executor()
+        self.lower_time = 0.
+        self.upper_time = 0.
+        self.total_time = 0.
+
+        print("DualBody policy initializing ...")
+
+    def make_executor(self):
+        """Both workers are started here, so they inherit the affinity of the thread building
+        the policy (the inference cores) instead of the pinned control thread's on the first run()"""
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="dual_body")
+        started = threading.Barrier(3)
+        for _ in range(2):
+            executor.submit(started.wait)
+        started.wait()
+        return executor
+
+    def _timed_run(self, policy:FSMState):
+        start_time = time.perf_counter()
+        policy.run()
+        return time.perf_counter() - start_time
+
+    def sub_policies(self):
+        return (self.lower_policy, self.upper_policy)
+
+    def enter(self):
+        self.lower_policy.policy_output = self.lower_output
+        self.upper_policy.policy_output = self.upper_output
+        self.lower_policy.enter()
+        self.upper_policy.enter()
+
+    def run(self):
+        start_time = time.perf_counter()
+        self.lower_policy.elapsed_time = self.elapsed_time
+        self.upper_policy.elapsed_time = self.elapsed_time
+        lower_future = self.executor.submit(self._timed_run, self.lower_policy)
+        upper_future = self.executor.submit(self._timed_run, self.upper_policy)
+        self.lower_time = lower_future.result()
+        self.upper_time = upper_future.result()
+
+        self.policy_output.copy_from(self.lower_output, self.lower_body_motor_idx)
+        self.policy_output.copy_from(self.upper_output, self.upper_body_motor_idx)
+        self.total_time = time.perf_counter() - start_time
+
+    def exit(self):
+        self.lower_policy.exit()
+        self.upper_policy.exit()
+        self.lower_policy.policy_output = self.lower_shared_output
+        self.upper_policy.policy_output = self.upper_shared_output
+
+    def checkChange(self):
+        if(self.state_cmd.skill_cmd == FSMCommand.LOCO):
+            self.state_cmd.skill_cmd = FSMCommand.INVALID
+            return FSMStateName.SKILL_COOLDOWN
+        elif(self.state_cmd.skill_cmd == FSMCommand.PASSIVE):
+            self.state_cmd.skill_cmd = FSMCommand.INVALID
+            return FSMStateName.PASSIVE
+        elif(self.state_cmd.skill_cmd == FSMCommand.POS_RESET):
+            self.state_cmd.skill_cmd = FSMCommand.INVALID
+            return FSMStateName.FIXEDPOSE
+        else:
+            self.state_cmd.skill_cmd = FSMCommand.INVALID
+            return FSMStateName.SKILL_DualBody
@@ -5,6 +5,8 @@ from common.ctrlcomp import StateAndCmd, PolicyOutput
 import numpy as np
 import yaml
 from common.utils import FSMCommand
+from common.status_display import status
+from common.trajectory import JointTrajectory
 import os
 
 class FixedPose(FSMState):
@@ -25,36 +27,26 @@ class FixedPose(FSMState):
             self.kps = np.array(config["kps"], dtype=np.float32)
             self.default_angles = np.array(config["default_angles"], dtype=np.float32)
             self.joint2motor_idx = np.array(config["joint2motor_idx"], dtype=np.int32)
-            self.control_dt = config["control_dt"]
+            self.load_rate_config(config)
+            self.total_time = 2.0
+            self.trajectory = JointTrajectory(self.joint2motor_idx, self.total_time,
+                                              config.get("interp_profile", "linear"))
     
     def enter(self):
-        print("Moving to default pos(configuration A).")
-        self.total_time = 2.0
-        self.num_step = int(self.total_time / self.control_dt)
-        self.dof_size = len(self.joint2motor_idx)
-        self.init_dof_pos = np.zeros(self.dof_size, dtype=np.float32)
+        status.post("Moving to default pos(configuration A).")
         self.alpha = 0.
         self.cur_step = 0
-        for i in range(self.dof_size):
-            self.init_dof_pos[i] = self.state_cmd.q[self.joint2motor_idx[i]]
+        self.trajectory.start(self.state_cmd.q, self.default_angles)
         
         
     def run(self):
         self.cur_step += 1
-        self.alpha = min(self.cur_step / self.num_step, 1.0)
-        for j in range(self.dof_size):
-            motor_idx = self.joint2motor_idx[j]
-            target_pos = self.default_angles[j]
-            self.policy_output.actions[motor_idx] = self.init_dof_pos[j] * (1 - self.alpha) + target_pos * self.alpha
-            self.policy_output.kps[motor_idx] = self.kps[j]
-            self.policy_output.kds[motor_idx] = self.kds[j]
+        self.alpha = self.trajectory.write(self.policy_output.actions, self.elapsed_time + self.control_dt)
+        self.policy_output.set_gains(self.kps, self.kds, self.joint2motor_idx)
     
     def exit(self):
-        for j in range(self.dof_size):
-            motor_idx = self.joint2motor_idx[j]
-            self.policy_output.actions[motor_idx] = self.default_angles[j]
-            self.policy_output.kps[motor_idx] = self.kps[j]
-            self.policy_output.kds[motor_idx] = self.kds[j]
+        self.policy_output.set_actions(self.default_angles, self.joint2motor_idx)
+        self.policy_output.set_gains(self.kps, self.kds, self.joint2motor_idx)
     
     def checkChange(self):
         if(self.state_cmd.skill_cmd == FSMCommand.LOCO):
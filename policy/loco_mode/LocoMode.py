@@ -2,7 +2,7 @@ from common.path_config import PROJECT_ROOT
 
 from FSM.FSMState import FSMStateName, FSMState
 from common.ctrlcomp import StateAndCmd, PolicyOutput, FSMCommand
-from common.utils import scale_values
+from common.numba_kernels import scale_values, gather_offset_scale, gather_scale
 import numpy as np
 import yaml
 import torch
@@ -20,6 +20,7 @@ class LocoMode(FSMState):
         config_path = os.path.join(current_dir, "config", "LocoMode.yaml")
         with open(config_path, "r") as f:
             config = yaml.load(f, Loader=yaml.FullLoader)
+            self.load_rate_config(config)
             self.policy_path = os.path.join(current_dir, "model", config["policy_path"])
             self.kps = np.array(config["kps"], dtype=np.float32)
             self.kds = np.array(config["kds"], dtype=np.float32)
@@ -37,6 +38,7 @@ class LocoMode(FSMState):
             self.range_velx = np.array([self.cmd_range["lin_vel_x"][0], self.cmd_range["lin_vel_x"][1]], dtype=np.float32)
             self.range_vely = np.array([self.cmd_range["lin_vel_y"][0], self.cmd_range["lin_vel_y"][1]], dtype=np.float32)
             self.range_velz = np.array([self.cmd_range["ang_vel_z"][0], self.cmd_range["ang_vel_z"][1]], dtype=np.float32)
+            self.cmd_ranges = np.stack([self.range_velx, self.range_vely, self.range_velz])
             
             self.qj_obs = np.zeros(self.num_actions, dtype=np.float32)
             self.dqj_obs = np.zeros(self.num_actions, dtype=np.float32)
@@ -68,42 +70,30 @@ class LocoMode(FSMState):
             
     
     def run(self):
-        self.gravity_orientation = self.state_cmd.gravity_ori
-        self.qj = self.state_cmd.q.copy()
-        self.dqj = self.state_cmd.dq.copy()
-        self.ang_vel = self.state_cmd.ang_vel.copy()
-        joycmd = self.state_cmd.vel_cmd.copy()
-        self.cmd = scale_values(joycmd, [self.range_velx, self.range_vely, self.range_velz])
+        # read-only views of the state buffers, valid for this tick only
+        gravity_orientation = self.state_cmd.gravity_ori
+        qj = self.state_cmd.q
+        dqj = self.state_cmd.dq
+        scale_values(self.state_cmd.vel_cmd, self.cmd_ranges, self.cmd)
         
-        for i in range(len(self.joint2motor_idx)):
-            self.qj_obs[i] = self.qj[self.joint2motor_idx[i]]
-            self.dqj_obs[i] = self.dqj[self.joint2motor_idx[i]]
-            
-        self.qj_obs = (self.qj_obs - self.default_angles) * self.dof_pos_scale
-        self.dqj_obs = self.dqj_obs * self.dof_vel_scale
-        self.ang_vel = self.ang_vel * self.ang_vel_scale
-        self.cmd = self.cmd * self.cmd_scale
+        gather_offset_scale(qj, self.joint2motor_idx, self.default_angles, self.dof_pos_scale, self.qj_obs)
+        gather_scale(dqj, self.joint2motor_idx, self.dof_vel_scale, self.dqj_obs)
+        ang_vel = self.state_cmd.ang_vel * self.ang_vel_scale
+        self.cmd *= self.cmd_scale
         
-        self.obs[:3] = self.ang_vel.copy()
-        self.obs[3:6] = self.gravity_orientation.copy()
-        self.obs[6:9] = self.cmd.copy()
-        self.obs[9: 9 + self.num_actions] = self.qj_obs.copy()
-        self.obs[9 + self.num_actions: 9 + self.num_actions * 2] = self.dqj_obs.copy()
-        self.obs[9 + self.num_actions * 2: 9 + self.num_actions * 3] = self.action.copy()
+        self.obs[:3] = ang_vel
+        self.obs[3:6] = gravity_orientation
+        self.obs[6:9] = self.cmd
+        self.obs[9: 9 + self.num_actions] = self.qj_obs
+        self.obs[9 + self.num_actions: 9 + self.num_actions * 2] = self.dqj_obs
+        self.obs[9 + self.num_actions * 2: 9 + self.num_actions * 3] = self.action
         
         obs_tensor = self.obs.reshape(1, -1)
         obs_tensor = obs_tensor.astype(np.float32)
         self.action = self.policy(torch.from_numpy(obs_tensor).clip(-100, 100)).clip(-100, 100).detach().numpy().squeeze()
         loco_action = self.action * self.action_scale + self.default_angles
-        action_reorder = loco_action.copy()
-        for i in range(len(self.joint2motor_idx)):
-            motor_idx = self.joint2motor_idx[i]
-            action_reorder[motor_idx] = loco_action[i]
-            
-        
-        self.policy_output.actions = action_reorder.copy()
-        self.policy_output.kps = self.kps_reorder.copy()
-        self.policy_output.kds = self.kds_reorder.copy()
+        self.policy_output.set_actions(loco_action, self.joint2motor_idx)
+        self.policy_output.set_gains(self.kps_reorder, self.kds_reorder)
         # print("actions: ", self.policy_output.actions)
     
     def exit(self):
@@ -118,6 +108,8 @@ class LocoMode(FSMState):
             return FSMStateName.SKILL_KICK
         elif(self.state_cmd.skill_cmd == FSMCommand.SKILL_4):
             return FSMStateName.SKILL_AccadMaleB13
+        elif(self.state_cmd.skill_cmd == FSMCommand.SKILL_5):
+            return FSMStateName.SKILL_DualBody
         elif(self.state_cmd.skill_cmd == FSMCommand.PASSIVE):
             return FSMStateName.PASSIVE
         else:
@@ -19,24 +19,18 @@ class PassiveMode(FSMState):
         config_path = os.path.join(current_dir, "config", "Passive.yaml")
         with open(config_path, "r") as f:
             config = yaml.load(f, Loader=yaml.FullLoader)
+            self.load_rate_config(config)
             self.kds = np.array(config["kds"], dtype=np.float32)
     
     def enter(self):
-        self.policy_output.kps = np.zeros(self.state_cmd.num_joints)
-        self.policy_output.kds = self.kds.copy()
+        self.policy_output.set_gains(0., self.kds)
     
     def run(self):
-        kps = np.zeros(self.state_cmd.num_joints)
-        kds = self.kds.copy()
-        actions = np.zeros(self.state_cmd.num_joints)
-        
-        self.policy_output.actions = actions.copy()
-        self.policy_output.kps = kps.copy()
-        self.policy_output.kds = kds.copy()
+        self.policy_output.set_actions(0.)
+        self.policy_output.set_gains(0., self.kds)
     
     def exit(self):
-        self.policy_output.kps = np.zeros(self.state_cmd.num_joints)
-        self.policy_output.kds = self.kds.copy()
+        self.policy_output.set_gains(0., self.kds)
         
     
     def checkChange(self):
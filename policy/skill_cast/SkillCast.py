@@ -4,6 +4,8 @@ from FSM.FSMState import FSMStateName, FSMState
 from common.ctrlcomp import StateAndCmd, PolicyOutput, FSMCommand
 import numpy as np
 import yaml
+from common.trajectory import JointTrajectory
+from common.numba_kernels import gather_offset_scale, gather_scale
 import torch
 import os
 
@@ -21,6 +23,7 @@ class SkillCast(FSMState):
         config_path = os.path.join(current_dir, "config", "SkillCast.yaml")
         with open(config_path, "r") as f:
             config = yaml.load(f, Loader=yaml.FullLoader)
+            self.load_rate_config(config)
             self.policy_path = os.path.join(current_dir, "model", config["policy_path"])
             self.kps = np.array(config["kps"], dtype=np.float32)
             self.kds = np.array(config["kds"], dtype=np.float32)
@@ -28,6 +31,7 @@ class SkillCast(FSMState):
             self.joint2motor_idx =  np.array(config["joint2motor_idx"], dtype=np.int32)
             self.upper_body_motor_idx =  np.array(config["upper_body_motor_idx"], dtype=np.int32)
             self.lower_body_motor_idx =  np.array(config["lower_body_motor_idx"], dtype=np.int32)
+            self.lower_default_angles = self.default_angles[self.lower_body_motor_idx]
             self.tau_limit =  np.array(config["tau_limit"], dtype=np.float32)
             self.num_actions = config["num_actions"]
             self.num_obs = config["num_obs"]
@@ -36,6 +40,8 @@ class SkillCast(FSMState):
             self.dof_vel_scale = config["dof_vel_scale"]
             self.action_scale = config["action_scale"]
             self.total_time = config["total_time"]
+            self.upper_trajectory = JointTrajectory(self.upper_body_motor_idx, self.total_time,
+                                                    config.get("interp_profile", "linear"))
             self.upper_target_angles_skill_1 = np.array(config["upper_target_angles_skill_1"], dtype=np.float32)
             self.upper_target_angles_skill_2 = np.array(config["upper_target_angles_skill_2"], dtype=np.float32)
             self.upper_target_angles_skill_4 = np.array(config["upper_target_angles_skill_4"], dtype=np.float32)
@@ -44,9 +50,7 @@ class SkillCast(FSMState):
             self.dqj_obs = np.zeros(self.num_actions, dtype=np.float32)
             self.obs = np.zeros(self.num_obs)
             self.action = np.zeros(self.num_actions)
-            self.num_step = int(self.total_time / self.control_dt)
             self.upper_dof_size = len(self.upper_body_motor_idx)
-            self.upper_init_dof_pos = np.zeros(self.upper_dof_size, dtype=np.float32)
             self.upper_dof_target = np.zeros(self.upper_dof_size)
             
             # load policy
@@ -64,38 +68,36 @@ class SkillCast(FSMState):
     def enter(self):    
         self.alpha = 0.
         self.cur_step = 0
-        for i in range(self.upper_dof_size):
-            self.upper_init_dof_pos[i] = self.state_cmd.q[self.upper_body_motor_idx[i]]
+        self.upper_trajectory.start(self.state_cmd.q)
             
     
     def run(self):
-        self.gravity_orientation = self.state_cmd.gravity_ori
-        self.qj = self.state_cmd.q.copy()
-        self.dqj = self.state_cmd.dq.copy()
-        self.ang_vel = self.state_cmd.ang_vel.copy()
+        # read-only views of the state buffers, valid for this tick only
+        gravity_orientation = self.state_cmd.gravity_ori
+        qj = self.state_cmd.q
+        dqj = self.state_cmd.dq
         self.cmd = np.zeros(3)
             
-        self.qj_obs = (self.qj[self.lower_body_motor_idx] - self.default_angles[self.lower_body_motor_idx]) * self.dof_pos_scale
-        self.dqj_obs = self.dqj[self.lower_body_motor_idx] * self.dof_vel_scale
-        self.ang_vel = self.ang_vel * self.ang_vel_scale
+        gather_offset_scale(qj, self.lower_body_motor_idx, self.lower_default_angles, self.dof_pos_scale, self.qj_obs)
+        gather_scale(dqj, self.lower_body_motor_idx, self.dof_vel_scale, self.dqj_obs)
+        ang_vel = self.state_cmd.ang_vel * self.ang_vel_scale
         
-        count = self.cur_step * self.control_dt
+        count = self.elapsed_time
         
-        self.obs[:3] = self.ang_vel.copy()
-        self.obs[3:6] = self.gravity_orientation.copy()
-        self.obs[6:9] = self.cmd.copy()
-        self.obs[9: 9 + self.num_actions] = self.qj_obs.copy()
-        self.obs[9 + self.num_actions: 9 + self.num_actions * 2] = self.dqj_obs.copy()
-        self.obs[9 + self.num_actions * 2: 9 + self.num_actions * 3] = self.action.copy()
+        self.obs[:3] = ang_vel
+        self.obs[3:6] = gravity_orientation
+        self.obs[6:9] = self.cmd
+        self.obs[9: 9 + self.num_actions] = self.qj_obs
+        self.obs[9 + self.num_actions: 9 + self.num_actions * 2] = self.dqj_obs
+        self.obs[9 + self.num_actions * 2: 9 + self.num_actions * 3] = self.action
         
         obs_tensor = self.obs.reshape(1, -1)
         obs_tensor = obs_tensor.astype(np.float32)
         self.action = self.policy(torch.from_numpy(obs_tensor)).detach().numpy().squeeze()
         loco_action = self.action * self.action_scale + self.default_angles[self.lower_body_motor_idx]
 
-        self.policy_output.actions[self.lower_body_motor_idx] = loco_action[self.lower_body_motor_idx].copy()
-        self.policy_output.kps = self.kps.copy()
-        self.policy_output.kds = self.kds.copy()
+        self.policy_output.set_actions(loco_action[self.lower_body_motor_idx], self.lower_body_motor_idx)
+        self.policy_output.set_gains(self.kps, self.kds)
         
         ###########################################################
         if(self.state_cmd.skill_cmd == FSMCommand.SKILL_1):
@@ -109,24 +111,21 @@ class SkillCast(FSMState):
         
         
         self.cur_step += 1
-        self.alpha = min(self.cur_step / self.num_step, 1.0)
-        for j in range(self.upper_dof_size):
-            motor_idx = self.upper_body_motor_idx[j]
-            target_pos = self.upper_dof_target[j]
-            self.policy_output.actions[motor_idx] = self.upper_init_dof_pos[j] * (1 - self.alpha) + target_pos * self.alpha
+        self.upper_trajectory.set_target(self.upper_dof_target)
+        self.alpha = self.upper_trajectory.write(self.policy_output.actions, self.elapsed_time + self.control_dt)
         
     
     def exit(self):
         pass
     
     def checkChange(self):
-        if(self.cur_step >= self.num_step and self.state_cmd.skill_cmd == FSMCommand.SKILL_1):
+        if(self.alpha >= 1.0 and self.state_cmd.skill_cmd == FSMCommand.SKILL_1):
             self.state_cmd.skill_cmd = FSMCommand.INVALID
             return FSMStateName.SKILL_Dance
-        elif(self.cur_step >= self.num_step and self.state_cmd.skill_cmd == FSMCommand.SKILL_2):
+        elif(self.alpha >= 1.0 and self.state_cmd.skill_cmd == FSMCommand.SKILL_2):
             self.state_cmd.skill_cmd = FSMCommand.INVALID
             return FSMStateName.SKILL_KungFu
-        elif(self.cur_step >= self.num_step and self.state_cmd.skill_cmd == FSMCommand.SKILL_4):
+        elif(self.alpha >= 1.0 and self.state_cmd.skill_cmd == FSMCommand.SKILL_4):
             self.state_cmd.skill_cmd = FSMCommand.INVALID
             return FSMStateName.SKILL_KungFu2
         elif(self.state_cmd.skill_cmd == FSMCommand.PASSIVE):
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Send FSM and velocity commands to a controller running with command_ingress enabled
+
+    python send_command.py --cmd POS_RESET
+    python send_command.py --cmd LOCO
+    python send_command.py --vel 0.5 0 0 --duration 3
+"""
+
+import sys
+import argparse
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from common.command_ingress import CommandClient
+from common.utils import FSMCommand
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send commands to the command ingress")
+    parser.add_argument("--address", default="udp://127.0.0.1:9870", help="udp://host:port or unix:///path")
+    parser.add_argument("--cmd", choices=[c.name for c in FSMCommand if c != FSMCommand.INVALID],
+                        help="FSM command, sent with the first datagram")
+    parser.add_argument("--vel", type=float, nargs=3, default=[0., 0., 0.], metavar=("VX", "VY", "WZ"),
+                        help="velocity command in [-1, 1], scaled by the policy's cmd_range")
+    parser.add_argument("--duration", type=float, default=0., help="keep sending for this many seconds")
+    parser.add_argument("--rate", type=float, default=50., help="datagrams per second while sending")
+    args = parser.parse_args()
+
+    client = CommandClient(args.address)
+    command = FSMCommand[args.cmd] if args.cmd else None
+    client.send(args.vel, command)
+    end_time = time.perf_counter() + args.duration
+    while time.perf_counter() < end_time:
+        time.sleep(1.0 / args.rate)
+        client.send(args.vel)
+    if args.duration > 0:
+        client.send((0., 0., 0.))
+    client.close()
+    print(f"✅ sent {client.seq} datagrams to {args.address}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for runtime checkpoint switching of AccadMaleB13: only checkpoints with a
+known motion length are selectable, preloads are validated off the control thread and
+the motion length follows the active checkpoint
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from common.ctrlcomp import StateAndCmd, PolicyOutput
+from policy.accad_male_b13.AccadMaleB13 import AccadMaleB13
+from onnx import helper, TensorProto
+import numpy as np
+import onnx
+import os
+import shutil
+import tempfile
+
+NUM_JOINTS = 29
+
+
+def write_linear_model(path, num_obs, num_actions):
+    """Single MatMul onnx model, enough to stand in for a checkpoint of another size"""
+    weight = helper.make_tensor("weight", TensorProto.FLOAT, [num_obs, num_actions],
+                                np.zeros(num_obs * num_actions, dtype=np.float32))
+    graph = helper.make_graph([helper.make_node("MatMul", ["obs", "weight"], ["actions"])], "linear",
+                              [helper.make_tensor_value_info("obs", TensorProto.FLOAT, [1, num_obs])],
+                              [helper.make_tensor_value_info("actions", TensorProto.FLOAT, [1, num_actions])],
+                              [weight])
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, path)
+
+
+def switch(policy, checkpoint):
+    policy.select_checkpoint(checkpoint)
+    policy.preloader.thread.join()
+    policy.swap_pending_checkpoint()
+
+
+def test_checkpoint_switch():
+    print("🧪 Testing checkpoint switching...")
+    policy = AccadMaleB13(StateAndCmd(NUM_JOINTS), PolicyOutput(NUM_JOINTS))
+    model_dir = policy.model_dir
+    motion_lengths = dict(policy.motion_lengths)
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        listed = sorted(policy.motion_lengths)[:2]
+        unlisted = "unlisted.onnx"
+        for checkpoint in listed:
+            shutil.copy(os.path.join(model_dir, checkpoint), tmp_dir)
+        shutil.copy(os.path.join(model_dir, listed[0]), os.path.join(tmp_dir, unlisted))
+        write_linear_model(os.path.join(tmp_dir, "wrong_size.onnx"), policy.num_obs, policy.num_actions + 6)
+        policy.motion_lengths["wrong_size.onnx"] = 1.0
+        policy.model_dir = tmp_dir
+        policy.checkpoints = policy.find_checkpoints()
+        assert policy.checkpoints == sorted(listed + ["wrong_size.onnx"]), policy.checkpoints
+
+        checkpoint = policy.checkpoint
+        policy.select_checkpoint(unlisted)
+        assert policy.selected_checkpoint != unlisted and not policy.preloader.is_busy()
+        assert policy.checkpoint == checkpoint
+        print("✅ checkpoints without a motion_lengths entry cannot be selected")
+
+        switch(policy, "wrong_size.onnx")
+        assert policy.preloader.error is not None and policy.checkpoint != "wrong_size.onnx"
+        print(f"✅ rejected in the preloader: {policy.preloader.error}")
+
+        for checkpoint in listed:
+            switch(policy, checkpoint)
+            assert policy.checkpoint == checkpoint and policy.motion_length == policy.motion_lengths[checkpoint]
+        print("✅ motion length follows the checkpoint")
+    finally:
+        policy.model_dir = model_dir
+        policy.motion_lengths = motion_lengths
+        shutil.rmtree(tmp_dir)
+
+if __name__ == "__main__":
+    test_checkpoint_switch()
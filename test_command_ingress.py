@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for the datagram command ingress: commands and velocities over UDP and
+Unix sockets, sequence filtering, malformed datagrams, staleness timeout and poll cost
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from common.command_ingress import CommandIngress, CommandClient, encode_command
+from common.ctrlcomp import StateAndCmd
+from common.utils import FSMCommand
+import os
+import tempfile
+import time
+
+NUM_POLLS = 20000
+
+
+def wait_delivery():
+    time.sleep(0.01)
+
+
+def test_command_ingress():
+    print("🧪 Testing command ingress...")
+    state_cmd = StateAndCmd(29)
+    ingress = CommandIngress("udp://127.0.0.1:0", timeout=0.2)
+    address = "udp://127.0.0.1:%d" % ingress.sock.getsockname()[1]
+    client = CommandClient(address)
+
+    client.send((0.5, -0.2, 0.1), FSMCommand.LOCO)
+    wait_delivery()
+    assert ingress.poll(state_cmd)
+    assert state_cmd.skill_cmd == FSMCommand.LOCO
+    assert abs(state_cmd.vel_cmd[0] - 0.5) < 1e-6 and abs(state_cmd.vel_cmd[1] + 0.2) < 1e-6
+
+    # a repeated datagram and an older one are dropped, garbage is counted
+    state_cmd.skill_cmd = FSMCommand.INVALID
+    client.sock.sendto(encode_command(client.seq, (0.5, -0.2, 0.1), FSMCommand.LOCO), client.sock_address)
+    client.sock.sendto(encode_command(client.seq - 1, (0., 0., 0.), FSMCommand.PASSIVE), client.sock_address)
+    client.sock.sendto(b"garbage", client.sock_address)
+    wait_delivery()
+    ingress.poll(state_cmd)
+    assert state_cmd.skill_cmd == FSMCommand.INVALID and ingress.dropped_seq == 2 and ingress.malformed == 1
+    print("✅ commands applied once, old/duplicate and malformed datagrams dropped")
+
+    # the sequence number wraps around
+    ingress.last_seq = client.seq = (1 << 32) - 2
+    client.send((0.3, 0., 0.))
+    client.send((0.4, 0., 0.))
+    wait_delivery()
+    ingress.poll(state_cmd)
+    assert abs(state_cmd.vel_cmd[0] - 0.4) < 1e-6, "datagram after the wrap-around accepted"
+
+    # staleness: velocity zeroed once, then a restarted sender may begin at any sequence
+    time.sleep(0.25)
+    assert not ingress.poll(state_cmd)
+    assert not state_cmd.vel_cmd.any() and ingress.timeouts == 1
+    restarted = CommandClient(address)
+    restarted.send((0.1, 0., 0.), FSMCommand.POS_RESET)
+    wait_delivery()
+    assert ingress.poll(state_cmd) and state_cmd.skill_cmd == FSMCommand.POS_RESET
+    print("✅ sequence wrap-around, staleness timeout and sender restart")
+
+    start = time.perf_counter()
+    for _ in range(NUM_POLLS):
+        ingress.poll(state_cmd)
+    poll_time = (time.perf_counter() - start) / NUM_POLLS
+    print(f"📊 poll() without new datagrams: {poll_time * 1e6:.2f}us")
+    print(f"📊 {ingress.format_stats()}")
+    client.close()
+    restarted.close()
+    ingress.close()
+
+    path = os.path.join(tempfile.mkdtemp(), "robo_mimic_cmd.sock")
+    ingress = CommandIngress("unix://" + path)
+    client = CommandClient("unix://" + path)
+    client.send((0., 0., 0.), FSMCommand.SKILL_1)
+    wait_delivery()
+    ingress.poll(state_cmd)
+    assert state_cmd.skill_cmd == FSMCommand.SKILL_1
+    client.close()
+    ingress.close()
+    assert not os.path.exists(path)
+    print("✅ Unix datagram socket")
+
+
+if __name__ == "__main__":
+    test_command_ingress()
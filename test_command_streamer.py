@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for the command streamer: targets held before the second sample, linear
+and cubic interpolation one policy period behind, and the streaming thread
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from common.command_streamer import CommandStreamer
+import numpy as np
+import time
+
+NUM_JOINTS = 29
+POLICY_DT = 0.02
+STREAM_DT = 0.002
+
+
+def test_command_streamer():
+    print("🧪 Testing command streamer...")
+    streamer = CommandStreamer(NUM_JOINTS, POLICY_DT, STREAM_DT)
+    gains = np.full(NUM_JOINTS, 50., dtype=np.float32)
+    assert streamer.sample(0.) is None
+    streamer.push(np.full(NUM_JOINTS, 1.), gains, gains, now=0.)
+    q, kps, _ = streamer.sample(0.01)
+    assert np.all(q == 1.) and np.all(kps == 50.)
+    print("✅ first sample held")
+
+    streamer.push(np.full(NUM_JOINTS, 2.), gains, gains, now=POLICY_DT)
+    for offset, expected in ((0., 1.), (0.25 * POLICY_DT, 1.25), (POLICY_DT, 2.), (2 * POLICY_DT, 2.)):
+        q, _, _ = streamer.sample(POLICY_DT + offset)
+        assert np.allclose(q, expected), (offset, q[0])
+    print("✅ linear ramp from the previous to the newest sample over one policy period")
+
+    streamer = CommandStreamer(NUM_JOINTS, POLICY_DT, STREAM_DT, interp="cubic")
+    for i in range(3):
+        streamer.push(np.full(NUM_JOINTS, float(i * i)), gains, gains, now=i * POLICY_DT)
+    now = 2 * POLICY_DT
+    ends = [streamer.sample(now)[0][0], streamer.sample(now + POLICY_DT)[0][0]]
+    assert np.allclose(ends, [1., 4.]), ends
+    samples = [streamer.sample(now + t)[0][0] for t in np.linspace(0., POLICY_DT, 11)]
+    assert np.all(np.diff(samples) > 0), samples
+    streamer.reset()
+    assert streamer.sample(now) is None
+    print("✅ cubic interpolation passes through the samples, reset() forgets them")
+
+    try:
+        CommandStreamer(NUM_JOINTS, POLICY_DT, STREAM_DT, interp="spline")
+        assert False, "unknown interpolation accepted"
+    except ValueError:
+        pass
+
+    sent = []
+    streamer = CommandStreamer(NUM_JOINTS, POLICY_DT, STREAM_DT,
+                               send_fn=lambda q, kps, kds: sent.append(q[0]))
+    streamer.start()
+    time.sleep(0.05)
+    assert not sent, "nothing sent before the first push"
+    start = time.perf_counter()
+    streamer.push(np.zeros(NUM_JOINTS), gains, gains, now=start)
+    streamer.push(np.ones(NUM_JOINTS), gains, gains, now=start)
+    time.sleep(0.1)
+    streamer.stop()
+    assert len(sent) > 10 and 0. <= min(sent) and max(sent) <= 1. and sent[-1] == 1.
+    print(f"✅ streamed {len(sent)} targets: {streamer.format_stats()}")
+
+
+if __name__ == "__main__":
+    test_command_streamer()
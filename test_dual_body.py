@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for the DualBody composite: the worker threads exist before the first tick
+with the affinity of the thread that built the policy, and every tick merges the lower
+and upper body outputs of the two sub-policies
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from common.ctrlcomp import StateAndCmd, PolicyOutput
+from common.utils import FSMCommand, FSMStateName
+from FSM.FSM import FSM
+import numpy as np
+import os
+
+NUM_JOINTS = 29
+CONTROL_DT = 0.02
+
+
+def worker_affinities(executor):
+    futures = [executor.submit(os.sched_getaffinity, 0) for _ in range(8)]
+    return {frozenset(future.result()) for future in futures}
+
+
+def test_dual_body():
+    print("🧪 Testing DualBody...")
+    state_cmd = StateAndCmd(NUM_JOINTS)
+    fsm = FSM(state_cmd, PolicyOutput(NUM_JOINTS))
+    dual_body = fsm.dual_body_policy
+    assert len(dual_body.executor._threads) == 2, "workers are started with the policy"
+
+    # workers started after the building thread is re-pinned keep the old affinity
+    cores = os.sched_getaffinity(0)
+    if len(cores) > 1:
+        build_core = {min(cores)}
+        os.sched_setaffinity(0, build_core)
+        executor = dual_body.make_executor()
+        os.sched_setaffinity(0, cores)
+        assert worker_affinities(executor) == {frozenset(build_core)}
+        executor.shutdown()
+        print(f"✅ workers pre-spawned on core {min(cores)}")
+    else:
+        print("✅ workers pre-spawned (single core, affinity not checked)")
+
+    rng = np.random.default_rng(0)
+    tick = 0
+    for command, num_ticks in ((FSMCommand.POS_RESET, 5), (FSMCommand.LOCO, 5), (FSMCommand.SKILL_5, 20)):
+        state_cmd.skill_cmd = command
+        for _ in range(num_ticks):
+            tick += 1
+            q = rng.standard_normal(NUM_JOINTS).astype(np.float32) * 0.1
+            state_cmd.update(q=q, dq=q)
+            fsm.run(tick * CONTROL_DT)
+    assert fsm.cur_policy is dual_body
+    assert fsm.skill_cast_policy.policy_output is dual_body.lower_output
+    assert fsm.dance_policy.policy_output is dual_body.upper_output
+    output = fsm.policy_output
+    for idx, sub_output in ((dual_body.lower_body_motor_idx, dual_body.lower_output),
+                            (dual_body.upper_body_motor_idx, dual_body.upper_output)):
+        assert np.array_equal(output.actions[idx], sub_output.actions[idx])
+        assert np.array_equal(output.kps[idx], sub_output.kps[idx])
+    print(f"✅ outputs merged: lower {dual_body.lower_time * 1e3:.2f}ms, upper {dual_body.upper_time * 1e3:.2f}ms, "
+          f"total {dual_body.total_time * 1e3:.2f}ms")
+
+    state_cmd.skill_cmd = FSMCommand.PASSIVE
+    fsm.run((tick + 1) * CONTROL_DT)
+    assert fsm.cur_policy.name == FSMStateName.PASSIVE
+    assert fsm.dance_policy.policy_output is dual_body.upper_shared_output
+    print("✅ sub-policies write to the shared output again after exit")
+
+
+if __name__ == "__main__":
+    test_dual_body()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for FastCRC, checks it bit for bit against the SDK CRC on random LowCmd messages
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from unitree_sdk2py.idl.default import unitree_hg_msg_dds__LowCmd_
+from unitree_sdk2py.utils.crc import CRC
+from common.fast_crc import FastCRC, crc32_words
+import numpy as np
+import struct
+import time
+
+NUM_MESSAGES = 200
+NUM_TICKS = 2000
+
+
+def crc32_reference(words):
+    """Straight port of the SDK's pure Python crc32 loop"""
+    crc = 0xFFFFFFFF
+    polynomial = 0x04c11db7
+    for current in words:
+        bit = 1 << 31
+        for _ in range(32):
+            if crc & 0x80000000:
+                crc = ((crc << 1) & 0xFFFFFFFF) ^ polynomial
+            else:
+                crc = (crc << 1) & 0xFFFFFFFF
+            if current & bit:
+                crc ^= polynomial
+            bit >>= 1
+    return crc
+
+
+def random_low_cmd(rng):
+    cmd = unitree_hg_msg_dds__LowCmd_()
+    cmd.mode_pr = int(rng.integers(0, 2))
+    cmd.mode_machine = int(rng.integers(0, 256))
+    for motor_cmd in cmd.motor_cmd:
+        motor_cmd.mode = int(rng.integers(0, 2))
+        motor_cmd.q = float(rng.standard_normal())
+        motor_cmd.dq = float(rng.standard_normal())
+        motor_cmd.tau = float(rng.standard_normal())
+        motor_cmd.kp = float(rng.uniform(0, 200))
+        motor_cmd.kd = float(rng.uniform(0, 10))
+        motor_cmd.reserve = int(rng.integers(0, 2**32))
+    cmd.reserve = [int(v) for v in rng.integers(0, 2**32, 4)]
+    return cmd
+
+
+def test_fast_crc():
+    print("🧪 Testing FastCRC against the SDK CRC...")
+    rng = np.random.default_rng(0)
+    sdk_crc = CRC()
+    fast_crc = FastCRC(fallback=sdk_crc)
+
+    # raw word CRC against the reference loop
+    for _ in range(20):
+        data = rng.integers(0, 256, 1004, dtype=np.uint8).tobytes()
+        num_words = (len(data) >> 2) - 1
+        words = struct.unpack_from(f"<{num_words}I", data)
+        assert crc32_words(data, num_words) == crc32_reference(words)
+
+    # full LowCmd messages against the SDK
+    messages = [random_low_cmd(rng) for _ in range(NUM_MESSAGES)]
+    for cmd in messages:
+        assert fast_crc.Crc(cmd) == sdk_crc.Crc(cmd)
+    print(f"✅ {NUM_MESSAGES} random LowCmd messages match the SDK CRC")
+
+    cmd = messages[0]
+    start = time.perf_counter()
+    for _ in range(NUM_TICKS):
+        CRC().Crc(cmd)
+    sdk_time = (time.perf_counter() - start) / NUM_TICKS
+    start = time.perf_counter()
+    for _ in range(NUM_TICKS):
+        fast_crc.Crc(cmd)
+    fast_time = (time.perf_counter() - start) / NUM_TICKS
+    print(f"📊 CRC per LowCmd: SDK {sdk_time * 1e6:.1f}us, FastCRC {fast_time * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    test_fast_crc()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for the fixed state and output buffers: StateAndCmd is updated in place,
+policies only get read-only views, aliasing is reported, PolicyOutput is written in
+place with a gains version, and batch rows share the batch arrays
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from common.ctrlcomp import StateAndCmd, BatchStateAndCmd, PolicyOutput, BatchPolicyOutput
+from common.utils import FSMCommand
+from types import SimpleNamespace
+import numpy as np
+
+NUM_JOINTS = 29
+NUM_ROBOTS = 3
+
+
+def test_state_and_cmd():
+    print("🧪 Testing StateAndCmd buffers...")
+    state_cmd = StateAndCmd(NUM_JOINTS, debug_aliasing=True)
+    q_view = state_cmd.q
+    state_cmd.update(q=np.arange(NUM_JOINTS, dtype=np.float64), ang_vel=[1., 2., 3.])
+    assert state_cmd.q is q_view and q_view[3] == 3. and q_view.dtype == np.float32
+    assert np.all(state_cmd.gravity_ori == [0., 0., 1.]), "untouched fields keep their value"
+    state_cmd.dq = np.ones(NUM_JOINTS)
+    assert state_cmd.dq[0] == 1.
+    print("✅ update() and assignment copy into the same float32 buffers")
+
+    try:
+        state_cmd.q[0] = 5.
+        assert False, "policies can write the state"
+    except ValueError:
+        pass
+    try:
+        state_cmd.update(q=state_cmd.q)
+        assert False, "update from a view of its own buffer accepted"
+    except ValueError:
+        pass
+    policy = SimpleNamespace(obs=np.zeros(3), last_q=state_cmd.q, gyro=state_cmd.ang_vel[:2], safe=state_cmd.q.copy())
+    assert sorted(state_cmd.find_aliases(policy)) == ["gyro -> state_cmd.ang_vel", "last_q -> state_cmd.q"]
+    print("✅ views are read-only, aliases of the buffers are found")
+
+
+def test_batch_state_and_cmd():
+    print("🧪 Testing BatchStateAndCmd rows...")
+    batch = BatchStateAndCmd(NUM_ROBOTS, NUM_JOINTS)
+    q = np.arange(NUM_ROBOTS * NUM_JOINTS, dtype=np.float32).reshape(NUM_ROBOTS, NUM_JOINTS)
+    batch.update(q=q)
+    batch.vel_cmd[1] = [0.5, 0., 0.]
+    batch.set_skill_cmd(FSMCommand.SKILL_1, robots=[2])
+    for i, row in enumerate(batch.rows):
+        assert np.array_equal(row.q, q[i]) and np.shares_memory(row.q, batch.q)
+    assert batch.rows[1].vel_cmd[0] == 0.5 and batch.rows[2].skill_cmd == FSMCommand.SKILL_1 and batch.rows[0].skill_cmd == FSMCommand.INVALID
+    print("✅ one batch update() reaches every row")
+
+
+def test_policy_output():
+    print("🧪 Testing PolicyOutput buffers...")
+    output = PolicyOutput(NUM_JOINTS)
+    actions = output.actions
+    output.set_actions(np.ones(NUM_JOINTS))
+    output.set_actions([2., 3.], [4, 5])
+    output.actions = np.full(NUM_JOINTS, 4.)
+    output.actions[0] = 5.
+    assert output.actions is actions and actions[0] == 5. and actions[4] == 4. and actions.dtype == np.float32
+    print("✅ set_actions(), assignment and indexing write the same buffer")
+
+    assert output.set_gains(100., 2.) and output.gains_version == 1
+    assert not output.set_gains(np.full(NUM_JOINTS, 100.), 2.) and output.gains_version == 1
+    assert output.set_gains(50., 1., [0, 1]) and output.gains_version == 2
+    assert output.kps[0] == 50. and output.kps[2] == 100. and output.kds[1] == 1.
+
+    lower = PolicyOutput(NUM_JOINTS)
+    lower.set_actions(np.full(NUM_JOINTS, -1.))
+    lower.set_gains(200., 5.)
+    output.copy_from(lower, [0, 1, 2])
+    assert np.all(output.actions[:3] == -1.) and output.actions[3] == 4. and output.kps[2] == 200.
+    assert output.gains_version == 3
+    print("✅ gains only rewritten when they change, copy_from() takes a subset of motors")
+
+
+def test_batch_policy_output():
+    print("🧪 Testing BatchPolicyOutput rows...")
+    batch = BatchPolicyOutput(NUM_ROBOTS, NUM_JOINTS)
+    for i, row in enumerate(batch.rows):
+        row.set_actions(np.full(NUM_JOINTS, float(i)))
+        row.set_gains(float(i), 0.)
+    assert np.array_equal(batch.actions[:, 0], np.arange(NUM_ROBOTS)) and batch.kps[2, 0] == 2.
+    print("✅ rows write into the batch arrays")
+
+
+if __name__ == "__main__":
+    test_state_and_cmd()
+    test_batch_state_and_cmd()
+    test_policy_output()
+    test_batch_policy_output()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test script for the managed GC mode: automatic collection is off only while the robot
+is controlled, collections run in tick slack time, and the default mode changes nothing
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from common.gc_control import GCManager, GCMode
+import gc
+
+
+def test_gc_manager():
+    print("🧪 Testing GC manager...")
+    assert gc.isenabled()
+    manager = GCManager(GCMode.DEFAULT)
+    manager.freeze()
+    manager.set_active(True)
+    assert gc.isenabled() and gc.get_freeze_count() == 0
+    assert manager.collect_in_slack(1.0) == 0. and manager.collect_count == 0
+    print("✅ default mode leaves the collector alone")
+
+    manager = GCManager(GCMode.MANAGED, min_slack=0.005, gen1_interval=3)
+    try:
+        manager.freeze()
+        assert gc.get_freeze_count() > 0
+        assert manager.collect_in_slack(1.0) == 0., "no collection before the control loop runs"
+        manager.set_active(True)
+        assert not gc.isenabled()
+
+        manager.collect_in_slack(0.001)
+        assert manager.skipped_count == 1 and manager.last_generation == -1
+        generations = []
+        for _ in range(6):
+            manager.collect_in_slack(0.010)
+            generations.append(manager.last_generation)
+        assert generations == [0, 0, 1, 0, 0, 1], generations
+        assert manager.max_pause >= manager.last_pause > 0.
+        print(f"✅ slack collections: {manager.get_summary()}")
+
+        manager.set_active(False)
+        assert gc.isenabled()
+        print("✅ automatic collection back on outside the control loop")
+    finally:
+        gc.enable()
+        gc.unfreeze()
+
+
+if __name__ == "__main__":
+    test_gc_manager()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script for the inference server: actions match the in-process models, slots are
+served concurrently, model reloads and checkpoint switches stay in the server, and a
+server that stops answering falls back to the in-process models instead of raising in
+the control loop
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from common.ctrlcomp import StateAndCmd, PolicyOutput
+from common.inference_server import InferenceServer, InferenceServerError, RemoteOrtSession, RemoteTorchPolicy
+from common.model_watcher import ModelWatcher
+from common.utils import FSMCommand, FSMStateName
+from FSM.FSM import FSM
+import numpy as np
+import threading
+import time
+
+NUM_JOINTS = 29
+CONTROL_DT = 0.02
+NUM_CONCURRENT = 200
+
+
+def run_ticks(fsm, state_cmd, rng, tick, num_ticks):
+    for _ in range(num_ticks):
+        tick += 1
+        q = rng.standard_normal(NUM_JOINTS).astype(np.float32) * 0.1
+        state_cmd.update(q=q, dq=q)
+        fsm.run(tick * CONTROL_DT)
+    return tick
+
+
+def test_inference_server():
+    print("🧪 Testing inference server...")
+    state_cmd = StateAndCmd(NUM_JOINTS)
+    policy_output = PolicyOutput(NUM_JOINTS)
+    fsm = FSM(state_cmd, policy_output)
+    server = InferenceServer(timeout=0.5)
+    server.attach(fsm)
+    server.start()
+    try:
+        loco = fsm.loco_policy
+        assert isinstance(loco.policy, RemoteTorchPolicy)
+
+        # a stateless onnx policy gives the same action through the server and in-process
+        dance = fsm.dance_policy
+        assert isinstance(dance.ort_session, RemoteOrtSession)
+        obs = np.random.default_rng(0).standard_normal((1, dance.num_obs)).astype(np.float32)
+        remote_action = dance.ort_session.run(None, {dance.input_name: obs})[0]
+        local_session = dance.ort_session.local
+        local_action = local_session.run(None, {dance.input_name: obs})[0]
+        assert np.abs(remote_action - local_action).max() < 1e-5
+        print(f"✅ served {len(server.specs)} models, round trip {server.last_roundtrip * 1e6:.0f}us")
+
+        # every slot has its own buffers and doorbell: a request in flight does not hold up
+        # another slot, as for the two sub-policies of DualBody
+        kick = fsm.kick_policy
+        kick_obs = np.random.default_rng(1).standard_normal((1, kick.num_obs)).astype(np.float32)
+        kick_action = kick.ort_session.local.run(None, {kick.input_name: kick_obs})[0]
+        with server.locks[dance.ort_session.slot]:
+            assert np.abs(kick.ort_session.run(None, {kick.input_name: kick_obs})[0] - kick_action).max() < 1e-5
+        errors = []
+
+        def hammer(policy, policy_obs, expected):
+            for _ in range(NUM_CONCURRENT):
+                action = policy.ort_session.run(None, {policy.input_name: policy_obs})[0]
+                if np.abs(action - expected).max() > 1e-5:
+                    errors.append(policy.name_str)
+
+        threads = [threading.Thread(target=hammer, args=(dance, obs, local_action)),
+                   threading.Thread(target=hammer, args=(kick, kick_obs, kick_action))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors and server.available, errors[:3]
+        print(f"✅ {NUM_CONCURRENT} concurrent requests on two slots, each slot answered on its own")
+
+        # a model reload from the watcher is built in the server, the proxy stays
+        watcher = ModelWatcher(fsm)
+        proxy = dance.ort_session
+        watcher._rebuild(next(model for model in watcher.models if model.policy is dance))
+        variant = watcher.pending[dance][2]
+        assert variant is not None and server.variant_buf[proxy.slot] == 0
+        watcher.apply_pending(fsm.loco_policy)
+        assert dance.ort_session is proxy and proxy.local is not local_session
+        assert server.variant_buf[proxy.slot] == variant
+        remote_action = dance.ort_session.run(None, {dance.input_name: obs})[0]
+        assert np.abs(remote_action - local_action).max() < 1e-5
+        assert not server.activate(proxy.slot, variant - 1), "older variants are refused"
+        try:
+            server.stage(proxy.slot, fsm.loco_policy.policy_path)
+            assert False, "a torch file is not an onnx model"
+        except InferenceServerError:
+            pass
+        print("✅ watcher reloads are built and served by the server")
+
+        # checkpoint switches as well
+        accad = fsm.accad_male_b13
+        proxy = accad.ort_session
+        other = next(checkpoint for checkpoint in accad.checkpoints if checkpoint != accad.checkpoint)
+        accad.select_checkpoint(other)
+        accad.preloader.thread.join()
+        accad.swap_pending_checkpoint()
+        assert accad.checkpoint == other and accad.ort_session is proxy
+        assert server.variant_buf[proxy.slot] > variant
+        print(f"✅ checkpoint switch to {other} served by the server")
+
+        rng = np.random.default_rng(1)
+        tick = 0
+        state_cmd.skill_cmd = FSMCommand.POS_RESET
+        tick = run_ticks(fsm, state_cmd, rng, tick, 5)
+        state_cmd.skill_cmd = FSMCommand.LOCO
+        tick = run_ticks(fsm, state_cmd, rng, tick, 5)
+        assert fsm.cur_policy.name == FSMStateName.LOCOMODE and server.available
+
+        # the server dies while the robot walks
+        server.process.terminate()
+        server.process.join()
+        start = time.perf_counter()
+        tick = run_ticks(fsm, state_cmd, rng, tick, 10)
+        fallback_time = time.perf_counter() - start
+        assert not server.available
+        assert fsm.cur_policy.name == FSMStateName.LOCOMODE
+        assert np.isfinite(policy_output.actions).all()
+        # one timeout, the following ticks run in-process
+        assert fallback_time < server.timeout + 0.5, fallback_time
+        print(f"✅ dead server: one {server.timeout}s timeout, then in-process inference ({fallback_time:.2f}s for 10 ticks)")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_inference_server()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for the input thread, drives it with a scripted device instead of
+pygame and checks edges, debouncing, axis values and the read cost on the control side
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from common.input_thread import InputThread
+from enum import IntEnum
+import threading
+import time
+
+NUM_READS = 100000
+
+
+class KeyboardButton(IntEnum):
+    """Subset of common.joystick.KeyboardButton, which needs pygame"""
+    A = 0
+    B = 1
+    R1 = 5
+
+
+class ScriptedDevice:
+    """Same attributes as common.joystick.Keyboard, states are set by the test"""
+    def __init__(self):
+        self.button_count = 15
+        self.button_states = [False] * self.button_count
+        self.axis_count = 4
+        self.axis_states = [0.0] * self.axis_count
+        self.updates = 0
+        self.event = threading.Event()
+
+    def wait_event(self, timeout):
+        self.event.wait(timeout)
+        self.event.clear()
+
+    def update(self):
+        self.updates += 1
+
+    def set(self, button, state):
+        self.button_states[button] = state
+        self.event.set()
+
+
+def settle(seconds=0.05):
+    time.sleep(seconds)
+
+
+def test_input_thread():
+    print("🧪 Testing input thread...")
+    device = ScriptedDevice()
+    inputs = InputThread(lambda: (device, KeyboardButton), poll_rate=500., debounce=0.01).start()
+    assert inputs.button_enum is KeyboardButton
+
+    # R1 held, A tapped between two control ticks
+    device.set(KeyboardButton.R1, True)
+    settle()
+    device.set(KeyboardButton.A, True)
+    settle()
+    device.set(KeyboardButton.A, False)
+    device.axis_states[1] = -1.0
+    settle()
+    inputs.update()
+    assert inputs.is_button_pressed(KeyboardButton.R1) and not inputs.is_button_pressed(KeyboardButton.A)
+    assert inputs.is_button_down(KeyboardButton.A) and inputs.is_button_released(KeyboardButton.A)
+    assert inputs.get_axis_value(1) == -1.0
+    inputs.update()
+    assert not inputs.is_button_released(KeyboardButton.A), "edges are reported once"
+    print("✅ held buttons, latched edges and axes")
+
+    # A double-tapped while the control loop stalls
+    for _ in range(2):
+        device.set(KeyboardButton.A, True)
+        settle()
+        device.set(KeyboardButton.A, False)
+        settle()
+    inputs.update()
+    assert inputs.is_button_down(KeyboardButton.A) and inputs.is_button_released(KeyboardButton.A)
+    assert not inputs.is_button_pressed(KeyboardButton.A)
+    inputs.update()
+    assert not inputs.is_button_down(KeyboardButton.A)
+    print("✅ two taps between two control reads are reported, not cancelled")
+
+    # a 3ms dropout is shorter than the debounce time and not a release
+    device.set(KeyboardButton.B, True)
+    settle()
+    inputs.update()
+    device.set(KeyboardButton.B, False)
+    time.sleep(0.003)
+    device.set(KeyboardButton.B, True)
+    settle()
+    inputs.update()
+    assert not inputs.is_button_released(KeyboardButton.B) and inputs.is_button_pressed(KeyboardButton.B)
+    print("✅ bounces shorter than the debounce time are filtered")
+
+    start = time.perf_counter()
+    for _ in range(NUM_READS):
+        inputs.update()
+        inputs.is_button_released(KeyboardButton.A)
+    read_time = (time.perf_counter() - start) / NUM_READS
+    inputs.stop()
+    print(f"📊 control side update() + query: {read_time * 1e6:.2f}us, device polls {device.updates}")
+    print(f"📊 {inputs.format_stats()}")
+
+
+if __name__ == "__main__":
+    test_input_thread()
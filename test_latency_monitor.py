@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script for the LowState latency measurements: state age and state-to-publish
+latency per tick, stale ticks without a new LowState, and tick gaps on the receive side
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from common.latency_monitor import StateLatencyMonitor
+from common.state_buffer import LowStateBuffer, LowStateSnapshot
+from types import SimpleNamespace
+import time
+
+NUM_JOINTS = 29
+
+
+def make_msg(tick):
+    motor = SimpleNamespace(q=0., dq=0., tau_est=0.)
+    return SimpleNamespace(motor_state=[motor] * NUM_JOINTS, tick=tick,
+                           imu_state=SimpleNamespace(quaternion=[1., 0., 0., 0.], gyroscope=[0.] * 3),
+                           mode_machine=0)
+
+
+def test_tick_continuity():
+    print("🧪 Testing LowState tick continuity...")
+    buffer = LowStateBuffer(NUM_JOINTS)
+    for tick in (2, 4, 6, 12, 12, 14):
+        buffer.write(make_msg(tick))
+    assert buffer.tick_step == 2 and buffer.tick_missed == 2 and buffer.tick_duplicates == 1
+    print("✅ 2 missed and 1 duplicated LowState ticks detected")
+
+
+def test_latency_monitor():
+    print("🧪 Testing latency monitor...")
+    buffer = LowStateBuffer(NUM_JOINTS)
+    snapshot = LowStateSnapshot(NUM_JOINTS)
+    monitor = StateLatencyMonitor(stats_window=4)
+    tick = 0
+
+    def control_tick(num_msgs):
+        nonlocal tick
+        for _ in range(num_msgs):
+            tick += 1
+            buffer.write(make_msg(tick))
+        time.sleep(0.001)
+        buffer.read_into(snapshot)
+        policy_start = time.perf_counter()
+        time.sleep(0.001)
+        return monitor.update(snapshot, policy_start, time.perf_counter())
+
+    state_age, latency, new_msgs = control_tick(1)
+    assert new_msgs == 1 and 0.001 <= state_age < latency and latency >= state_age + 0.001
+    assert control_tick(3)[2] == 3
+    assert control_tick(0)[2] == 0 and monitor.stale_ticks == 1
+    for _ in range(5):
+        control_tick(1)
+    stats = monitor.get_stats()
+    assert monitor.stats_count == 4 and stats["state_age_max"] >= stats["state_age_mean"] >= 0.001
+    assert stats["latency_mean"] > stats["state_age_mean"] and stats["stale_ticks"] == 1
+    print(f"✅ {monitor.format_stats(buffer)}")
+
+
+if __name__ == "__main__":
+    test_tick_continuity()
+    test_latency_monitor()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script for the LowState/LowCmd codec, checks it against the per-joint loops
+used before and compares the per-tick cost
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from unitree_sdk2py.idl.default import unitree_hg_msg_dds__LowCmd_, unitree_hg_msg_dds__LowState_
+from common.lowcmd_codec import LowStateDecoder, LowCmdEncoder
+import numpy as np
+import time
+
+NUM_JOINTS = 29
+NUM_TICKS = 5000
+
+
+def build_cmd_loop(cmd, q, kps, kds):
+    for i in range(NUM_JOINTS):
+        cmd.motor_cmd[i].q = q[i]
+        cmd.motor_cmd[i].qd = 0
+        cmd.motor_cmd[i].kp = kps[i]
+        cmd.motor_cmd[i].kd = kds[i]
+        cmd.motor_cmd[i].tau = 0
+
+
+def read_state_loop(msg, q, dq):
+    for i in range(NUM_JOINTS):
+        q[i] = msg.motor_state[i].q
+        dq[i] = msg.motor_state[i].dq
+
+
+def test_lowcmd_codec():
+    """Check the codec output and time it against the loops"""
+    print("🧪 Testing LowState/LowCmd codec...")
+    rng = np.random.default_rng(0)
+    q = rng.standard_normal(NUM_JOINTS).astype(np.float32)
+    kps = rng.uniform(10, 100, NUM_JOINTS).astype(np.float32)
+    kds = rng.uniform(1, 5, NUM_JOINTS).astype(np.float32)
+
+    # encoder writes the same values as the loop
+    ref_cmd = unitree_hg_msg_dds__LowCmd_()
+    build_cmd_loop(ref_cmd, q, kps, kds)
+    cmd = unitree_hg_msg_dds__LowCmd_()
+    encoder = LowCmdEncoder(cmd, NUM_JOINTS)
+    encoder.encode(q, kps, kds)
+    for i in range(NUM_JOINTS):
+        assert np.isclose(cmd.motor_cmd[i].q, ref_cmd.motor_cmd[i].q)
+        assert np.isclose(cmd.motor_cmd[i].kp, ref_cmd.motor_cmd[i].kp)
+        assert np.isclose(cmd.motor_cmd[i].kd, ref_cmd.motor_cmd[i].kd)
+        assert cmd.motor_cmd[i].dq == 0. and cmd.motor_cmd[i].tau == 0.
+
+    # gains changed after invalidate() are picked up
+    cmd.motor_cmd[0].kp = 0.
+    encoder.invalidate()
+    encoder.encode(q, kps, kds)
+    assert np.isclose(cmd.motor_cmd[0].kp, kps[0])
+
+    # decoder reads the same values as the loop
+    msg = unitree_hg_msg_dds__LowState_()
+    for i in range(NUM_JOINTS):
+        msg.motor_state[i].q = float(q[i])
+        msg.motor_state[i].dq = float(kds[i])
+    ref_q = np.zeros(NUM_JOINTS, dtype=np.float32)
+    ref_dq = np.zeros(NUM_JOINTS, dtype=np.float32)
+    read_state_loop(msg, ref_q, ref_dq)
+    out_q = np.zeros(NUM_JOINTS, dtype=np.float32)
+    out_dq = np.zeros(NUM_JOINTS, dtype=np.float32)
+    LowStateDecoder(NUM_JOINTS).decode(msg, out_q, out_dq)
+    assert np.array_equal(out_q, ref_q) and np.array_equal(out_dq, ref_dq)
+    print("✅ Codec output matches the per-joint loops")
+
+    # per-tick cost, targets change every tick and gains stay fixed as in a running policy
+    targets = rng.standard_normal((NUM_TICKS, NUM_JOINTS)).astype(np.float32)
+    start = time.perf_counter()
+    for target in targets:
+        build_cmd_loop(ref_cmd, target, kps, kds)
+    loop_cmd_time = (time.perf_counter() - start) / NUM_TICKS
+    start = time.perf_counter()
+    for target in targets:
+        encoder.encode(target, kps, kds)
+    codec_cmd_time = (time.perf_counter() - start) / NUM_TICKS
+
+    start = time.perf_counter()
+    for _ in range(NUM_TICKS):
+        read_state_loop(msg, ref_q, ref_dq)
+    loop_state_time = (time.perf_counter() - start) / NUM_TICKS
+    decoder = LowStateDecoder(NUM_JOINTS)
+    start = time.perf_counter()
+    for _ in range(NUM_TICKS):
+        decoder.decode(msg, out_q, out_dq)
+    codec_state_time = (time.perf_counter() - start) / NUM_TICKS
+
+    print(f"📊 LowCmd build:   loop {loop_cmd_time * 1e6:.1f}us, codec {codec_cmd_time * 1e6:.1f}us per tick")
+    print(f"📊 LowState read:  loop {loop_state_time * 1e6:.1f}us, codec {codec_state_time * 1e6:.1f}us per tick")
+
+
+if __name__ == "__main__":
+    test_lowcmd_codec()
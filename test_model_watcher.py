@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script for the model watcher: rebuilt models are validated, rejected files
+never reach a policy, and swaps wait while the policy or a composite using it runs
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from common.ctrlcomp import StateAndCmd, PolicyOutput
+from common.model_watcher import ModelWatcher, WatchedModel
+from FSM.FSM import FSM
+import os
+import shutil
+import tempfile
+import time
+
+NUM_JOINTS = 29
+
+
+def test_model_watcher():
+    print("🧪 Testing model watcher...")
+    fsm = FSM(StateAndCmd(NUM_JOINTS), PolicyOutput(NUM_JOINTS))
+    watcher = ModelWatcher(fsm)
+    models = {model.policy: model for model in watcher.models}
+    dance = fsm.dance_policy
+    skill_cast = fsm.skill_cast_policy
+    dance_session = dance.ort_session
+    skill_cast_module = skill_cast.policy
+
+    # rebuild both sub-policies of DualBody from their unchanged files
+    watcher._rebuild(models[dance])
+    watcher._rebuild(models[skill_cast])
+    assert set(watcher.pending) == {dance, skill_cast}
+
+    watcher.apply_pending(fsm.dual_body_policy)
+    assert dance.ort_session is dance_session and skill_cast.policy is skill_cast_module
+    watcher.apply_pending(dance)
+    assert dance.ort_session is dance_session and skill_cast.policy is not skill_cast_module
+    watcher.apply_pending(fsm.loco_policy)
+    assert dance.ort_session is not dance_session and not watcher.has_pending
+    print("✅ swaps wait while the policy or the composite running it is active")
+
+    # a truncated file is rejected by the watcher thread and never staged
+    tmp_dir = tempfile.mkdtemp()
+    broken_path = os.path.join(tmp_dir, "broken.onnx")
+    with open(dance.onnx_path, "rb") as f:
+        data = f.read()
+    with open(broken_path, "wb") as f:
+        f.write(data[:len(data) // 2])
+    saved_path = dance.onnx_path
+    dance.onnx_path = broken_path
+    watcher._rebuild(WatchedModel(dance, "onnx", "onnx_path"))
+    dance.onnx_path = saved_path
+    assert dance not in watcher.pending
+    print("✅ broken model files are rejected")
+
+    # file changes are picked up once the file stopped changing
+    watched_path = os.path.join(tmp_dir, "dance.onnx")
+    shutil.copy(saved_path, watched_path)
+    dance.onnx_path = watched_path
+    watcher = ModelWatcher(fsm, poll_interval=0.05)
+    watcher.start()
+    time.sleep(0.2)
+    os.utime(watched_path, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+    deadline = time.perf_counter() + 20.0
+    while dance not in watcher.pending and time.perf_counter() < deadline:
+        time.sleep(0.05)
+    watcher.stop()
+    dance.onnx_path = saved_path
+    shutil.rmtree(tmp_dir)
+    assert dance in watcher.pending, "changed model was not rebuilt"
+    print("✅ changed model file rebuilt and staged")
+
+
+if __name__ == "__main__":
+    test_model_watcher()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for multi-rate policies in the FSM: inference every control_dt with the
+output held or interpolated in between, and control_dt shorter than the loop period
+reported at startup
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from common.ctrlcomp import StateAndCmd, PolicyOutput
+from common.utils import FSMCommand, FSMStateName
+from FSM.FSM import FSM
+import numpy as np
+
+NUM_JOINTS = 29
+LOOP_DT = 0.02
+START_TICK = 5
+
+
+def run_loco(fsm, state_cmd, num_ticks, start_tick=0):
+    """Returns the ticks with inference and the actions of every tick, both while in LOCOMODE"""
+    rng = np.random.default_rng(0)
+    inferred = []
+    actions = {}
+    for tick in range(start_tick, start_tick + num_ticks):
+        q = rng.standard_normal(NUM_JOINTS).astype(np.float32) * 0.1
+        state_cmd.update(q=q, dq=q)
+        in_loco = fsm.cur_policy.name == FSMStateName.LOCOMODE
+        fsm.run(tick * LOOP_DT)
+        if in_loco:
+            if fsm.last_tick_inferred:
+                inferred.append(tick)
+            actions[tick] = fsm.policy_output.actions.copy()
+    return inferred, actions
+
+
+def make_fsm():
+    """FSM on its way to LOCOMODE, ticks from 0 to START_TICK are used by FIXEDPOSE"""
+    state_cmd = StateAndCmd(NUM_JOINTS)
+    fsm = FSM(state_cmd, PolicyOutput(NUM_JOINTS))
+    state_cmd.skill_cmd = FSMCommand.POS_RESET
+    run_loco(fsm, state_cmd, START_TICK)
+    state_cmd.skill_cmd = FSMCommand.LOCO
+    return fsm, state_cmd
+
+
+def test_loop_period_check():
+    print("🧪 Testing control_dt against the loop period...")
+    fsm, _ = make_fsm()
+    assert fsm.check_loop_period(LOOP_DT) == []
+    assert fsm.check_loop_period(0.021) == [], "mujoco decimation rounding is accepted"
+    fsm.loco_policy.control_dt = 0.01
+    assert fsm.check_loop_period(LOOP_DT) == [fsm.loco_policy]
+    print("✅ policies faster than the loop are reported")
+
+
+def test_multi_rate():
+    print("🧪 Testing multi-rate inference...")
+    fsm, state_cmd = make_fsm()
+    fsm.loco_policy.control_dt = 2 * LOOP_DT
+    inferred, actions = run_loco(fsm, state_cmd, 21, START_TICK)
+    assert len(inferred) > 5 and np.all(np.diff(inferred) == 2), inferred
+    # held between inference ticks
+    for tick in inferred[:-1]:
+        assert np.array_equal(actions[tick + 1], actions[tick])
+    print(f"✅ control_dt {2 * LOOP_DT}s: inference on every other tick, output held")
+
+    fsm, state_cmd = make_fsm()
+    fsm.loco_policy.control_dt = 2 * LOOP_DT
+    fsm.loco_policy.output_mode = "interpolate"
+    inferred, actions = run_loco(fsm, state_cmd, 21, START_TICK)
+    assert len(inferred) > 5 and np.all(np.diff(inferred) == 2), inferred
+    # halfway from the previous output to the new target on the inference tick, there on the next one
+    for tick in inferred[1:-1]:
+        midway = 0.5 * (actions[tick - 1] + actions[tick + 1])
+        assert np.abs(actions[tick] - midway).max() < 1e-5
+    print(f"✅ control_dt {2 * LOOP_DT}s interpolated: halfway to the new target on inference ticks")
+
+    fsm, state_cmd = make_fsm()
+    fsm.loco_policy.control_dt = LOOP_DT / 2
+    inferred, _ = run_loco(fsm, state_cmd, 21, START_TICK)
+    assert len(inferred) > 10 and np.all(np.diff(inferred) == 1), inferred
+    print(f"✅ control_dt {LOOP_DT / 2}s: one inference per tick, the loop rate")
+
+
+if __name__ == "__main__":
+    test_loop_period_check()
+    test_multi_rate()
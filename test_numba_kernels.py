@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-tick numeric kernels, checks the Numba and NumPy versions
+against the expressions they replace and times all three per kernel
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from common import numba_kernels
+import numpy as np
+import time
+
+NUM_CALLS = 20000
+
+
+def timed(fn, num_calls=NUM_CALLS):
+    start = time.perf_counter()
+    for _ in range(num_calls):
+        fn()
+    return (time.perf_counter() - start) / num_calls
+
+
+def previous_scale_values(values, target_ranges):
+    """The previous utils.scale_values"""
+    scaled = []
+    for val, (new_min, new_max) in zip(values, target_ranges):
+        scaled.append((val + 1) * (new_max - new_min) / 2 + new_min)
+    return np.array(scaled)
+
+
+def make_cases(rng):
+    """name -> (kernel args, output index in args, previous expression)"""
+    quat = rng.standard_normal(4)
+    quat /= np.linalg.norm(quat)
+    cmd = rng.uniform(-1, 1, 3).astype(np.float32)
+    ranges = np.array([[-0.5, 1.0], [-0.3, 0.3], [-1.0, 1.0]], dtype=np.float32)
+    q = rng.standard_normal(29).astype(np.float32)
+    idx = rng.permutation(29)[:15].astype(np.int32)
+    offset = rng.standard_normal(15).astype(np.float32)
+    start, delta = rng.standard_normal((2, 15)).astype(np.float32)
+    history = rng.standard_normal(23 * 4).astype(np.float32)
+    w, x, y, z = quat
+    return {
+        "projected_gravity": ((quat, np.zeros(3)), 1,
+                              lambda: np.array([2 * (-z * x + w * y), -2 * (z * y + w * x), 1 - 2 * (w * w + z * z)])),
+        "scale_values": ((cmd, ranges, np.zeros(3, dtype=np.float32)), 2,
+                         lambda: previous_scale_values(cmd, ranges)),
+        "gather_scale": ((q, idx, 0.05, np.zeros(15, dtype=np.float32)), 3,
+                         lambda: q[idx] * 0.05),
+        "gather_offset_scale": ((q, idx, offset, 0.5, np.zeros(15, dtype=np.float32)), 4,
+                                lambda: (q[idx] - offset) * 0.5),
+        "blend_scatter": ((start, delta, 0.3, idx, q.copy()), 4,
+                          lambda: _scatter(q, idx, start + delta * 0.3)),
+        "push_history": ((history.copy(), q[:23]), 0,
+                         lambda: np.concatenate((q[:23], history[:-23]), axis=-1, dtype=np.float32)),
+    }
+
+
+def _scatter(q, idx, values):
+    out = q.copy()
+    out[idx] = values
+    return out
+
+
+def test_numba_kernels():
+    print(f"🧪 Testing numeric kernels, backend: {numba_kernels.BACKEND}")
+    print(f"⏱️  warm-up (compile or load from cache): {numba_kernels.warmup() * 1000:.1f}ms")
+    rng = np.random.default_rng(0)
+    cases = make_cases(rng)
+
+    for name, (args, out_index, previous) in cases.items():
+        loop_fn, numpy_fn = numba_kernels.KERNELS[name]
+        kernel = getattr(numba_kernels, name)
+        expected = previous()
+        for label, fn in (("kernel", kernel), ("numpy", numpy_fn), ("python loop", loop_fn)):
+            call_args = tuple(a.copy() if isinstance(a, np.ndarray) else a for a in args)
+            fn(*call_args)
+            assert np.allclose(call_args[out_index], expected, atol=1e-6), f"{name} ({label}) mismatch"
+    print(f"✅ {len(cases)} kernels match the previous expressions")
+
+    for name, (args, out_index, previous) in cases.items():
+        kernel = getattr(numba_kernels, name)
+        numpy_fn = numba_kernels.KERNELS[name][1]
+        previous_time = timed(previous)
+        numpy_time = timed(lambda: numpy_fn(*args))
+        kernel_time = timed(lambda: kernel(*args))
+        print(f"📊 {name:<20} previous {previous_time * 1e6:5.2f}us, numpy {numpy_time * 1e6:5.2f}us, "
+              f"{numba_kernels.BACKEND} {kernel_time * 1e6:5.2f}us")
+
+
+if __name__ == "__main__":
+    test_numba_kernels()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the wireless remote decoder, checks it against the previous
+per-button decoding, checks that edges between two polls are latched and
+compares the per-message cost
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from common.remote_controller import RemoteController, RemoteButton
+import numpy as np
+import struct
+import time
+
+NUM_MESSAGES = 20000
+
+
+def previous_set(data):
+    """The previous RemoteController.set decoding"""
+    keys = struct.unpack("H", data[2:4])[0]
+    button = [(keys & (1 << i)) >> i for i in range(16)]
+    lx = struct.unpack("f", data[4:8])[0]
+    rx = struct.unpack("f", data[8:12])[0]
+    ry = struct.unpack("f", data[12:16])[0]
+    ly = struct.unpack("f", data[20:24])[0]
+    return button, lx, rx, ry, ly
+
+
+def make_message(keys, lx=0., rx=0., ry=0., ly=0.):
+    data = bytearray(40)
+    struct.pack_into("<H", data, 2, keys)
+    struct.pack_into("<fff", data, 4, lx, rx, ry)
+    struct.pack_into("<f", data, 20, ly)
+    return bytes(data)
+
+
+def mask(*buttons):
+    return sum(1 << button for button in buttons)
+
+
+def test_remote_controller():
+    print("🧪 Testing wireless remote decoder...")
+    rng = np.random.default_rng(0)
+    remote = RemoteController()
+    for _ in range(500):
+        keys = int(rng.integers(0, 1 << 16))
+        lx, rx, ry, ly = rng.uniform(-1, 1, 4).astype(np.float32).tolist()
+        data = make_message(keys, lx, rx, ry, ly)
+        remote.set(data)
+        remote.update()
+        button, *axes = previous_set(data)
+        assert remote.button.tolist() == button
+        assert (remote.lx, remote.rx, remote.ry, remote.ly) == tuple(axes)
+    # the DDS sequence arrives as a list of ints
+    remote.set(list(make_message(mask(RemoteButton.A))))
+    remote.update()
+    assert remote.is_button_pressed(RemoteButton.A)
+    print("✅ 500 random messages match the previous decoding")
+
+    # R1 held, A tapped between two polls: the release edge must survive to the next update
+    remote = RemoteController()
+    remote.set(make_message(mask(RemoteButton.R1)))
+    remote.update()
+    remote.set(make_message(mask(RemoteButton.R1, RemoteButton.A)))
+    remote.set(make_message(mask(RemoteButton.R1)))
+    remote.set(make_message(mask(RemoteButton.R1)))
+    remote.update()
+    assert remote.is_button_down(RemoteButton.A) and remote.is_button_released(RemoteButton.A)
+    assert remote.is_button_pressed(RemoteButton.R1) and not remote.is_button_pressed(RemoteButton.A)
+    remote.update()
+    assert not remote.is_button_released(RemoteButton.A), "edges are reported once"
+    assert remote.is_button_released(RemoteButton.L3) == remote.is_button_released(RemoteButton.F1)
+    print("✅ press/release edges between two polls are latched")
+
+    data = make_message(0x1234, 0.1, 0.2, 0.3, 0.4)
+    start = time.perf_counter()
+    for _ in range(NUM_MESSAGES):
+        previous_set(data)
+    previous_time = (time.perf_counter() - start) / NUM_MESSAGES
+    start = time.perf_counter()
+    for _ in range(NUM_MESSAGES):
+        remote.set(data)
+    set_time = (time.perf_counter() - start) / NUM_MESSAGES
+    start = time.perf_counter()
+    for _ in range(NUM_MESSAGES):
+        remote.update()
+    update_time = (time.perf_counter() - start) / NUM_MESSAGES
+    print(f"📊 per message: previous {previous_time * 1e6:.2f}us, set() {set_time * 1e6:.2f}us")
+    print(f"📊 per poll:    update() {update_time * 1e6:.2f}us")
+
+
+if __name__ == "__main__":
+    test_remote_controller()
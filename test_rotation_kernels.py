@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script for the closed-form rotation kernels, checks them against scipy and
+compares the per-call cost with the scipy path they replace
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from scipy.spatial.transform import Rotation as R
+from common.rotation_kernels import (projected_gravity, quat_to_matrix, matrix_to_quat, transform_imu,
+                                     projected_gravity_batch, quat_to_matrix_batch, roll_pitch_from_gravity_batch)
+import numpy as np
+import time
+
+NUM_SAMPLES = 500
+NUM_CALLS = 20000
+BATCH_SIZE = 4096
+
+
+def scipy_transform_imu(waist_yaw, waist_yaw_omega, imu_quat, imu_omega):
+    """The previous rotation_helper.transform_imu_data"""
+    RzWaist = R.from_euler("z", waist_yaw).as_matrix()
+    R_torso = R.from_quat([imu_quat[1], imu_quat[2], imu_quat[3], imu_quat[0]]).as_matrix()
+    R_pelvis = np.dot(R_torso, RzWaist.T)
+    w = np.dot(RzWaist, imu_omega) - np.array([0, 0, waist_yaw_omega])
+    return R.from_matrix(R_pelvis).as_quat()[[3, 0, 1, 2]], w
+
+
+def timed(fn, num_calls=NUM_CALLS):
+    start = time.perf_counter()
+    for _ in range(num_calls):
+        fn()
+    return (time.perf_counter() - start) / num_calls
+
+
+def test_rotation_kernels():
+    print("🧪 Testing rotation kernels against scipy...")
+    rng = np.random.default_rng(0)
+    quats = rng.standard_normal((NUM_SAMPLES, 4))
+    quats /= np.linalg.norm(quats, axis=1, keepdims=True)
+    scipy_rot = R.from_quat(quats[:, [1, 2, 3, 0]])
+
+    matrix = np.zeros((3, 3))
+    quat_out = np.zeros(4)
+    omega_out = np.zeros(3)
+    for i, quat in enumerate(quats):
+        ref_matrix = scipy_rot[i].as_matrix()
+        assert np.allclose(quat_to_matrix(quat, matrix), ref_matrix)
+        assert np.allclose(matrix_to_quat(ref_matrix, quat_out), quat * np.sign(quat[0]))
+        assert np.allclose(projected_gravity(quat), ref_matrix.T @ [0., 0., -1.])
+
+        yaw, yaw_omega, omega = rng.uniform(-2, 2), rng.standard_normal(), rng.standard_normal(3)
+        ref_quat, ref_omega = scipy_transform_imu(yaw, yaw_omega, quat, omega)
+        transform_imu(yaw, yaw_omega, quat, omega, quat_out, omega_out)
+        assert np.allclose(quat_out, ref_quat * np.sign(ref_quat[0])) and np.allclose(omega_out, ref_omega)
+
+    assert np.allclose(quat_to_matrix_batch(quats), scipy_rot.as_matrix())
+    roll_pitch = roll_pitch_from_gravity_batch(projected_gravity_batch(quats))
+    assert np.allclose(roll_pitch, scipy_rot.as_euler("xyz")[:, :2])
+    print(f"✅ {NUM_SAMPLES} random quaternions match scipy")
+
+    quat, omega = quats[0], rng.standard_normal(3)
+    scipy_imu_time = timed(lambda: scipy_transform_imu(0.3, 0.1, quat, omega))
+    kernel_imu_time = timed(lambda: transform_imu(0.3, 0.1, quat, omega, quat_out, omega_out))
+    scipy_matrix_time = timed(lambda: R.from_quat(quat[[1, 2, 3, 0]]).as_matrix())
+    kernel_matrix_time = timed(lambda: quat_to_matrix(quat, matrix))
+    gravity = np.zeros(3)
+    kernel_gravity_time = timed(lambda: projected_gravity(quat, gravity))
+
+    batch = np.tile(quats, (BATCH_SIZE // NUM_SAMPLES + 1, 1))[:BATCH_SIZE]
+    batch_gravity = np.zeros((BATCH_SIZE, 3))
+    scipy_batch_time = timed(lambda: R.from_quat(batch[:, [1, 2, 3, 0]]).inv().apply([0., 0., -1.]), 200)
+    kernel_batch_time = timed(lambda: projected_gravity_batch(batch, batch_gravity), 200)
+
+    print(f"📊 transform_imu:          scipy {scipy_imu_time * 1e6:.1f}us, kernel {kernel_imu_time * 1e6:.1f}us")
+    print(f"📊 quat -> matrix:         scipy {scipy_matrix_time * 1e6:.1f}us, kernel {kernel_matrix_time * 1e6:.1f}us")
+    print(f"📊 projected gravity:      kernel {kernel_gravity_time * 1e6:.1f}us")
+    print(f"📊 gravity, {BATCH_SIZE} quats: scipy {scipy_batch_time * 1e6:.1f}us, "
+          f"kernel {kernel_batch_time * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    test_rotation_kernels()
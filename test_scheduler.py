@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for the deadline scheduler: wake-ups on absolute deadlines, overruns
+counted without a catch-up burst afterwards, and the asyncio variant
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from common.scheduler import DeadlineScheduler
+import asyncio
+import time
+
+PERIOD = 0.005
+NUM_TICKS = 200
+# a loaded machine oversleeps now and then, allow a few overruns
+MAX_OVERRUNS = NUM_TICKS // 10
+
+
+def test_deadline_scheduler():
+    print("🧪 Testing deadline scheduler...")
+    scheduler = DeadlineScheduler(PERIOD)
+    scheduler.start()
+    start = time.perf_counter()
+    for _ in range(NUM_TICKS):
+        scheduler.wait()
+    elapsed = time.perf_counter() - start
+    # absolute deadlines: the loop does not drift by the wake-up latency of every tick
+    assert abs(elapsed - NUM_TICKS * PERIOD) < 0.15 * NUM_TICKS * PERIOD, elapsed
+    stats = scheduler.get_stats()
+    assert stats["overruns"] <= MAX_OVERRUNS and abs(stats["frequency"] - 1.0 / PERIOD) < 0.1 / PERIOD, stats
+    print(f"✅ {scheduler.format_stats()}")
+
+    # a tick that runs three periods long
+    overruns = scheduler.overrun_count
+    time.sleep(3 * PERIOD)
+    assert not scheduler.wait()
+    assert scheduler.overrun_count == overruns + 1
+    start = time.perf_counter()
+    scheduler.wait()
+    # the next deadline is one period after the overrun, not a burst of missed ticks
+    assert time.perf_counter() - start > 0.5 * PERIOD
+    print("✅ overrun counted, deadlines restart from now")
+
+
+def test_deadline_scheduler_async():
+    print("🧪 Testing deadline scheduler in asyncio...")
+    scheduler = DeadlineScheduler(PERIOD)
+    other_ticks = 0
+
+    async def other_task():
+        nonlocal other_ticks
+        while True:
+            other_ticks += 1
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.create_task(other_task())
+        start = time.perf_counter()
+        for _ in range(NUM_TICKS):
+            await scheduler.wait_async()
+        elapsed = time.perf_counter() - start
+        task.cancel()
+        return elapsed
+
+    elapsed = asyncio.run(main())
+    assert abs(elapsed - NUM_TICKS * PERIOD) < 0.15 * NUM_TICKS * PERIOD, elapsed
+    assert other_ticks >= NUM_TICKS, "the sleep part yields to the other tasks"
+    print(f"✅ {scheduler.format_stats()}, other task ran {other_ticks}x")
+
+
+if __name__ == "__main__":
+    test_deadline_scheduler()
+    test_deadline_scheduler_async()
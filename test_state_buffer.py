@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script for the seqlocked double buffers (LowState and published PolicyOutput):
+consistent snapshots while a writer thread publishes, and a read that keeps racing
+the writer leaves the snapshot untouched
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from common.state_buffer import LowStateBuffer, LowStateSnapshot
+from common.ctrlcomp import PolicyOutput, PolicyOutputSnapshot
+from types import SimpleNamespace
+import numpy as np
+import threading
+import time
+
+NUM_JOINTS = 29
+NUM_READS = 20000
+
+
+def make_msg(value):
+    """LowState with every field derived from `value`, a torn copy mixes two values"""
+    motor = SimpleNamespace(q=float(value), dq=float(value), tau_est=float(value))
+    return SimpleNamespace(motor_state=[motor] * NUM_JOINTS, tick=int(value),
+                           imu_state=SimpleNamespace(quaternion=[1., 0., 0., 0.], gyroscope=[float(value)] * 3),
+                           mode_machine=0)
+
+
+def is_consistent(snapshot):
+    value = snapshot.tick
+    return (np.all(snapshot.q == value) and np.all(snapshot.dq == value) and np.all(snapshot.tau_est == value)
+            and np.all(snapshot.gyro == value))
+
+
+def test_state_buffer():
+    print("🧪 Testing LowState buffer...")
+    buffer = LowStateBuffer(NUM_JOINTS)
+    snapshot = LowStateSnapshot(NUM_JOINTS)
+    assert not buffer.read_into(snapshot), "nothing received yet"
+
+    buffer.write(make_msg(1))
+    assert buffer.read_into(snapshot) and snapshot.tick == 1 and is_consistent(snapshot)
+
+    # the writer is stuck in the published slot for every retry
+    buffer.seqlock.slot_seq[buffer.seqlock.published] += 1
+    assert not buffer.read_into(snapshot, max_retries=5)
+    assert buffer.read_misses == 1 and snapshot.tick == 1 and is_consistent(snapshot)
+    buffer.seqlock.slot_seq[buffer.seqlock.published] += 1
+    assert buffer.read_into(snapshot)
+    print("✅ a read that keeps racing the writer returns False and keeps the previous snapshot")
+
+    running = True
+
+    def writer():
+        value = 2
+        while running:
+            buffer.write(make_msg(value))
+            value += 1
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    last_tick = 0
+    reads = 0
+    start = time.perf_counter()
+    for _ in range(NUM_READS):
+        if buffer.read_into(snapshot):
+            reads += 1
+            assert is_consistent(snapshot), "torn snapshot"
+            assert snapshot.tick >= last_tick
+            last_tick = snapshot.tick
+    read_time = (time.perf_counter() - start) / NUM_READS
+    running = False
+    thread.join()
+    print(f"✅ {reads}/{NUM_READS} consistent reads against a busy writer "
+          f"({buffer.read_retries} retries, {buffer.read_misses} misses)")
+    print(f"📊 read_into(): {read_time * 1e6:.2f}us")
+
+
+def test_policy_output_snapshot():
+    print("🧪 Testing published PolicyOutput...")
+    output = PolicyOutput(NUM_JOINTS)
+    snapshot = PolicyOutputSnapshot(NUM_JOINTS)
+    assert not output.read_into(snapshot), "nothing published yet"
+    output.set_actions(np.full(NUM_JOINTS, 1.))
+    output.set_gains(100., 2.)
+    output.publish()
+    # later writes are not visible until the next publish()
+    output.set_actions(np.full(NUM_JOINTS, 2.))
+    assert output.read_into(snapshot) and np.all(snapshot.actions == 1.) and np.all(snapshot.kps == 100.)
+    assert snapshot.seq == 0 and snapshot.gains_version == 1
+
+    output.seqlock.slot_seq[output.seqlock.published] += 1
+    assert not output.read_into(snapshot, max_retries=5)
+    assert output.seqlock.read_misses == 1 and np.all(snapshot.actions == 1.)
+    output.seqlock.slot_seq[output.seqlock.published] += 1
+
+    running = True
+
+    def writer():
+        value = 3.
+        while running:
+            output.set_actions(np.full(NUM_JOINTS, value))
+            output.set_gains(value, value)
+            output.publish()
+            value += 1.
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    reads = 0
+    for _ in range(NUM_READS):
+        if output.read_into(snapshot):
+            reads += 1
+            assert np.all(snapshot.actions == snapshot.actions[0]) and np.all(snapshot.kps == snapshot.kds), \
+                "torn snapshot"
+    running = False
+    thread.join()
+    print(f"✅ {reads}/{NUM_READS} consistent PolicyOutput reads ({output.seqlock.read_misses - 1} misses)")
+
+
+if __name__ == "__main__":
+    test_state_buffer()
+    test_policy_output_snapshot()
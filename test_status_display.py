@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for the console status display: message order, dropped messages,
+overrun reporting, progress line and the cost of the writer calls on the control path
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from common.status_display import StatusBoard, StatusDisplay
+import io
+import threading
+import time
+
+NUM_CALLS = 100000
+NUM_THREADS = 4
+
+
+def test_status_display():
+    print("🧪 Testing status display...")
+    board = StatusBoard(max_messages=8)
+    stream = io.StringIO()
+    display = StatusDisplay(board, rate=1000., stream=stream)
+    # attach without the thread, render() is driven by hand
+    board.display = display
+
+    board.set_state("LOCOMODE")
+    board.post("first")
+    board.post("second")
+    display.render()
+    lines = stream.getvalue().split("\n")
+    assert lines[0].endswith("first") and lines[1] == "second", lines
+    assert lines[-1].endswith("[LOCOMODE]"), lines
+    print("✅ messages written in order, followed by the status line")
+
+    stream.seek(0)
+    stream.truncate()
+    for i in range(20):
+        board.post(f"message {i}")
+    board.count_overrun()
+    board.count_overrun()
+    board.set_progress(1.5, 3.0)
+    display.render()
+    output = stream.getvalue()
+    assert "message 11" not in output and "message 12" in output and "message 19" in output
+    assert "12 status messages dropped" in output
+    assert "control loop over time (2x, 2 total)" in output
+    assert "[LOCOMODE]" in output.split("\n")[-1] and "50.0%" in output.split("\n")[-1]
+    print("✅ oldest messages dropped and counted, overruns and progress reported")
+
+    stream.seek(0)
+    stream.truncate()
+    board.clear_progress()
+    board.post("last")
+    display.stop()
+    assert stream.getvalue().rstrip(" \r").endswith("last\n") and board.display is None
+    print("✅ stop() writes the remaining messages and clears the status line")
+
+    # writer calls as seen by the control loop, with the display thread running
+    display = StatusDisplay(board, rate=5., stream=io.StringIO()).start()
+    start = time.perf_counter()
+    for i in range(NUM_CALLS):
+        board.set_progress(i, NUM_CALLS)
+    progress_time = (time.perf_counter() - start) / NUM_CALLS
+    start = time.perf_counter()
+    for _ in range(NUM_CALLS):
+        board.post("switched")
+    post_time = (time.perf_counter() - start) / NUM_CALLS
+    display.stop()
+    print(f"📊 set_progress(): {progress_time * 1e9:.0f}ns, post(): {post_time * 1e9:.0f}ns")
+
+
+def test_concurrent_posts():
+    print("🧪 Testing posts from several threads...")
+    board = StatusBoard(max_messages=NUM_CALLS * NUM_THREADS)
+    stream = io.StringIO()
+    display = StatusDisplay(board, rate=1000., stream=stream).start()
+
+    def poster(index):
+        for i in range(NUM_CALLS // 10):
+            board.post(f"thread {index} message {i}")
+
+    threads = [threading.Thread(target=poster, args=(index,)) for index in range(NUM_THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    display.stop()
+    lines = [line.split("\r")[-1] for line in stream.getvalue().split("\n")]
+    written = [line for line in lines if line.startswith("thread")]
+    assert board.posted == NUM_THREADS * (NUM_CALLS // 10), board.posted
+    assert len(written) == board.posted and not any("dropped" in line for line in lines)
+    for index in range(NUM_THREADS):
+        own = [int(line.split()[-1]) for line in written if line.startswith(f"thread {index} ")]
+        assert own == list(range(NUM_CALLS // 10)), f"thread {index} messages out of order"
+    print(f"✅ {board.posted} messages from {NUM_THREADS} threads, none lost or reported as dropped")
+
+
+if __name__ == "__main__":
+    test_status_display()
+    test_concurrent_posts()
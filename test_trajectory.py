@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script for the joint trajectory shared by the blend policies: start pose gathered
+from the full joint vector, blend profiles, motors outside motor_idx left untouched
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from common.trajectory import JointTrajectory, minimum_jerk_profile
+import numpy as np
+import time
+
+NUM_JOINTS = 29
+NUM_CALLS = 100000
+
+
+def test_joint_trajectory():
+    print("🧪 Testing joint trajectory...")
+    motor_idx = [15, 16, 17, 22, 23, 24]
+    q = np.linspace(-1., 1., NUM_JOINTS).astype(np.float32)
+    target = np.arange(len(motor_idx), dtype=np.float32)
+    trajectory = JointTrajectory(motor_idx, duration=2.0)
+    trajectory.start(q, target)
+
+    actions = np.full(NUM_JOINTS, 7., dtype=np.float32)
+    others = np.setdiff1d(np.arange(NUM_JOINTS), motor_idx)
+    assert trajectory.write(actions, 0.) == 0. and np.allclose(actions[motor_idx], q[motor_idx])
+    assert trajectory.write(actions, 0.5) == 0.25
+    assert np.allclose(actions[motor_idx], q[motor_idx] + 0.25 * (target - q[motor_idx]))
+    assert trajectory.write(actions, 5.0) == 1. and np.allclose(actions[motor_idx], target)
+    assert np.all(actions[others] == 7.)
+    print("✅ linear blend from the start pose, other motors untouched")
+
+    # a new target mid-blend keeps the phase
+    trajectory.set_target(target + 1.)
+    trajectory.write(actions, 1.0)
+    assert np.allclose(actions[motor_idx], q[motor_idx] + 0.5 * (target + 1. - q[motor_idx]))
+
+    trajectory = JointTrajectory(motor_idx, duration=1.0, profile="minimum_jerk")
+    trajectory.start(q, target)
+    trajectory.write(actions, 0.3)
+    assert np.allclose(actions[motor_idx], q[motor_idx] + minimum_jerk_profile(0.3) * (target - q[motor_idx]))
+    assert minimum_jerk_profile(0.) == 0. and minimum_jerk_profile(1.) == 1. and minimum_jerk_profile(0.5) == 0.5
+    print("✅ set_target() keeps the phase, minimum jerk profile")
+
+    try:
+        JointTrajectory(motor_idx, 1.0, profile="cubic")
+        assert False, "unknown profile accepted"
+    except ValueError:
+        pass
+
+    start = time.perf_counter()
+    for i in range(NUM_CALLS):
+        trajectory.write(actions, i * 1e-5)
+    print(f"📊 write(): {(time.perf_counter() - start) / NUM_CALLS * 1e6:.2f}us")
+
+
+if __name__ == "__main__":
+    test_joint_trajectory()
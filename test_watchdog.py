@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for the overrun watchdog: escalation one level at a time, recovery after
+clean ticks, and level commands that are re-issued until the FSM has followed them
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.absolute()))
+
+from common.watchdog import OverrunWatchdog, WatchdogLevel
+from common.ctrlcomp import StateAndCmd, PolicyOutput
+from common.utils import FSMCommand, FSMStateName
+from FSM.FSM import FSM
+import numpy as np
+
+NUM_JOINTS = 29
+CONTROL_DT = 0.02
+
+
+def feed(watchdog, state_name, overrun, num_ticks):
+    """Returns the level changes over `num_ticks` ticks"""
+    changes = []
+    for _ in range(num_ticks):
+        level = watchdog.update(state_name, overrun, 0.03 if overrun else 0.01, 0.)
+        if level is not None:
+            changes.append(level)
+    return changes
+
+
+def test_escalation():
+    print("🧪 Testing watchdog escalation...")
+    watchdog = OverrunWatchdog(consecutive_limit=5, window=100, window_limit=10)
+    state = FSMStateName.SKILL_Dance
+    assert feed(watchdog, state, True, 4) == []
+    assert feed(watchdog, state, True, 1) == [WatchdogLevel.NO_LOGGING]
+    # fresh evidence needed for every level
+    assert feed(watchdog, state, True, 10) == [WatchdogLevel.CHEAPER_POLICY, WatchdogLevel.PASSIVE]
+    assert feed(watchdog, state, True, 20) == [], "no level above PASSIVE"
+
+    # scattered overruns: 10 within the window escalate without 5 in a row
+    watchdog = OverrunWatchdog(consecutive_limit=5, window=100, window_limit=10)
+    changes = []
+    for _ in range(10):
+        changes += feed(watchdog, state, True, 1)
+        changes += feed(watchdog, state, False, 3)
+    assert changes == [WatchdogLevel.NO_LOGGING], changes
+    print("✅ consecutive and windowed overruns escalate one level at a time")
+
+    assert feed(watchdog, state, False, 99 - 3) == []
+    assert feed(watchdog, state, False, 1) == [WatchdogLevel.NORMAL]
+    assert [event["level"] for event in watchdog.events] == ["NO_LOGGING", "NORMAL"]
+    print("✅ back to NORMAL after a window of clean ticks")
+
+
+def test_level_command():
+    print("🧪 Testing watchdog level commands...")
+    watchdog = OverrunWatchdog()
+    assert watchdog.level_command(FSMStateName.SKILL_Dance) is None
+    watchdog.escalate(WatchdogLevel.CHEAPER_POLICY, FSMStateName.SKILL_Dance)
+    assert watchdog.level_command(FSMStateName.SKILL_Dance) == FSMCommand.LOCO
+    assert watchdog.level_command(FSMStateName.SKILL_COOLDOWN) is None
+    # followed once, a later mimic skill chosen by the operator is not overridden
+    assert watchdog.level_command(FSMStateName.SKILL_KICK) is None
+
+    watchdog.escalate(WatchdogLevel.PASSIVE, FSMStateName.SKILL_COOLDOWN)
+    # the state cleared the command and went on to locomotion, it is issued again
+    assert watchdog.level_command(FSMStateName.SKILL_COOLDOWN) == FSMCommand.PASSIVE
+    assert watchdog.level_command(FSMStateName.LOCOMODE) == FSMCommand.PASSIVE
+    assert watchdog.level_command(FSMStateName.PASSIVE) is None
+    assert watchdog.level_command(FSMStateName.FIXEDPOSE) is None
+    print("✅ commands repeat until the FSM is where the level wants it")
+
+
+def test_watchdog_fsm():
+    print("🧪 Testing watchdog commands on the FSM...")
+    state_cmd = StateAndCmd(NUM_JOINTS)
+    fsm = FSM(state_cmd, PolicyOutput(NUM_JOINTS))
+    watchdog = OverrunWatchdog()
+    rng = np.random.default_rng(0)
+    tick = 0
+
+    def run(num_ticks, command=None):
+        nonlocal tick
+        if command is not None:
+            state_cmd.skill_cmd = command
+        for _ in range(num_ticks):
+            tick += 1
+            level_command = watchdog.level_command(fsm.cur_policy.name)
+            if level_command is not None:
+                state_cmd.skill_cmd = level_command
+            q = rng.standard_normal(NUM_JOINTS).astype(np.float32) * 0.1
+            state_cmd.update(q=q, dq=q)
+            fsm.run(tick * CONTROL_DT)
+
+    run(5, FSMCommand.POS_RESET)
+    run(5, FSMCommand.LOCO)
+    run(10, FSMCommand.SKILL_1)
+    assert fsm.cur_policy.name == FSMStateName.SKILL_Dance
+    watchdog.escalate(WatchdogLevel.CHEAPER_POLICY, fsm.cur_policy.name)
+    run(3)
+    assert fsm.cur_policy.name == FSMStateName.SKILL_COOLDOWN
+
+    # PASSIVE arrives on the tick SkillCooldown finishes its blend: its checkChange takes
+    # the alpha >= 1 branch, clears the command and goes to LOCOMODE
+    cooldown = fsm.skill_cooldown_policy
+    last_alpha = cooldown.alpha
+    while fsm.cur_policy is cooldown and cooldown.alpha + (cooldown.alpha - last_alpha) < 1.0:
+        last_alpha = cooldown.alpha
+        run(1)
+    watchdog.escalate(WatchdogLevel.PASSIVE, fsm.cur_policy.name)
+    run(1)
+    assert fsm.cur_policy.name == FSMStateName.LOCOMODE, fsm.cur_policy.name_str
+    run(3)
+    assert fsm.cur_policy.name == FSMStateName.PASSIVE, fsm.cur_policy.name_str
+    assert watchdog.level_command(fsm.cur_policy.name) is None
+    print("✅ PASSIVE lost by SkillCooldown is issued again and reached")
+
+
+if __name__ == "__main__":
+    test_escalation()
+    test_level_command()
+    test_watchdog_fsm()